@@ -0,0 +1,71 @@
+import tracemalloc
+
+import numpy as np
+
+import mbuild as mb
+
+# Number of particles of each benchmarked system.
+SIZES = [1000, 10000, 100000]
+
+
+def particle_grid(n, spacing=0.2, name='C', periodic=False):
+    """A flat Compound of `n` particles on a cubic grid
+
+    Parameters
+    ----------
+    n : int
+        Number of particles
+    spacing : float, optional, default=0.2
+        Distance between neighboring grid points, in nm
+    name : str, optional, default='C'
+        Name of the particles
+    periodic : bool, optional, default=False
+        Make the Compound periodic in all directions, with the periodic
+        lengths chosen such that the grid spacing is maintained across the
+        boundaries
+
+    """
+    n_side = int(np.ceil(n ** (1 / 3)))
+    index = np.arange(n)
+    xyz = spacing * np.column_stack((index % n_side,
+                                     index // n_side % n_side,
+                                     index // n_side ** 2))
+    compound = mb.Compound(name='Grid')
+    compound.add([mb.Compound(name=name, pos=pos) for pos in xyz])
+    if periodic:
+        compound.periodicity = spacing * np.array(
+            [n_side, n_side, max(1, int(np.ceil(n / n_side ** 2)))],
+            dtype=float)
+    return compound
+
+
+def ethane_box(n):
+    """A Compound of ethane molecules on a grid, with about `n` particles """
+    from mbuild.lib.molecules import Ethane
+
+    ethane = Ethane()
+    n_molecules = max(1, n // ethane.n_particles)
+    n_side = int(np.ceil(n_molecules ** (1 / 3)))
+    spacing = 0.5
+    box = mb.Compound(name='Box')
+    molecules = []
+    for i in range(n_molecules):
+        molecule = mb.clone(ethane)
+        molecule.translate(spacing * np.array(
+            [i % n_side, i // n_side % n_side, i // n_side ** 2]))
+        molecules.append(molecule)
+    box.add(molecules)
+    box.periodicity = spacing * np.array([n_side, n_side, n_side],
+                                         dtype=float)
+    return box
+
+
+def allocated_bytes(func, *args, **kwargs):
+    """Peak memory allocated by Python while calling `func`, in bytes """
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
@@ -0,0 +1,109 @@
+import numpy as np
+
+import mbuild as mb
+
+from .common import SIZES, allocated_bytes, ethane_box, particle_grid
+
+
+class Clone:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        self.compound = ethane_box(n)
+
+    def time_clone(self, n):
+        mb.clone(self.compound)
+
+    def track_clone_bytes(self, n):
+        return allocated_bytes(mb.clone, self.compound)
+    track_clone_bytes.unit = 'bytes'
+
+
+class Add:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+    # Adding modifies the Compound, so every sample needs a fresh setup.
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n):
+        self.compound = mb.Compound()
+        self.particles = [mb.Compound(name='C', pos=pos)
+                          for pos in np.random.rand(n, 3)]
+
+    def time_add(self, n):
+        self.compound.add(self.particles)
+
+    def time_add_one_by_one(self, n):
+        for particle in self.particles:
+            self.compound.add(particle)
+
+    def track_add_bytes(self, n):
+        return allocated_bytes(self.compound.add, self.particles)
+    track_add_bytes.unit = 'bytes'
+
+
+class Remove:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n):
+        self.compound = ethane_box(n)
+        # Remove every other molecule, along with its bonds.
+        self.molecules = list(self.compound.children)[::2]
+
+    def time_remove(self, n):
+        self.compound.remove(self.molecules)
+
+    def track_remove_bytes(self, n):
+        return allocated_bytes(self.compound.remove, self.molecules)
+    track_remove_bytes.unit = 'bytes'
+
+
+class XYZ:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        self.compound = ethane_box(n)
+        self.xyz = self.compound.xyz + 0.01
+
+    def time_get_xyz(self, n):
+        self.compound.xyz
+
+    def time_set_xyz(self, n):
+        self.compound.xyz = self.xyz
+
+    def track_get_xyz_bytes(self, n):
+        return allocated_bytes(getattr, self.compound, 'xyz')
+    track_get_xyz_bytes.unit = 'bytes'
+
+    def track_set_xyz_bytes(self, n):
+        return allocated_bytes(setattr, self.compound, 'xyz', self.xyz)
+    track_set_xyz_bytes.unit = 'bytes'
+
+
+class GenerateBonds:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+    number = 1
+    warmup_time = 0
+
+    def setup(self, n):
+        self.compound = particle_grid(n, spacing=0.15, periodic=True)
+
+    def time_generate_bonds(self, n):
+        self.compound.generate_bonds('C', 'C', 0.1, 0.16)
+
+    def track_generate_bonds_bytes(self, n):
+        return allocated_bytes(self.compound.generate_bonds,
+                               'C', 'C', 0.1, 0.16)
+    track_generate_bonds_bytes.unit = 'bytes'
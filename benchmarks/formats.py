@@ -0,0 +1,144 @@
+import os
+import shutil
+import tempfile
+
+from mbuild.utils.io import has_foyer
+
+from .common import SIZES, allocated_bytes, ethane_box
+
+
+class Conversion:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        self.compound = ethane_box(n)
+
+    def time_to_parmed(self, n):
+        self.compound.to_parmed()
+
+    def time_to_trajectory(self, n):
+        self.compound.to_trajectory()
+
+    def track_to_parmed_bytes(self, n):
+        return allocated_bytes(self.compound.to_parmed)
+    track_to_parmed_bytes.unit = 'bytes'
+
+    def track_to_trajectory_bytes(self, n):
+        return allocated_bytes(self.compound.to_trajectory)
+    track_to_trajectory_bytes.unit = 'bytes'
+
+
+def _write_xyz(compound, structure, filename):
+    from mbuild.formats.xyz import write_xyz
+    write_xyz(structure, filename)
+
+
+def _write_hoomdxml(compound, structure, filename):
+    from mbuild.formats.hoomdxml import write_hoomdxml
+    write_hoomdxml(structure, filename,
+                   rigid_bodies=[None] * len(structure.atoms))
+
+
+def _write_gsd(compound, structure, filename):
+    from mbuild.formats.gsdwriter import write_gsd
+    write_gsd(structure, filename,
+              rigid_bodies=[None] * len(structure.atoms))
+
+
+def _write_lammpsdata(compound, structure, filename):
+    from mbuild.formats.lammpsdata import write_lammpsdata
+    write_lammpsdata(structure, filename)
+
+
+def _write_par(compound, structure, filename):
+    from mbuild.formats.par_writer import write_par
+    write_par(structure, filename)
+
+
+def _write_mcf(compound, structure, filename):
+    from mbuild.formats.cassandramcf import write_mcf
+    write_mcf(structure, filename, angle_style='harmonic',
+              dihedral_style='opls')
+
+
+def _write_json(compound, structure, filename):
+    from mbuild.formats.json_formats import compound_to_json
+    compound_to_json(compound, filename)
+
+
+def _write_npz(compound, structure, filename):
+    from mbuild.formats.npz import compound_to_npz
+    compound_to_npz(compound, filename)
+
+
+def _write_protobuf(compound, structure, filename):
+    from mbuild.formats.protobuf import write_pb2
+    write_pb2(compound, filename)
+
+
+def _write_poscar(compound, structure, filename):
+    from mbuild.formats.vasp import write_poscar
+    write_poscar(compound, filename, lattice_constant=1.0)
+
+
+# Writer, extension of the written file, and whether the writer needs an
+# atomtyped structure.
+WRITERS = {
+    'xyz': (_write_xyz, '.xyz', False),
+    'hoomdxml': (_write_hoomdxml, '.hoomdxml', False),
+    'gsd': (_write_gsd, '.gsd', False),
+    'lammpsdata': (_write_lammpsdata, '.lammps', False),
+    'par': (_write_par, '.par', True),
+    'mcf': (_write_mcf, '.mcf', True),
+    'json': (_write_json, '.json', False),
+    'npz': (_write_npz, '.npz', False),
+    'protobuf': (_write_protobuf, '.pb2', False),
+    'poscar': (_write_poscar, '.poscar', False),
+}
+
+
+class Write:
+    """Each writer in `mbuild.formats`, on a box of ethane molecules
+
+    Writers whose dependencies are not installed are skipped.
+    """
+    params = (SIZES, list(WRITERS))
+    param_names = ['n_particles', 'writer']
+    timeout = 600
+
+    def setup(self, n, writer):
+        write, extension, typed = WRITERS[writer]
+        if typed and not has_foyer:
+            raise NotImplementedError('foyer is required to atomtype the '
+                                      'structure for this writer')
+        self.compound = ethane_box(n)
+        if typed:
+            from mbuild.utils.forcefields import apply_forcefield
+            self.structure = apply_forcefield(
+                self.compound.to_parmed(residues=['Ethane']), name='oplsaa')
+        else:
+            self.structure = self.compound.to_parmed()
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'out' + extension)
+        self.write = write
+        try:
+            # Write once to detect missing dependencies, e.g. gsd.
+            self._write()
+        except ImportError as e:
+            self.teardown(n, writer)
+            raise NotImplementedError(str(e))
+
+    def teardown(self, n, writer):
+        shutil.rmtree(self.tmpdir, ignore_errors=True)
+
+    def _write(self):
+        self.write(self.compound, self.structure, self.filename)
+
+    def time_write(self, n, writer):
+        self._write()
+
+    def track_write_bytes(self, n, writer):
+        return allocated_bytes(self._write)
+    track_write_bytes.unit = 'bytes'
@@ -0,0 +1,80 @@
+import re
+
+import numpy as np
+
+import mbuild as mb
+import mbuild.packing
+
+from .common import SIZES, allocated_bytes
+
+
+def _stub_run_packmol(input_text, filled_xyz, temp_file):
+    """Stand-in for `_run_packmol` when PACKMOL is not installed
+
+    Places the molecules of each structure block of the PACKMOL input at
+    random positions inside its box, without rotating them or removing
+    overlaps. This keeps the cost of everything around the call to PACKMOL
+    comparable between machines with and without PACKMOL.
+    """
+    from mbuild.formats.xyz import read_xyz_coordinates
+
+    output = re.search(r'^output (\S+)', input_text, re.MULTILINE).group(1)
+    blocks = re.findall(r'structure (\S+)\s+number (\d+)\s+'
+                        r'inside box ([-\d. ]+)', input_text)
+    names = []
+    coords = []
+    for filename, number, bounds in blocks:
+        molecule_names, xyz = read_xyz_coordinates(filename,
+                                                   return_names=True)
+        xyz = 10 * (xyz - xyz.mean(axis=0))
+        bounds = np.array(bounds.split(), dtype=float)
+        centers = np.random.uniform(bounds[:3], bounds[3:],
+                                    size=(int(number), 3))
+        names.extend(molecule_names * int(number))
+        coords.append((centers[:, np.newaxis, :] + xyz).reshape(-1, 3))
+    coords = np.concatenate(coords)
+
+    with open(output, 'w') as xyz_file:
+        xyz_file.write('{}\nstub packing\n'.format(len(names)))
+        for name, (x, y, z) in zip(names, coords):
+            xyz_file.write('{} {:.6f} {:.6f} {:.6f}\n'.format(name, x, y, z))
+
+
+class FillBox:
+    """`fill_box` with methane, using a stub packer if PACKMOL is missing
+
+    Timings obtained with the stub packer are not comparable to those
+    obtained with PACKMOL.
+    """
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        from mbuild.lib.molecules import Methane
+
+        self.methane = Methane()
+        self.n_compounds = n // self.methane.n_particles
+        # About 0.1 nm^3 per molecule.
+        self.box = mb.Box(3 * [(0.1 * self.n_compounds) ** (1 / 3)])
+
+        self._packmol = mbuild.packing.PACKMOL
+        self._run_packmol = mbuild.packing._run_packmol
+        if self._packmol is None:
+            mbuild.packing.PACKMOL = 'packmol'
+            mbuild.packing._run_packmol = _stub_run_packmol
+
+    def teardown(self, n):
+        mbuild.packing.PACKMOL = self._packmol
+        mbuild.packing._run_packmol = self._run_packmol
+
+    def _fill(self):
+        return mb.fill_box(self.methane, n_compounds=self.n_compounds,
+                           box=self.box)
+
+    def time_fill_box(self, n):
+        self._fill()
+
+    def track_fill_box_bytes(self, n):
+        return allocated_bytes(self._fill)
+    track_fill_box_bytes.unit = 'bytes'
@@ -0,0 +1,104 @@
+import numpy as np
+
+import mbuild as mb
+
+from .common import SIZES, allocated_bytes, particle_grid
+
+
+class TiledCompound:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        # A bonded periodic tile, replicated twice in each direction.
+        self.tile = particle_grid(n // 8, spacing=0.15, periodic=True)
+        self.tile.generate_bonds('C', 'C', 0.1, 0.16)
+
+    def time_tiled_compound(self, n):
+        mb.recipes.TiledCompound(self.tile, n_tiles=(2, 2, 2))
+
+    def track_tiled_compound_bytes(self, n):
+        return allocated_bytes(mb.recipes.TiledCompound, self.tile,
+                               n_tiles=(2, 2, 2))
+    track_tiled_compound_bytes.unit = 'bytes'
+
+
+class Polymer:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        from mbuild.lib.moieties import CH2
+
+        self.monomer = CH2()
+        self.n_monomers = n // self.monomer.n_particles
+
+    def time_polymer(self, n):
+        mb.recipes.Polymer(self.monomer, n=self.n_monomers)
+
+    def track_polymer_bytes(self, n):
+        return allocated_bytes(mb.recipes.Polymer, self.monomer,
+                               n=self.n_monomers)
+    track_polymer_bytes.unit = 'bytes'
+
+
+class Monolayer:
+    """Alkane chains on a beta-cristobalite surface
+
+    A single surface tile with its chains already holds about 5000
+    particles, so the sizes of the two smaller systems are rounded up to
+    that of a single tile.
+    """
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        from mbuild.lib.atoms import H
+        from mbuild.lib.moieties import CH2
+        from mbuild.lib.surfaces import Betacristobalite
+
+        self.surface = Betacristobalite()
+        self.chain = mb.recipes.Polymer(CH2(), n=10)
+        self.backfill = H()
+        self.n_tiles = max(1, int(np.sqrt(n / 5000)))
+
+    def _build(self):
+        return mb.recipes.Monolayer(self.surface, self.chain,
+                                    backfill=self.backfill,
+                                    tile_x=self.n_tiles, tile_y=self.n_tiles)
+
+    def time_monolayer(self, n):
+        self._build()
+
+    def track_monolayer_bytes(self, n):
+        return allocated_bytes(self._build)
+    track_monolayer_bytes.unit = 'bytes'
+
+
+class LatticePopulate:
+    params = SIZES
+    param_names = ['n_particles']
+    timeout = 600
+
+    def setup(self, n):
+        # Face-centered cubic lattice with four particles per unit cell.
+        self.lattice = mb.Lattice(
+            lattice_spacing=[0.4, 0.4, 0.4],
+            lattice_points={'A': [[0, 0, 0], [0.5, 0.5, 0],
+                                  [0.5, 0, 0.5], [0, 0.5, 0.5]]})
+        self.compound_dict = {'A': mb.Compound(name='Ar')}
+        self.n_cells = int(np.ceil((n / 4) ** (1 / 3)))
+
+    def _populate(self):
+        return self.lattice.populate(self.compound_dict, x=self.n_cells,
+                                     y=self.n_cells, z=self.n_cells)
+
+    def time_populate(self, n):
+        self._populate()
+
+    def track_populate_bytes(self, n):
+        return allocated_bytes(self._populate)
+    track_populate_bytes.unit = 'bytes'
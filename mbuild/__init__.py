@@ -1,10 +1,59 @@
+import importlib
+import sys
+
 from mbuild.box import Box
-from mbuild.coarse_graining import coarse_grain
 from mbuild.coordinate_transform import *
 from mbuild.compound import *
 from mbuild.pattern import *
-from mbuild.packing import *
 from mbuild.port import Port
-from mbuild.lattice import Lattice
-from mbuild.recipes import recipes
+from mbuild import profiling
 from mbuild.version import version
+
+# Attributes that are only imported when first accessed, to keep
+# `import mbuild` fast, mapped to the module defining them.
+_lazy_attributes = {
+    'coarse_grain': 'mbuild.coarse_graining',
+    'fill_box': 'mbuild.packing',
+    'fill_region': 'mbuild.packing',
+    'fill_sphere': 'mbuild.packing',
+    'solvate': 'mbuild.packing',
+    'Lattice': 'mbuild.lattice',
+    'recipes': 'mbuild.recipes',
+}
+# Submodules that were imported by `import mbuild`, and are imported when
+# first accessed instead.
+_lazy_submodules = ('coarse_graining', 'lattice', 'lib', 'packing')
+
+
+def __getattr__(name):
+    if name in _lazy_submodules:
+        return importlib.import_module('mbuild.' + name)
+    try:
+        module = _lazy_attributes[name]
+    except KeyError:
+        raise AttributeError(
+            "module 'mbuild' has no attribute '{}'".format(name))
+    value = getattr(importlib.import_module(module), name)
+    # Importing a submodule binds it on the package, e.g. `mbuild.recipes`,
+    # so the attribute is only set afterwards.
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_attributes) |
+                  set(_lazy_submodules))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so everything is
+    # imported eagerly on older versions.
+    for _name in _lazy_submodules:
+        importlib.import_module('mbuild.' + _name)
+    for _name in _lazy_attributes:
+        __getattr__(_name)
+
+
+__all__ = sorted(name for name in set(globals()) | set(_lazy_attributes)
+                 if not name.startswith('_') and
+                 name not in ('importlib', 'sys'))
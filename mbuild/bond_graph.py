@@ -56,9 +56,8 @@ class BondGraph(object):
             self._adj[node] = set()
 
     def remove_node(self, node):
-        adj = self._adj
-        for other_node in self.nodes():
-            if node in adj[other_node]:
+        if self.has_node(node):
+            for other_node in list(self._adj[node]):
                 self.remove_edge(node, other_node)
 
     def has_node(self, node):
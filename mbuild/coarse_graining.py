@@ -79,7 +79,7 @@ class Proxy(Compound):
         # Remember that we're cloning the new one of self.
         clone_of[self] = newone
 
-        newone.name = deepcopy(self.name)
+        newone._name = self._name
         newone.wrapped = clone(self.wrapped)
 
         if hasattr(self, 'index'):
@@ -90,7 +90,9 @@ class Proxy(Compound):
         else:
             newone.children = OrderedSet()
         # Parent should be None initially.
-        newone.parent = None
+        newone._parent = None
+        newone._root = newone
+        newone._depth = 0
         newone.labels = OrderedDict()
         newone.referrers = set()
         newone.bond_graph = None
@@ -1,39 +1,32 @@
-__all__ = ['load', 'clone', 'Compound', 'Particle']
+__all__ = ['load', 'clone', 'energy_minimize_many', 'Compound', 'Particle']
 
 from collections import OrderedDict, defaultdict, Iterable
 from copy import deepcopy
+import importlib
 import itertools
 import os
+import re
 import sys
 import tempfile
 from warnings import warn
 
-import mdtraj as md
-from mdtraj.core.element import get_by_symbol
 import numpy as np
 from oset import oset as OrderedSet
-import parmed as pmd
-from parmed.periodic_table import AtomicNum, element_by_name, Mass, Element
 
 from mbuild.bond_graph import BondGraph
 from mbuild.box import Box
 from mbuild.exceptions import MBuildError
 from mbuild.utils.decorators import deprecated
-from mbuild.formats.xyz import read_xyz, write_xyz
-from mbuild.formats.json_formats import compound_to_json, compound_from_json
-from mbuild.formats.hoomdxml import write_hoomdxml
-from mbuild.formats.lammpsdata import write_lammpsdata
-from mbuild.formats.gsdwriter import write_gsd
-from mbuild.formats.par_writer import write_par
-from mbuild.periodic_kdtree import PeriodicCKDTree
+from mbuild.profiling import profiled
 from mbuild.utils.io import run_from_ipython, import_, has_networkx
 from mbuild.utils.jsutils import overwrite_nglview_default
 from mbuild.coordinate_transform import _translate, _rotate
 
 
+@profiled()
 def load(filename_or_object, relative_to_module=None, compound=None, coords_only=False,
          rigid=False, use_parmed=False, smiles=False, 
-         infer_hierarchy=True, **kwargs):
+         infer_hierarchy=True, lazy=False, lazy_labels=False, **kwargs):
     """Load a file or an existing topology into an mbuild compound.
 
     Files are read using the MDTraj package unless the `use_parmed` argument is
@@ -64,6 +57,18 @@ def load(filename_or_object, relative_to_module=None, compound=None, coords_only
         or file containing a SMILES string.
     infer_hierarchy : bool, optional, default=True
         If True, infer hierarchy from chains and residues
+    lazy : bool, optional, default=False
+        Only read the coordinates of the file and return a
+        `mb.lazy.LazyCompound`, whose hierarchy is built the first time it is
+        needed. `xyz`, `n_particles` and `boundingbox` of the returned
+        Compound do not require the hierarchy. Supported for .npz, .xyz and
+        the formats read by MDTraj; cannot be combined with `compound`,
+        `coords_only`, `use_parmed` or `smiles`.
+    lazy_labels : bool, optional, default=False
+        Do not store the enumerated labels of the loaded particles, e.g.
+        'C[17]', but resolve them from their group on lookup, see
+        `Compound.add`. Reduces the memory used by large systems. Supported
+        for .xyz files and the formats read by MDTraj and ParmEd.
     **kwargs : keyword arguments
         Key word arguments passed to mdTraj for loading.
 
@@ -72,25 +77,41 @@ def load(filename_or_object, relative_to_module=None, compound=None, coords_only
     compound : mb.Compound
 
     """
+    if lazy:
+        if (compound is not None or coords_only or use_parmed or smiles or
+                not isinstance(filename_or_object, str)):
+            raise ValueError('lazy=True is only supported when loading a new '
+                             'Compound from a file with MDTraj or one of '
+                             'the internal readers.')
+        if relative_to_module:
+            script_path = os.path.realpath(
+                sys.modules[relative_to_module].__file__)
+            file_dir = os.path.dirname(script_path)
+            filename_or_object = os.path.join(file_dir, filename_or_object)
+        from mbuild.lazy import load_lazy
+        return load_lazy(filename_or_object, rigid=rigid,
+                         infer_hierarchy=infer_hierarchy,
+                         lazy_labels=lazy_labels, **kwargs)
+
     # If compound doesn't exist, we will initialize one
     if compound is None:
         compound = Compound()
 
     # First check if we are loading from an existing parmed or trajectory structure
     type_dict = {
-        pmd.Structure:compound.from_parmed,
-        md.Trajectory:compound.from_trajectory,
+        _imported_class('parmed', 'Structure'): compound.from_parmed,
+        _imported_class('mdtraj', 'Trajectory'): compound.from_trajectory,
+        _imported_class('openbabel.pybel', 'Molecule'): compound.from_pybel,
+        _imported_class('pybel', 'Molecule'): compound.from_pybel,
     }
-    try:
-        pybel = import_('pybel')
-        type_dict.update({pybel.Molecule:compound.from_pybel})
-    except ImportError:
-        pass
+    type_dict.pop(None, None)
 
     if isinstance(filename_or_object, Compound):
         return filename_or_object
     for type in type_dict:
         if isinstance(filename_or_object, type):
+            if lazy_labels and type_dict[type] != compound.from_pybel:
+                kwargs['lazy_labels'] = lazy_labels
             type_dict[type](filename_or_object,coords_only=coords_only, 
                     infer_hierarchy=infer_hierarchy, **kwargs)
             return compound
@@ -106,24 +127,26 @@ def load(filename_or_object, relative_to_module=None, compound=None, coords_only
         file_dir = os.path.dirname(script_path)
         filename_or_object = os.path.join(file_dir, filename_or_object)
 
-    # Handle the case of a xyz and json file, which must use an internal reader
+    # Handle the case of a xyz, json and npz file, which must use an internal reader
     extension = os.path.splitext(filename_or_object)[-1]
     if extension == '.json':
+        from mbuild.formats.json_formats import compound_from_json
         compound = compound_from_json(filename_or_object)
         return compound
 
+    if extension == '.npz':
+        from mbuild.formats.npz import compound_from_npz
+        compound = compound_from_npz(filename_or_object)
+        return compound
+
     if extension == '.xyz' and not 'top' in kwargs:
+        from mbuild.formats.xyz import read_xyz, read_xyz_coordinates
         if coords_only:
-            tmp = read_xyz(filename_or_object)
-            if tmp.n_particles != compound.n_particles:
-                raise ValueError('Number of atoms in {filename_or_object} does not match'
-                                 ' {compound}'.format(**locals()))
-            ref_and_compound = zip(tmp._particles(include_ports=False),
-                                   compound.particles(include_ports=False))
-            for ref_particle, particle in ref_and_compound:
-                particle.pos = ref_particle.pos
+            compound._set_coordinates(
+                read_xyz_coordinates(filename_or_object), filename_or_object)
         else:
-            compound = read_xyz(filename_or_object, compound=compound)
+            compound = read_xyz(filename_or_object, compound=compound,
+                                lazy_labels=lazy_labels)
         return compound
 
     if extension == '.sdf':
@@ -144,9 +167,10 @@ def load(filename_or_object, relative_to_module=None, compound=None, coords_only
         warn(
             "use_parmed set to True.  Bonds may be inferred from inter-particle "
             "distances and standard residue templates!")
+        import parmed as pmd
         structure = pmd.load_file(filename_or_object, structure=True, **kwargs)
         compound.from_parmed(structure, coords_only=coords_only, 
-                infer_hierarchy=infer_hierarchy)
+                infer_hierarchy=infer_hierarchy, lazy_labels=lazy_labels)
 
     elif smiles:
         pybel = import_('pybel')
@@ -177,15 +201,17 @@ def load(filename_or_object, relative_to_module=None, compound=None, coords_only
         compound.from_pybel(mymol, infer_hierarchy=infer_hierarchy)
 
     else:
+        import mdtraj as md
         traj = md.load(filename_or_object, **kwargs)
         compound.from_trajectory(traj, frame=-1, coords_only=coords_only,
-                infer_hierarchy=infer_hierarchy)
+                infer_hierarchy=infer_hierarchy, lazy_labels=lazy_labels)
 
     if rigid:
         compound.label_rigid_bodies()
     return compound
 
 
+@profiled()
 def clone(existing_compound, clone_of=None, root_container=None):
     """A faster alternative to deepcopying.
 
@@ -213,6 +239,259 @@ def clone(existing_compound, clone_of=None, root_container=None):
     return newone
 
 
+def energy_minimize_many(compounds, forcefield='UFF', steps=1000,
+                         n_processes=None, **kwargs):
+    """Energy minimize many independent Compounds in parallel.
+
+    Each Compound is minimized as with `Compound.energy_minimize`, but the
+    minimizations are distributed over a pool of worker processes. Every
+    worker runs in its own temporary directory and keeps the Open Babel
+    molecules and OpenMM Simulations it has set up, so Compounds that share
+    a topology, e.g. a library of identical monomers, are only set up once
+    per worker. The minimized coordinates are sent back to the calling
+    process and applied to the Compounds once all minimizations finished.
+
+    Parameters
+    ----------
+    compounds : iterable of mb.Compound
+        The Compounds to minimize
+    forcefield : str, optional, default='UFF'
+        The force field to apply, see `Compound.energy_minimize`
+    steps : int, optional, default=1000
+        The number of optimization iterations
+    n_processes : int, optional, default=None
+        The number of worker processes. Defaults to the number of CPUs. If
+        1, the Compounds are minimized in the calling process.
+    **kwargs : keyword arguments
+        Passed on to `Compound.energy_minimize`
+
+    See Also
+    --------
+    Compound.energy_minimize : Energy minimize a single Compound
+
+    """
+    import multiprocessing
+
+    compounds = list(compounds)
+    if os.path.splitext(forcefield)[-1] == '.xml':
+        # Workers do not run in the current working directory.
+        forcefield = os.path.abspath(forcefield)
+
+    initial_xyz = []
+    tasks = []
+    for compound in compounds:
+        compound._kick()
+        xyz = compound.xyz
+        initial_xyz.append(xyz)
+        tasks.append((compound._topology_key(), xyz))
+
+    args = (forcefield, steps, kwargs)
+    if n_processes is None:
+        n_processes = os.cpu_count() or 1
+    n_processes = min(n_processes, len(tasks))
+    if n_processes <= 1:
+        results = [_minimize_worker(task, *args) for task in tasks]
+    else:
+        from functools import partial
+
+        chunksize = max(1, len(tasks) // (4 * n_processes))
+        pool = multiprocessing.Pool(n_processes,
+                                    initializer=_init_minimize_worker)
+        try:
+            results = pool.map(partial(_minimize_worker, forcefield=forcefield,
+                                       steps=steps, kwargs=kwargs),
+                               tasks, chunksize=chunksize)
+            pool.close()
+        except BaseException:
+            pool.terminate()
+            raise
+        finally:
+            pool.join()
+
+    for compound, xyz_init, xyz in zip(compounds, initial_xyz, results):
+        compound._set_coordinates(xyz, 'the minimized structure')
+        compound._update_port_locations(xyz_init)
+
+
+def _init_minimize_worker():
+    """Move a worker of `energy_minimize_many` to a temporary directory """
+    import multiprocessing.util
+    import shutil
+
+    tmp_dir = tempfile.mkdtemp()
+    os.chdir(tmp_dir)
+    multiprocessing.util.Finalize(None, shutil.rmtree, args=(tmp_dir, True),
+                                  exitpriority=0)
+
+
+def _minimize_worker(task, forcefield, steps, kwargs):
+    """Minimize the coordinates of one topology for `energy_minimize_many`
+
+    The Compounds built from each topology are reused by later tasks, such
+    that the setup cached by the energy minimization backends applies.
+    """
+    topology, xyz = task
+    compound = _minimize_templates.pop(topology, None)
+    if compound is None:
+        compound = Compound()
+        compound._bulk_add((Particle(name=name, charge=charge)
+                            for name, charge in topology[0]),
+                           lazy_labels=True)
+        particles = list(compound.children)
+        compound._add_bonds((particles[i], particles[j])
+                            for i, j in topology[1])
+    _minimize_templates[topology] = compound
+    while len(_minimize_templates) > _MINIMIZE_TEMPLATE_CACHE_SIZE:
+        _minimize_templates.popitem(last=False)
+    compound._set_coordinates(xyz, 'the minimization task')
+    return compound._minimized_xyz(forcefield=forcefield, steps=steps,
+                                   **kwargs)
+
+
+_OPENBABEL_FORCEFIELDS = ['MMFF94', 'MMFF94s', 'UFF', 'GAFF', 'Ghemical']
+
+# OpenMM Simulations used by `Compound.energy_minimize`, keyed by topology and
+# forcefield, with the most recently used last.
+_openmm_simulations = OrderedDict()
+_OPENMM_SIMULATION_CACHE_SIZE = 8
+
+# Compounds built by the workers of `energy_minimize_many`, keyed by topology.
+_minimize_templates = OrderedDict()
+_MINIMIZE_TEMPLATE_CACHE_SIZE = 32
+
+# Writers of `Compound.save` by file extension, as (module, function). The
+# writers are only imported when first used.
+_SAVERS = {
+    '.hoomdxml': ('mbuild.formats.hoomdxml', 'write_hoomdxml'),
+    '.gsd': ('mbuild.formats.gsdwriter', 'write_gsd'),
+    '.xyz': ('mbuild.formats.xyz', 'write_xyz'),
+    '.lammps': ('mbuild.formats.lammpsdata', 'write_lammpsdata'),
+    '.lmp': ('mbuild.formats.lammpsdata', 'write_lammpsdata'),
+    '.par': ('mbuild.formats.par_writer', 'write_par'),
+    '.mcf': ('mbuild.formats.cassandramcf', 'write_mcf'),
+}
+
+
+def _imported_class(module, name):
+    """The class `name` of `module`, or None if `module` was not imported yet
+
+    No object can be an instance of a class whose module has not been
+    imported, so this allows type checks without importing heavy packages.
+    """
+    return getattr(sys.modules.get(module), name, None)
+
+
+def _modify_shared(*args, **kwargs):
+    raise TypeError('Empty children, labels and referrers are shared between '
+                    'Compounds; use Compound.add to modify them.')
+
+
+class _SharedOrderedSet(OrderedSet):
+    """Empty children shared by all Particles, i.e. Compounds without
+    children """
+    add = _modify_shared
+
+    def discard(self, key):
+        if key in self:
+            _modify_shared()
+
+    def __repr__(self):
+        return 'OrderedSet()'
+
+    def __reduce__(self):
+        return '_NO_CHILDREN'
+
+
+class _SharedOrderedDict(OrderedDict):
+    """Empty labels shared by all Compounds without labels """
+    __setitem__ = setdefault = update = _modify_shared
+
+    def __repr__(self):
+        return 'OrderedDict()'
+
+    def __reduce__(self):
+        return '_NO_LABELS'
+
+
+class _SharedSet(set):
+    """Empty referrers shared by all Compounds that are not referred to """
+    add = update = _modify_shared
+
+    def __repr__(self):
+        return 'set()'
+
+    def __reduce__(self):
+        return '_NO_REFERRERS'
+
+
+# The empty containers and periodicity of a new Compound are shared with all
+# other Compounds until they are first modified, which reduces the memory of
+# a Particle by about a factor of three. Code that modifies the containers
+# directly, rather than through `Compound.add`, calls `Compound._own_children`,
+# `_own_labels` or `_own_referrers` first. The `periodicity` property hands
+# out a Compound's own array, so internal code reads `_periodicity` instead.
+_NO_CHILDREN = _SharedOrderedSet()
+_NO_LABELS = _SharedOrderedDict()
+_NO_REFERRERS = _SharedSet()
+_NO_PERIODICITY = np.zeros(3)
+_NO_PERIODICITY.flags.writeable = False
+
+# Labels enumerated from a group of children, e.g. 'C[17]'
+_INDEXED_LABEL = re.compile(r'(.+)\[(\d+)\]$')
+
+
+class _NodeIndex(object):
+    """Compounds of a hierarchy by name and rigid_id
+
+    Kept by the root of the hierarchy once it is first queried, and updated
+    when Compounds join or leave the hierarchy or change their name or
+    rigid_id. The Compounds of each name and rigid_id are kept in the order
+    in which they were indexed, which is the order of the hierarchy as long
+    as `ordered` is True. Changes that index Compounds out of this order set
+    `ordered` to False, and the index is rebuilt when the order is needed.
+    """
+    __slots__ = ('by_name', 'by_rigid_id', 'rigid', 'ordered')
+
+    def __init__(self, root):
+        self.by_name = dict()
+        self.by_rigid_id = dict()
+        self.rigid = dict()
+        self.ordered = True
+        self.add(root)
+        for node in root.successors():
+            self.add(node)
+
+    def add(self, node):
+        self.by_name.setdefault(node._name, dict())[node] = None
+        if node._rigid_id is not None:
+            self.by_rigid_id.setdefault(node._rigid_id, dict())[node] = None
+            self.rigid[node] = None
+
+    def discard(self, node):
+        for index, key in ((self.by_name, node._name),
+                           (self.by_rigid_id, node._rigid_id)):
+            nodes = index.get(key)
+            if nodes is not None:
+                nodes.pop(node, None)
+                if not nodes:
+                    del index[key]
+        self.rigid.pop(node, None)
+
+    @staticmethod
+    def is_last(node):
+        """Whether no Compound follows node in the order of its hierarchy
+
+        Descendants of node are not considered.
+        """
+        parent = node._parent
+        while parent is not None:
+            if next(reversed(parent.children)) is not node:
+                return False
+            node = parent
+            parent = node._parent
+        return True
+
+
 class Compound(object):
     """A building block in the mBuild hierarchy.
 
@@ -257,7 +536,9 @@ class Compound(object):
         Contains all children (other Compounds).
     labels : OrderedDict
         Labels to Compound/Atom mappings. These do not necessarily need not be
-        in self.children.
+        in self.children. Enumerated labels of children added with
+        `lazy_labels=True`, e.g. 'C[17]', are not stored but resolved from
+        their group, e.g. 'C', on lookup.
     parent : mb.Compound
         The parent Compound that contains this part. Can be None if this
         compound is the root of the containment hierarchy.
@@ -278,7 +559,28 @@ class Compound(object):
     xyz
     xyz_with_ports
 
+    Notes
+    -----
+    Attributes are stored in slots, and Compounds without children, labels,
+    referrers or periodicity share empty containers rather than allocating
+    their own, which keeps the memory of large systems of Particles small.
+    Subclasses and Compounds with additional attributes use a regular
+    instance dictionary.
+
     """
+    __slots__ = ('_name', '_parent', '_root', '_depth', 'children', 'labels',
+                 'referrers', 'bond_graph', 'port_particle', '_pos',
+                 '_periodicity',
+                 '_charge', '_rigid_id', '_contains_rigid',
+                 '_check_if_contains_rigid_bodies', '__dict__', '__weakref__')
+
+    # Created by `spatial_index` when first requested
+    _spatial_index = None
+    # Index of the hierarchy of a root, created by `_hierarchy_index`
+    _node_index = None
+    # Set once a child is added with `lazy_labels=True`, such that labels
+    # are only resolved from the groups of compounds that need it
+    _has_lazy_labels = False
 
     def __init__(self, subcompounds=None, name=None, pos=None, charge=0.0,
                  periodicity=None, port_particle=False):
@@ -289,13 +591,13 @@ class Compound(object):
                 raise ValueError(
                     'Compound.name should be a string. You passed '
                     '{}'.format(name))
-            self.name = name
+            self._name = name
         else:
-            self.name = self.__class__.__name__
+            self._name = self.__class__.__name__
 
         # A periodicity of zero in any direction is treated as non-periodic.
         if periodicity is None:
-            self._periodicity = np.array([0.0, 0.0, 0.0])
+            self._periodicity = _NO_PERIODICITY
         else:
             self._periodicity = np.asarray(periodicity)
 
@@ -304,10 +606,12 @@ class Compound(object):
         else:
             self._pos = np.zeros(3)
 
-        self.parent = None
-        self.children = OrderedSet()
-        self.labels = OrderedDict()
-        self.referrers = set()
+        self._parent = None
+        self._root = self
+        self._depth = 0
+        self.children = _NO_CHILDREN
+        self.labels = _NO_LABELS
+        self.referrers = _NO_REFERRERS
 
         self.bond_graph = None
         self.port_particle = port_particle
@@ -397,6 +701,85 @@ class Compound(object):
                 return False
         return True
 
+    @property
+    def parent(self):
+        """The Compound that contains self, or None for the root
+
+        Setting the parent updates the cached root and depth of self and
+        all of its descendants.
+        """
+        return self._parent
+
+    @parent.setter
+    def parent(self, value):
+        if value is not None and self._node_index is not None:
+            # The Compounds are indexed by their new root instead.
+            self._node_index = None
+        self._parent = value
+        if value is not None:
+            index = value._root._node_index
+            if index is not None and not _NodeIndex.is_last(self):
+                index.ordered = False
+        self._update_root()
+
+    def _update_root(self):
+        """Update the cached root and depth of self and its descendants """
+        self._set_root()
+        if self.children:
+            for child in self.children:
+                child._update_root()
+
+    def _set_root(self):
+        """Update the cached root and depth of self from its parent """
+        old_root = self._root
+        parent = self._parent
+        if parent is None:
+            root = self
+            self._depth = 0
+        else:
+            root = parent._root
+            self._depth = parent._depth + 1
+        self._root = root
+        if root is not old_root:
+            if old_root._node_index is not None:
+                old_root._node_index.discard(self)
+            if root._node_index is not None:
+                root._node_index.add(self)
+
+    @property
+    def name(self):
+        """The name of the Compound """
+        return self._name
+
+    @name.setter
+    def name(self, value):
+        index = self._root._node_index
+        if index is not None:
+            index.discard(self)
+            index.ordered = False
+        self._name = value
+        if index is not None:
+            index.add(self)
+
+    def _hierarchy_index(self, ordered=True):
+        """The index of the Compounds in self's hierarchy by name and rigid_id
+
+        Created by the root on first use, after which it is kept up to date.
+        If `ordered`, the index is rebuilt if needed such that the Compounds
+        of each name and rigid_id are in the order of the hierarchy.
+        """
+        root = self._root
+        index = root._node_index
+        if index is None or (ordered and not index.ordered):
+            index = root._node_index = _NodeIndex(root)
+        return index
+
+    def _indexed(self, nodes):
+        """Return the indexed Compounds that are below self """
+        if self._root is self:
+            return list(nodes)
+        return [node for node in nodes if self.is_ancestor(node)]
+
     def ancestors(self):
         """Generate all ancestors of the Compound recursively.
 
@@ -406,10 +789,34 @@ class Compound(object):
             The next Compound above self in the hierarchy
 
         """
-        if self.parent is not None:
-            yield self.parent
-            for ancestor in self.parent.ancestors():
-                yield ancestor
+        parent = self._parent
+        while parent is not None:
+            yield parent
+            parent = parent._parent
+
+    def is_ancestor(self, compound):
+        """Whether self is an ancestor of a Compound
+
+        Takes time proportional to the difference in depth of both
+        Compounds in their hierarchy.
+
+        Parameters
+        ----------
+        compound : mb.Compound
+            The Compound whose ancestors are checked
+
+        Returns
+        -------
+        bool
+            True if self is above compound in its hierarchy
+
+        """
+        steps = compound._depth - self._depth
+        if steps <= 0 or compound._root is not self._root:
+            return False
+        for _ in range(steps):
+            compound = compound._parent
+        return compound is self
 
     @property
     def root(self):
@@ -421,12 +828,7 @@ class Compound(object):
             The Compound at the top of self's hierarchy
 
         """
-        parent = None
-        for parent in self.ancestors():
-            pass
-        if parent is None:
-            return self
-        return parent
+        return self._root
 
     def particles_by_name(self, name):
         """Return all Particles of the Compound with a specific name
@@ -439,12 +841,18 @@ class Compound(object):
         Yields
         ------
         mb.Compound
-            The next Particle in the Compound with the user-specified name
+            The next Particle in the Compound with the user-specified name,
+            in the order of `particles`
 
         """
-        for particle in self.particles():
-            if particle.name == name:
-                yield particle
+        if not self.children:
+            if self.name == name:
+                yield self
+            return
+        nodes = self._hierarchy_index().by_name.get(name, ())
+        for node in self._indexed(nodes):
+            if not node.children and not node.port_particle:
+                yield node
 
     @property
     def charge(self):
@@ -466,7 +874,13 @@ class Compound(object):
     @rigid_id.setter
     def rigid_id(self, value):
         if self._contains_only_ports():
+            index = self._root._node_index
+            if index is not None:
+                index.discard(self)
+                index.ordered = False
             self._rigid_id = value
+            if index is not None:
+                index.add(self)
             for ancestor in self.ancestors():
                 ancestor._check_if_contains_rigid_bodies = True
         else:
@@ -518,11 +932,14 @@ class Compound(object):
             rigid body IDs are found, None is returned
 
         """
-        try:
-            return max([particle.rigid_id for particle in self.particles()
-                        if particle.rigid_id is not None])
-        except ValueError:
-            return
+        if not self.children:
+            return self.rigid_id
+        by_rigid_id = self._hierarchy_index(ordered=False).by_rigid_id
+        for rigid_id in sorted(by_rigid_id, reverse=True):
+            for node in self._indexed(by_rigid_id[rigid_id]):
+                if not node.children and not node.port_particle:
+                    return rigid_id
+        return None
 
     def rigid_particles(self, rigid_id=None):
         """Generate all particles in rigid bodies.
@@ -539,16 +956,22 @@ class Compound(object):
         ------
         mb.Compound
             The next particle with a rigid_id that is not None, or the next
-            particle with a matching rigid_id if specified
+            particle with a matching rigid_id if specified, in the order of
+            `particles`
 
         """
-        for particle in self.particles():
-            if rigid_id is not None:
-                if particle.rigid_id == rigid_id:
-                    yield particle
-            else:
-                if particle.rigid_id is not None:
-                    yield particle
+        if not self.children:
+            if self.rigid_id is not None and rigid_id in (None, self.rigid_id):
+                yield self
+            return
+        index = self._hierarchy_index()
+        if rigid_id is None:
+            nodes = index.rigid
+        else:
+            nodes = index.by_rigid_id.get(rigid_id, ())
+        for node in self._indexed(nodes):
+            if not node.children and not node.port_particle:
+                yield node
 
     def label_rigid_bodies(self, discrete_bodies=None, rigid_particles=None):
         """Designate which Compounds should be treated as rigid bodies
@@ -623,22 +1046,53 @@ class Compound(object):
             if isinstance(rigid_particles, str):
                 rigid_particles = [rigid_particles]
 
-        if self.root.max_rigid_id is not None:
-            rigid_id = self.root.max_rigid_id + 1
+        max_rigid_id = self.root.max_rigid_id
+        if max_rigid_id is not None:
+            rigid_id = max_rigid_id + 1
             warn("{} rigid bodies already exist.  Incrementing 'rigid_id'"
                  "starting from {}.".format(rigid_id, rigid_id))
         else:
             rigid_id = 0
 
+        # The particles of each Compound are contiguous in the order of
+        # `particles()`, so a single pass over the hierarchy finds the range
+        # of particles of each rigid body.
+        particles = []
+        names = []
+        starts = []
+        ends = []
+        open_bodies = []
         for successor in self.successors():
-            if discrete_bodies and successor.name not in discrete_bodies:
-                continue
-            for particle in successor.particles():
-                if rigid_particles and particle.name not in rigid_particles:
-                    continue
-                particle.rigid_id = rigid_id
-            if discrete_bodies:
-                rigid_id += 1
+            depth = successor._depth
+            while open_bodies and open_bodies[-1][1] >= depth:
+                ends[open_bodies.pop()[0]] = len(particles)
+            if successor.children:
+                successor._check_if_contains_rigid_bodies = True
+            if not discrete_bodies or successor.name in discrete_bodies:
+                open_bodies.append((len(starts), depth))
+                starts.append(len(particles))
+                ends.append(None)
+            if not successor.children and not successor.port_particle:
+                particles.append(successor)
+                names.append(successor.name)
+        for body, _ in open_bodies:
+            ends[body] = len(particles)
+        if not starts:
+            return
+
+        # Bodies nested in other bodies are labelled last, as they are found
+        # after the enclosing body.
+        bodies = np.full(len(particles), -1, dtype=int)
+        for body, (start, end) in enumerate(zip(starts, ends)):
+            bodies[start:end] = body if discrete_bodies else 0
+        labelled = bodies >= 0
+        if rigid_particles:
+            labelled &= np.isin(names, rigid_particles)
+        idxs = np.flatnonzero(labelled)
+        self._set_rigid_ids([particles[i] for i in idxs],
+                            (bodies[idxs] + rigid_id).tolist())
+        for compound in itertools.chain((self,), self.ancestors()):
+            compound._check_if_contains_rigid_bodies = True
 
     def unlabel_rigid_bodies(self):
         """Remove all rigid body labels from the Compound """
@@ -654,34 +1108,68 @@ class Compound(object):
         Adds `increment` to the rigid_id of all Particles in `self` that
         already have an integer rigid_id.
         """
-        for particle in self.particles():
-            if particle.rigid_id is not None:
-                particle.rigid_id += increment
+        particles = [particle for particle in self.particles()
+                     if particle.rigid_id is not None]
+        rigid_ids = np.array([particle.rigid_id for particle in particles],
+                             dtype=int)
+        self._set_rigid_ids(particles, (rigid_ids + increment).tolist())
 
     def _reorder_rigid_ids(self):
         """Reorder rigid body IDs ensuring consecutiveness.
 
         Primarily used internally to ensure consecutive rigid_ids following
-        removal of a Compound.
-
-        """
-        max_rigid = self.max_rigid_id
-        unique_rigid_ids = sorted(
-            set([p.rigid_id for p in self.rigid_particles()]))
-        n_unique_rigid = len(unique_rigid_ids)
-        if max_rigid and n_unique_rigid != max_rigid + 1:
-            missing_rigid_id = (
-                unique_rigid_ids[-1] * (unique_rigid_ids[-1] + 1)) / 2 - sum(unique_rigid_ids)
-            for successor in self.successors():
-                if successor.rigid_id is not None:
-                    if successor.rigid_id > missing_rigid_id:
-                        successor.rigid_id -= 1
-            if self.rigid_id:
-                if self.rigid_id > missing_rigid_id:
-                    self.rigid_id -= 1
+        removal of a Compound. All gaps are closed at once, preserving the
+        order of the rigid_ids.
 
+        """
+        particles = list(self.rigid_particles())
+        if not particles:
+            return
+        rigid_ids = np.array([particle.rigid_id for particle in particles],
+                             dtype=int)
+        unique_rigid_ids, new_rigid_ids = np.unique(rigid_ids,
+                                                    return_inverse=True)
+        if unique_rigid_ids[-1] == len(unique_rigid_ids) - 1:
+            return
+        changed = np.flatnonzero(new_rigid_ids != rigid_ids)
+        self._set_rigid_ids([particles[i] for i in changed],
+                            new_rigid_ids[changed].tolist())
+
+    def _set_rigid_ids(self, particles, rigid_ids):
+        """Set the rigid_ids of many particles in self's hierarchy at once
+
+        Unlike setting `rigid_id`, this does not mark the ancestors of the
+        particles to check whether they contain rigid bodies, which is left
+        to the caller.
+        """
+        index = self._root._node_index
+        if index is not None:
+            index.ordered = False
+        for particle, rigid_id in zip(particles, rigid_ids):
+            if index is not None:
+                index.discard(particle)
+            particle._rigid_id = rigid_id
+            if index is not None:
+                index.add(particle)
+
+    def _own_children(self):
+        """Replace shared empty children before modifying them in place """
+        if self.children is None or self.children is _NO_CHILDREN:
+            self.children = OrderedSet()
+
+    def _own_labels(self):
+        """Replace shared empty labels before modifying them in place """
+        if self.labels is None or self.labels is _NO_LABELS:
+            self.labels = OrderedDict()
+
+    def _own_referrers(self):
+        """Replace shared empty referrers before modifying them in place """
+        if self.referrers is _NO_REFERRERS:
+            self.referrers = set()
+
+    @profiled()
     def add(self, new_child, label=None, containment=True, replace=False,
-            inherit_periodicity=True, reset_rigid_ids=True):
+            inherit_periodicity=True, reset_rigid_ids=True, lazy_labels=False):
         """Add a part to the Compound.
 
         Note:
@@ -707,13 +1195,20 @@ class Compound(object):
             rigid_ids such that values remain distinct from rigid_ids
             already present in `self`. Can be set to False if attempting
             to add Compounds to an existing rigid body.
+        lazy_labels : bool, optional, default=False
+            Only add the part to the group of an enumerated label, e.g.
+            'C[$]', rather than also storing its indexed label, e.g. 'C[17]',
+            and registering self as its referrer. The indexed label is
+            resolved from the group on lookup. Explicit labels and parts
+            that are not contained are always stored.
 
         """
         # Support batch add via lists, tuples and sets.
         if (isinstance(new_child, Iterable) and
                 not isinstance(new_child, str)):
             for child in new_child:
-                self.add(child, reset_rigid_ids=reset_rigid_ids)
+                self.add(child, reset_rigid_ids=reset_rigid_ids,
+                         lazy_labels=lazy_labels)
             return
 
         if not isinstance(new_child, Compound):
@@ -729,10 +1224,8 @@ class Compound(object):
             self.rigid_id = None
 
         # Create children and labels on the first add operation
-        if self.children is None:
-            self.children = OrderedSet()
-        if self.labels is None:
-            self.labels = OrderedDict()
+        self._own_children()
+        self._own_labels()
 
         if containment:
             if new_child.parent is not None:
@@ -761,18 +1254,107 @@ class Compound(object):
 
             count = len(self.labels[label])
             self.labels[label].append(new_child)
-            label = label_pattern.format(count)
-
-        if not replace and label in self.labels:
-            raise MBuildError('Label "{0}" already exists in {1}.'.format(
-                label, self))
-        else:
-            self.labels[label] = new_child
-        new_child.referrers.add(self)
+            # The indexed label of a lazily labelled child is resolved from
+            # the group by `__getitem__`.
+            if lazy_labels and containment:
+                self._has_lazy_labels = True
+                label = None
+            else:
+                label = label_pattern.format(count)
+        elif not replace and self._has_lazy_labels:
+            # An explicit label may be the label of a lazily labelled child.
+            resolved = self._resolve_indexed_label(label)
+            if resolved is not None and resolved is not new_child:
+                raise MBuildError('Label "{0}" already exists in {1}.'.format(
+                    label, self))
+
+        if label is not None:
+            if not replace and label in self.labels:
+                raise MBuildError('Label "{0}" already exists in {1}.'.format(
+                    label, self))
+            else:
+                self.labels[label] = new_child
+            new_child._own_referrers()
+            new_child.referrers.add(self)
 
         if (inherit_periodicity and isinstance(new_child, Compound) and
-                new_child.periodicity.any()):
-            self.periodicity = new_child.periodicity
+                new_child._periodicity.any()):
+            self.periodicity = new_child._periodicity
+
+    def _bulk_add(self, new_children, labels=None, lazy_labels=False):
+        """Add many new children to the Compound at once.
+
+        Equivalent to calling `add` for each child with the default
+        arguments, but resolves the hierarchy bookkeeping once for the whole
+        batch. Children that contain bonds, rigid bodies, periodicity or
+        children of their own are passed on to `add`.
+
+        Parameters
+        ----------
+        new_children : iterable of mb.Compound
+            The Compounds to be added to this Compound.
+        labels : str or iterable of str, optional, default=None
+            A label for all children, or one label per child. Labels ending
+            in '[$]' are enumerated as in `add`.
+        lazy_labels : bool, optional, default=False
+            Resolve the enumerated labels of the children on lookup, as in
+            `add`.
+
+        """
+        if labels is None or isinstance(labels, str):
+            labels = itertools.repeat(labels)
+        if self.rigid_id is not None:
+            self.rigid_id = None
+
+        self._own_children()
+        self._own_labels()
+        children = self.children
+        self_labels = self.labels
+        root = self._root
+        depth = self._depth + 1
+        index = root._node_index
+        if index is not None and not _NodeIndex.is_last(self):
+            # The children are indexed after the descendants of self.
+            index.ordered = False
+        for new_child, label in zip(new_children, labels):
+            if (not isinstance(new_child, Compound) or new_child.children or
+                    new_child.bond_graph is not None or
+                    new_child.rigid_id is not None or
+                    new_child._periodicity.any()):
+                self.add(new_child, label=label, lazy_labels=lazy_labels)
+                continue
+            if new_child.parent is not None:
+                raise MBuildError('Part {} already has a parent: {}'.format(
+                    new_child, new_child.parent))
+            children.add(new_child)
+            # The child has no descendants whose root needs updating.
+            new_child._parent = self
+            new_child._root = root
+            new_child._depth = depth
+            if index is not None:
+                index.add(new_child)
+
+            if label is None:
+                label = '{0}[$]'.format(new_child.__class__.__name__)
+            if label.endswith('[$]'):
+                label = label[:-3]
+                if label not in self_labels:
+                    self_labels[label] = []
+                count = len(self_labels[label])
+                self_labels[label].append(new_child)
+                if lazy_labels:
+                    self._has_lazy_labels = True
+                    continue
+                label = '{0}[{1}]'.format(label, count)
+            elif label in self_labels or (
+                    self._has_lazy_labels and
+                    self._resolve_indexed_label(label) is not None):
+                raise MBuildError('Label "{0}" already exists in {1}.'.format(
+                    label, self))
+            self_labels[label] = new_child
+            if new_child.referrers is _NO_REFERRERS:
+                new_child.referrers = set()
+            new_child.referrers.add(self)
 
     def remove(self, objs_to_remove):
         """ Cleanly remove children from the Compound.
@@ -793,6 +1375,17 @@ class Compound(object):
         if len(objs_to_remove) == 0:
             return
 
+        # Index the labels of each referrer once for the whole batch
+        label_indexes = dict()
+
+        def _label_index(referrer):
+            if referrer not in label_indexes:
+                index = defaultdict(list)
+                for label, part in referrer.labels.items():
+                    index[id(part)].append(label)
+                label_indexes[referrer] = index
+            return label_indexes[referrer]
+
         # Remove Port objects separately
         ports_removed = set()
         for obj in objs_to_remove:
@@ -800,7 +1393,7 @@ class Compound(object):
                 ports_removed.add(obj)
                 self._remove(obj)
                 obj.parent.children.remove(obj)
-                self._remove_references(obj)
+                self._remove_references(obj, _label_index)
 
         objs_to_remove = objs_to_remove - ports_removed
 
@@ -810,10 +1403,12 @@ class Compound(object):
 
         # Recursively get container compounds to remove
         to_remove = list()
+        checked = set()
 
         def _check_if_empty(child):
-            if child in to_remove:
+            if child in checked:
                 return
+            checked.add(child)
             if set(child.particles()).issubset(particles_to_remove):
                 if child.parent:
                     to_remove.append(child)
@@ -834,18 +1429,18 @@ class Compound(object):
         for removed_part in to_remove:
             if removed_part.parent is not None:
                 removed_part.parent.children.remove(removed_part)
-            self._remove_references(removed_part)
+            self._remove_references(removed_part, _label_index)
 
         # Remove ghost ports
         all_ports_list = list(self.all_ports())
+        remaining_particles = set(self.particles())
         for port in all_ports_list:
-            if port.anchor not in [i for i in self.particles()]:
+            if port.anchor not in remaining_particles:
                 port.parent.children.remove(port)
 
         # Check and reorder rigid id
-        for _ in particles_to_remove:
-            if self.contains_rigid:
-                self.root._reorder_rigid_ids()
+        if particles_to_remove and self.contains_rigid:
+            self.root._reorder_rigid_ids()
 
 
     def _remove(self, removed_part):
@@ -861,16 +1456,27 @@ class Compound(object):
             self.root.bond_graph.remove_node(removed_part)
 
 
-    def _remove_references(self, removed_part):
-        """Remove labels pointing to this part and vice versa. """
+    def _remove_references(self, removed_part, label_index=None):
+        """Remove labels pointing to this part and vice versa.
+
+        `label_index` is an optional function returning a mapping from the
+        ids of parts to the labels pointing to them for a referrer, which
+        avoids scanning all labels of a referrer for each removed part.
+        """
         removed_part.parent = None
 
         # Remove labels in the hierarchy pointing to this part.
         referrers_to_remove = set()
         for referrer in removed_part.referrers:
-            if removed_part not in referrer.ancestors():
-                for label, referred_part in list(referrer.labels.items()):
-                    if referred_part is removed_part:
+            if not removed_part.is_ancestor(referrer):
+                if label_index is None:
+                    labels = [label for label, referred_part
+                              in referrer.labels.items()
+                              if referred_part is removed_part]
+                else:
+                    labels = label_index(referrer).pop(id(removed_part), [])
+                for label in labels:
+                    if referrer.labels.get(label) is removed_part:
                         del referrer.labels[label]
                         referrers_to_remove.add(referrer)
         removed_part.referrers -= referrers_to_remove
@@ -881,8 +1487,8 @@ class Compound(object):
             for label, part in list(removed_part.labels.items()):
                 if not isinstance(part, Compound):
                     for p in part:
-                        self._remove_references(p)
-                elif removed_part not in part.ancestors():
+                        self._remove_references(p, label_index)
+                elif not removed_part.is_ancestor(part):
                     try:
                         part.referrers.discard(removed_part)
                     except KeyError:
@@ -979,6 +1585,24 @@ class Compound(object):
 
         self.root.bond_graph.add_edge(particle_pair[0], particle_pair[1])
 
+    def _add_bonds(self, particle_pairs):
+        """Add bonds between many pairs of Particles at once.
+
+        Parameters
+        ----------
+        particle_pairs : iterable of indexable objects, length=2
+            The pairs of Particles to add bonds between
+
+        """
+        bond_graph = None
+        for particle1, particle2 in particle_pairs:
+            if bond_graph is None:
+                root = self.root
+                if root.bond_graph is None:
+                    root.bond_graph = BondGraph()
+                bond_graph = root.bond_graph
+            bond_graph.add_edge(particle1, particle2)
+
     def generate_bonds(self, name_a, name_b, dmin, dmax):
         """Add Bonds between all pairs of types a/b within [dmin, dmax].
 
@@ -994,10 +1618,12 @@ class Compound(object):
             The maximum distance between Particles for considering a bond
 
         """
+        from mbuild.periodic_kdtree import PeriodicCKDTree
+
         particle_kdtree = PeriodicCKDTree(
             data=self.xyz, bounds=self.periodicity)
         particle_array = np.array(list(self.particles()))
-        added_bonds = list()
+        added_bonds = set()
         for p1 in self.particles_by_name(name_a):
             nearest = self.particles_in_range(p1, dmax, max_particles=20,
                                               particle_kdtree=particle_kdtree,
@@ -1011,7 +1637,7 @@ class Compound(object):
                 min_dist = self.min_periodic_distance(p2.pos, p1.pos)
                 if (p2.name == name_b) and (dmin <= min_dist <= dmax):
                     self.add_bond((p1, p2))
-                    added_bonds.append(bond_tuple)
+                    added_bonds.add(bond_tuple)
 
     def remove_bond(self, particle_pair):
         """Deletes a bond between a pair of Particles
@@ -1034,12 +1660,11 @@ class Compound(object):
                  "".format(*particle_pair))
             return
         distance = np.linalg.norm(bond_vector)
-        particle_pair[0].parent.add(Port(anchor=particle_pair[0],
-                                         orientation=-bond_vector,
-                                         separation=distance / 2), 'port[$]')
-        particle_pair[1].parent.add(Port(anchor=particle_pair[1],
-                                         orientation=bond_vector,
-                                         separation=distance / 2), 'port[$]')
+        ports = Port.from_anchors(particle_pair,
+                                  orientation=[-bond_vector, bond_vector],
+                                  separation=distance / 2)
+        for particle, port in zip(particle_pair, ports):
+            particle.parent.add(port, 'port[$]')
 
     @property
     def pos(self):
@@ -1058,11 +1683,18 @@ class Compound(object):
 
     @property
     def periodicity(self):
-        return self._periodicity
+        periodicity = self._periodicity
+        if periodicity is _NO_PERIODICITY:
+            # Give self its own array before it can be modified in place.
+            periodicity = self._periodicity = np.zeros(3)
+        return periodicity
 
     @periodicity.setter
     def periodicity(self, periods):
-        self._periodicity = np.array(periods)
+        periods = np.array(periods)
+        if periods.shape == (3,) and not periods.any():
+            periods = _NO_PERIODICITY
+        self._periodicity = periods
 
     @property
     def xyz(self):
@@ -1149,6 +1781,31 @@ class Compound(object):
                     include_ports=True), arrnx3):
                 atom.pos = coords
 
+    def _set_coordinates(self, arrnx3, source):
+        """Set the positions of all particles, excluding Ports, in one pass.
+
+        Parameters
+        ----------
+        arrnx3 : np.ndarray, shape=(n,3), dtype=float
+            The new particle positions
+        source : object
+            Where the positions were read from, used in error messages
+
+        Raises
+        ------
+        ValueError
+            If the number of positions does not match the number of
+            particles
+
+        """
+        particles = list(self.particles(include_ports=False))
+        if len(particles) != len(arrnx3):
+            raise ValueError('Number of atoms in {} does not match {}'.format(
+                source, self))
+        arrnx3 = np.array(arrnx3, dtype=float)
+        for particle, pos in zip(particles, arrnx3):
+            particle._pos = pos
+
     @property
     def center(self):
         """The cartesian center of the Compound based on its Particles.
@@ -1233,15 +1890,45 @@ class Compound(object):
 
         """
         if particle_kdtree is None:
+            from mbuild.periodic_kdtree import PeriodicCKDTree
             particle_kdtree = PeriodicCKDTree(
                 data=self.xyz, bounds=self.periodicity)
         _, idxs = particle_kdtree.query(
             compound.pos, k=max_particles, distance_upper_bound=dmax)
-        idxs = idxs[idxs != self.n_particles]
+        # Missing neighbors are indicated by the number of points in the tree
+        idxs = idxs[idxs != particle_kdtree.n]
         if particle_array is None:
             particle_array = np.array(list(self.particles()))
         return particle_array[idxs]
 
+    def spatial_index(self):
+        """Return a spatial index of the particles of the Compound.
+
+        The index is kept with the Compound and updated to its current
+        particles and coordinates each time it is returned, which only
+        rebuilds its kd-tree if needed. Selections from the index, e.g.
+        `within`, `within_of`, `slab`, `box` and `nearest`, take periodicity
+        into account.
+
+        Returns
+        -------
+        mb.spatial.SpatialIndex
+            The spatial index of the particles of the Compound
+
+        Examples
+        --------
+        >>> solvent_near_solute = box.spatial_index().within_of(
+        ...     solute, 0.5, return_particles=True)
+
+        """
+        from mbuild.spatial import SpatialIndex
+
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex(self)
+        else:
+            self._spatial_index.update()
+        return self._spatial_index
+
     def visualize(self, show_ports=False,
             backend='py3dmol', color_scheme={}): # pragma: no cover
         """Visualize the Compound using py3dmol (default) or nglview.
@@ -1418,11 +2105,27 @@ class Compound(object):
 
         """
         particles = list(self.particles())
+        particle_index = {particle: idx for idx, particle in enumerate(particles)}
+        shifts = np.array([particle.pos for particle in particles],
+                          dtype=float).reshape(-1, 3) - initial_coordinates
+
+        # Gather the ghost particles of all anchored ports, along with the
+        # index of their anchor, so that all ports are shifted at once.
+        ghosts = list()
+        anchor_idxs = list()
         for port in self.all_ports():
-            if port.anchor:
-                idx = particles.index(port.anchor)
-                shift = particles[idx].pos - initial_coordinates[idx]
-                port.translate(shift)
+            if port.anchor is None or port.anchor not in particle_index:
+                continue
+            port_particles = list(port.particles(include_ports=True))
+            ghosts.extend(port_particles)
+            anchor_idxs.extend([particle_index[port.anchor]] * len(port_particles))
+        if not ghosts:
+            return
+
+        new_positions = np.array([ghost.pos for ghost in ghosts], dtype=float)
+        new_positions += shifts[anchor_idxs]
+        for ghost, pos in zip(ghosts, new_positions):
+            ghost.pos = pos
 
     def _kick(self):
         """Slightly adjust all coordinates in a Compound
@@ -1554,29 +2257,33 @@ class Compound(object):
 
 
         """
-        tmp_dir = tempfile.mkdtemp()
-        original = clone(self)
         self._kick()
-        self.save(os.path.join(tmp_dir, 'un-minimized.mol2'))
+        xyz_init = self.xyz
+        xyz = self._minimized_xyz(forcefield=forcefield, steps=steps, **kwargs)
+        self._set_coordinates(xyz, 'the minimized structure')
+        self._update_port_locations(xyz_init)
+
+    def _minimized_xyz(self, forcefield='UFF', steps=1000, **kwargs):
+        """Energy minimize a Compound and return the particle positions
+
+        The positions of the Compound itself are not changed. See
+        `energy_minimize` for a description of the arguments.
+        """
         extension = os.path.splitext(forcefield)[-1]
-        openbabel_ffs = ['MMFF94', 'MMFF94s', 'UFF', 'GAFF', 'Ghemical']
-        if forcefield in openbabel_ffs:
-            self._energy_minimize_openbabel(tmp_dir, forcefield=forcefield,
-                                            steps=steps, **kwargs)
+        if forcefield in _OPENBABEL_FORCEFIELDS:
+            return self._energy_minimize_openbabel(forcefield=forcefield,
+                                                   steps=steps, **kwargs)
         elif extension == '.xml':
-            self._energy_minimize_openmm(tmp_dir, forcefield_files=forcefield,
-                                         forcefield_name=None,
-                                         steps=steps, **kwargs)
+            return self._energy_minimize_openmm(forcefield_files=forcefield,
+                                                forcefield_name=None,
+                                                steps=steps, **kwargs)
         else:
-            self._energy_minimize_openmm(tmp_dir, forcefield_files=None,
-                                         forcefield_name=forcefield,
-                                         steps=steps, **kwargs)
-
-        self.update_coordinates(os.path.join(tmp_dir, 'minimized.pdb'))
+            return self._energy_minimize_openmm(forcefield_files=None,
+                                                forcefield_name=forcefield,
+                                                steps=steps, **kwargs)
 
     def _energy_minimize_openmm(
             self,
-            tmp_dir,
             forcefield_files=None,
             forcefield_name=None,
             steps=1000,
@@ -1589,6 +2296,10 @@ class Compound(object):
         Converts an mBuild Compound to a ParmEd Structure,
         applies a forcefield using Foyer, and creates an OpenMM System.
 
+        The OpenMM Simulation is kept in memory and reused by later calls on
+        Compounds with the same particles, bonds and forcefield, in which case
+        the atomtyping and creation of the System are skipped.
+
         Parameters
         ----------
         forcefield_files : str or list of str, optional, default=None
@@ -1608,6 +2319,10 @@ class Compound(object):
         scale_nonbonded : float, optional, default=1
             Scales epsilon (1 is completely on)
 
+        Returns
+        -------
+        np.ndarray, shape=(n, 3), dtype=float
+            The minimized particle positions, in nm
 
         Notes
         -----
@@ -1628,14 +2343,45 @@ class Compound(object):
 
 
         """
-        foyer = import_('foyer')
+        if isinstance(forcefield_files, list):
+            forcefield_files = tuple(forcefield_files)
+        key = (self._topology_key(), forcefield_files, forcefield_name,
+               scale_bonds, scale_angles, scale_torsions, scale_nonbonded)
+        simulation = _openmm_simulations.pop(key, None)
+        if simulation is None:
+            simulation = self._openmm_simulation(
+                forcefield_files=forcefield_files,
+                forcefield_name=forcefield_name,
+                scale_bonds=scale_bonds,
+                scale_angles=scale_angles,
+                scale_torsions=scale_torsions,
+                scale_nonbonded=scale_nonbonded)
+        _openmm_simulations[key] = simulation
+        while len(_openmm_simulations) > _OPENMM_SIMULATION_CACHE_SIZE:
+            _openmm_simulations.popitem(last=False)
+
+        import simtk.unit as u
+
+        simulation.context.setPositions(self.xyz * u.nanometer)
+        # Run energy minimization through OpenMM
+        simulation.minimizeEnergy(maxIterations=steps)
+        state = simulation.context.getState(getPositions=True)
+        return state.getPositions(asNumpy=True).value_in_unit(u.nanometer)
 
-        to_parmed = self.to_parmed()
-        ff = foyer.Forcefield(forcefield_files=forcefield_files, name=forcefield_name)
-        to_parmed = ff.apply(to_parmed)
+    def _openmm_simulation(self, forcefield_files=None, forcefield_name=None,
+                           scale_bonds=1, scale_angles=1, scale_torsions=1,
+                           scale_nonbonded=1):
+        """Create an OpenMM Simulation of the Compound for minimization
+
+        See `_energy_minimize_openmm` for a description of the parameters.
+        """
+        from mbuild.utils.forcefields import apply_forcefield
+
+        to_parmed = apply_forcefield(self.to_parmed(),
+                                     forcefield_files=forcefield_files,
+                                     name=forcefield_name)
 
         from simtk.openmm.app.simulation import Simulation
-        from simtk.openmm.app.pdbreporter import PDBReporter
         from simtk.openmm.openmm import LangevinIntegrator
         import simtk.unit as u
 
@@ -1702,16 +2448,22 @@ class Compound(object):
                     'This Force will not be updated!'.format(
                         type(force).__name__))
 
-        simulation.context.setPositions(to_parmed.positions)
-        # Run energy minimization through OpenMM
-        simulation.minimizeEnergy(maxIterations=steps)
-        reporter = PDBReporter(os.path.join(tmp_dir, 'minimized.pdb'), 1)
-        reporter.report(
-            simulation,
-            simulation.context.getState(
-                getPositions=True))
+        return simulation
+
+    def _topology_key(self):
+        """A hashable description of the particles and bonds of the Compound
+
+        Two Compounds have the same key if their particles, in order, have the
+        same names and charges and they are bonded the same way.
+        """
+        particles = list(self.particles())
+        particle_index = {particle: idx for idx, particle in enumerate(particles)}
+        bonds = sorted(tuple(sorted((particle_index[p1], particle_index[p2])))
+                       for p1, p2 in self.bonds())
+        return (tuple((particle.name, particle.charge) for particle in particles),
+                tuple(bonds))
 
-    def _energy_minimize_openbabel(self, tmp_dir, steps=1000, algorithm='cg',
+    def _energy_minimize_openbabel(self, steps=1000, algorithm='cg',
                                    forcefield='UFF'):
         """Perform an energy minimization on a Compound
 
@@ -1738,6 +2490,11 @@ class Compound(object):
             readthedocs.io/en/latest/Forcefields/Overview.html) when considering
             your choice of force field.
 
+        Returns
+        -------
+        np.ndarray, shape=(n, 3), dtype=float
+            The minimized particle positions, in nm
+
         References
         ----------
         .. [1] O'Boyle, N.M.; Banck, M.; James, C.A.; Morley, C.;
@@ -1784,6 +2541,8 @@ class Compound(object):
                J. Comput. Chem. 22, 1229-1242
         """
 
+        from mdtraj.core.element import get_by_symbol
+
         openbabel = import_('openbabel')
 
         for particle in self.particles():
@@ -1794,11 +2553,7 @@ class Compound(object):
                                   "perform minimization."
                                   "".format(particle.name))
 
-        obConversion = openbabel.OBConversion()
-        obConversion.SetInAndOutFormats("mol2", "pdb")
-        mol = openbabel.OBMol()
-
-        obConversion.ReadFile(mol, os.path.join(tmp_dir, "un-minimized.mol2"))
+        mol = self.to_pybel().OBMol
 
         ff = openbabel.OBForceField.FindForceField(forcefield)
         if ff is None:
@@ -1822,8 +2577,71 @@ class Compound(object):
                               "are 'steep', 'cg', and 'md'.")
         ff.UpdateCoordinates(mol)
 
-        obConversion.WriteFile(mol, os.path.join(tmp_dir, 'minimized.pdb'))
+        xyz = np.array([[atom.GetX(), atom.GetY(), atom.GetZ()]
+                        for atom in openbabel.OBMolAtomIter(mol)])
+        # Open Babel uses Angstroms
+        return xyz.reshape(-1, 3) / 10
 
+    def relax_overlaps(self, r_min=0.2, steps=1000, keep_bonds=True,
+                       tolerance=1e-4):
+        """Push apart overlapping particles without a force field
+
+        A cheap alternative to `energy_minimize` for removing overlaps, e.g.
+        after filling a box or tiling a lattice. Particles closer than
+        `r_min` repel each other through a soft, harmonic potential, and the
+        structure is relaxed with the FIRE algorithm. Bonded particles and
+        particles bonded to a common particle do not repel each other. The
+        periodicity of the Compound is respected.
+
+        Parameters
+        ----------
+        r_min : float, optional, default=0.2
+            Distance, in nm, below which two particles overlap
+        steps : int, optional, default=1000
+            Maximum number of relaxation steps
+        keep_bonds : bool, optional, default=True
+            Restrain the distances between bonded particles, and between
+            particles bonded to a common particle, to their initial values.
+            This keeps bond lengths and angles close to their initial values.
+        tolerance : float, optional, default=1e-4
+            The relaxation stops once the largest force on any particle, in
+            units of nm, falls below this value
+
+        Returns
+        -------
+        int
+            The number of relaxation steps taken
+
+        See Also
+        --------
+        energy_minimize : Minimize the energy with a force field
+
+        """
+        from mbuild.relax import relax_soft_spheres
+
+        particles = list(self.particles())
+        if not particles:
+            return 0
+        index = {particle: i for i, particle in enumerate(particles)}
+        bonds = [(index[p1], index[p2]) for p1, p2 in self.bonds()]
+        neighbors = defaultdict(list)
+        for i, j in bonds:
+            neighbors[i].append(j)
+            neighbors[j].append(i)
+        pairs_13 = [pair for bonded in neighbors.values()
+                    for pair in itertools.combinations(bonded, 2)]
+        restrained = bonds + pairs_13
+
+        xyz_init = self.xyz
+        xyz, n_steps = relax_soft_spheres(
+            xyz_init, r_min, periodicity=self.periodicity,
+            bonds=restrained if keep_bonds else None, exclusions=restrained,
+            steps=steps, tolerance=tolerance)
+        self._set_coordinates(xyz, 'the relaxed structure')
+        self._update_port_locations(xyz_init)
+        return n_steps
+
+    @profiled()
     def save(self, filename, show_ports=False, forcefield_name=None,
              forcefield_files=None, forcefield_debug=False, box=None,
              overwrite=False, residues=None, combining_rule='lorentz',
@@ -1836,7 +2654,7 @@ class Compound(object):
             Filesystem path in which to save the trajectory. The extension or
             prefix will be parsed and control the format. Supported
             extensions are: 'hoomdxml', 'gsd', 'gro', 'top',
-            'lammps', 'lmp', 'mcf'
+            'lammps', 'lmp', 'mcf', 'json', 'npz'
         show_ports : bool, optional, default=False
             Save ports contained within the compound.
         forcefield_files : str, optional, default=None
@@ -1897,7 +2715,8 @@ class Compound(object):
 
         Notes
         ------
-        When saving the compound as a json, only the following arguments are used:
+        When saving the compound as a json or npz, only the following
+        arguments are used:
             - filename
             - show_ports
 
@@ -1909,31 +2728,32 @@ class Compound(object):
         formats.lammpsdata.write_lammpsdata : Write to LAMMPS data format
         formats.cassandramcf.write_mcf : Write to Cassandra MCF format
         formats.json_formats.compound_to_json : Write to a json file
+        formats.npz.compound_to_npz : Write to a NumPy npz checkpoint
 
         """
         extension = os.path.splitext(filename)[-1]
 
         if extension == '.json':
+            from mbuild.formats.json_formats import compound_to_json
             compound_to_json(self,
                              file_path=filename,
                              include_ports=show_ports)
             return
 
-        # Savers supported by mbuild.formats
-        savers = {'.hoomdxml': write_hoomdxml,
-                  '.gsd': write_gsd,
-                  '.xyz': write_xyz,
-                  '.lammps': write_lammpsdata,
-                  '.lmp': write_lammpsdata,
-                  '.par': write_par,}
-        if has_networkx:
-            from mbuild.formats.cassandramcf import write_mcf
-            savers.update({'.mcf': write_mcf})
+        if extension == '.npz':
+            if os.path.exists(filename) and not overwrite:
+                raise IOError('{0} exists; not overwriting'.format(filename))
+            from mbuild.formats.npz import compound_to_npz
+            compound_to_npz(self,
+                            file_path=filename,
+                            include_ports=show_ports)
+            return
 
-        try:
-            saver = savers[extension]
-        except KeyError:
-            saver = None
+        # Savers supported by mbuild.formats
+        saver = None
+        if extension in _SAVERS and (extension != '.mcf' or has_networkx):
+            module, name = _SAVERS[extension]
+            saver = getattr(importlib.import_module(module), name)
 
         if os.path.exists(filename) and not overwrite:
             raise IOError('{0} exists; not overwriting'.format(filename))
@@ -1942,12 +2762,14 @@ class Compound(object):
                                    show_ports=show_ports)
         # Apply a force field with foyer if specified
         if forcefield_name or forcefield_files:
-            foyer = import_('foyer')
-            ff = foyer.Forcefield(forcefield_files=forcefield_files,
-                            name=forcefield_name, debug=forcefield_debug)
+            from mbuild.utils.forcefields import apply_forcefield
             if not foyer_kwargs:
                 foyer_kwargs = {}
-            structure = ff.apply(structure, **foyer_kwargs)
+            structure = apply_forcefield(structure,
+                                         forcefield_files=forcefield_files,
+                                         name=forcefield_name,
+                                         debug=forcefield_debug,
+                                         **foyer_kwargs)
             structure.combining_rule = combining_rule
 
         total_charge = sum([atom.charge for atom in structure])
@@ -2039,7 +2861,7 @@ class Compound(object):
     # Interface to Trajectory for reading/writing .pdb and .mol2 files.
     # -----------------------------------------------------------------
     def from_trajectory(self, traj, frame=-1, coords_only=False,
-            infer_hierarchy=True):
+            infer_hierarchy=True, lazy_labels=False):
         """Extract atoms and bonds from a md.Trajectory.
 
         Will create sub-compounds for every chain if there is more than one
@@ -2055,20 +2877,16 @@ class Compound(object):
             Only read coordinate information
         infer_hierarchy : bool, optional, default=True
             If True, infer compound hierarchy from chains and residues
+        lazy_labels : bool, optional, default=False
+            Resolve the enumerated labels of the atoms, e.g. 'C[17]', on
+            lookup rather than storing them, see `add`.
         """
         if coords_only:
-            if traj.n_atoms != self.n_particles:
-                raise ValueError('Number of atoms in {traj} does not match'
-                                 ' {self}'.format(**locals()))
-            atoms_particles = zip(traj.topology.atoms,
-                                  self.particles(include_ports=False))
-            if None in self._particles(include_ports=False):
-                raise ValueError('Some particles are None')
-            for mdtraj_atom, particle in atoms_particles:
-                particle.pos = traj.xyz[frame, mdtraj_atom.index]
+            self._set_coordinates(traj.xyz[frame], traj)
             return
 
-        atom_mapping = dict()
+        xyz = traj.xyz[frame]
+        particles = [None] * traj.n_atoms
         for chain in traj.topology.chains:
             if traj.topology.n_chains > 1:
                 chain_compound = Compound()
@@ -2078,22 +2896,22 @@ class Compound(object):
             for res in chain.residues:
                 if infer_hierarchy:
                     res_compound = Compound(name=res.name)
-                    chain_compound.add(res_compound)
+                    chain_compound._bulk_add((res_compound,))
                     parent_cmpd = res_compound
                 else:
                     parent_cmpd = chain_compound
-                for atom in res.atoms:
-                    new_atom = Particle(name=str(atom.name),
-                                        pos=traj.xyz[frame, atom.index])
-                    parent_cmpd.add(
-                        new_atom, label='{0}[$]'.format(
-                            atom.name))
-                    atom_mapping[atom] = new_atom
-
-        for mdtraj_atom1, mdtraj_atom2 in traj.topology.bonds:
-            atom1 = atom_mapping[mdtraj_atom1]
-            atom2 = atom_mapping[mdtraj_atom2]
-            self.add_bond((atom1, atom2))
+                atoms = list(res.atoms)
+                new_atoms = [Particle(name=str(atom.name), pos=xyz[atom.index])
+                             for atom in atoms]
+                parent_cmpd._bulk_add(
+                    new_atoms,
+                    labels=['{0}[$]'.format(atom.name) for atom in atoms],
+                    lazy_labels=lazy_labels)
+                for atom, new_atom in zip(atoms, new_atoms):
+                    particles[atom.index] = new_atom
+
+        self._add_bonds((particles[atom1.index], particles[atom2.index])
+                        for atom1, atom2 in traj.topology.bonds)
 
         if np.any(traj.unitcell_lengths) and np.any(traj.unitcell_lengths[0]):
             self.periodicity = traj.unitcell_lengths[0]
@@ -2129,6 +2947,8 @@ class Compound(object):
         _to_topology
 
         """
+        import mdtraj as md
+
         atom_list = [particle for particle in self.particles(show_ports)]
 
         top = self._to_topology(atom_list, chains, residues)
@@ -2176,6 +2996,7 @@ class Compound(object):
         mdtraj.Topology : Details on the mdtraj Topology object
 
         """
+        from mdtraj.core.element import get_by_symbol
         from mdtraj.core.topology import Topology
 
         if isinstance(chains, str):
@@ -2275,7 +3096,7 @@ class Compound(object):
         return top
 
     def from_parmed(self, structure, coords_only=False,
-            infer_hierarchy=True):
+            infer_hierarchy=True, lazy_labels=False):
         """Extract atoms and bonds from a pmd.Structure.
 
         Will create sub-compounds for every chain if there is more than one
@@ -2289,21 +3110,14 @@ class Compound(object):
             Set preexisting atoms in compound to coordinates given by structure.
         infer_hierarchy : bool, optional, default=True
             If true, infer compound hierarchy from chains and residues
+        lazy_labels : bool, optional, default=False
+            Resolve the enumerated labels of the atoms, e.g. 'C[17]', on
+            lookup rather than storing them, see `add`.
         """
         if coords_only:
-            if len(structure.atoms) != self.n_particles:
-                raise ValueError(
-                    'Number of atoms in {structure} does not match'
-                    ' {self}'.format(
-                        **locals()))
-            atoms_particles = zip(structure.atoms,
-                                  self.particles(include_ports=False))
-            if None in self._particles(include_ports=False):
-                raise ValueError('Some particles are None')
-            for parmed_atom, particle in atoms_particles:
-                particle.pos = np.array([parmed_atom.xx,
-                                         parmed_atom.xy,
-                                         parmed_atom.xz]) / 10
+            xyz = np.array([[atom.xx, atom.xy, atom.xz]
+                            for atom in structure.atoms]).reshape(-1, 3) / 10
+            self._set_coordinates(xyz, structure)
             return
 
         atom_mapping = dict()
@@ -2321,22 +3135,23 @@ class Compound(object):
             for residue in residues:
                 if infer_hierarchy:
                     residue_compound = Compound(name=residue.name)
-                    chain_compound.add(residue_compound)
+                    chain_compound._bulk_add((residue_compound,))
                     parent_cmpd = residue_compound
                 else:
                     parent_cmpd = chain_compound
-                for atom in residue.atoms:
-                    pos = np.array([atom.xx, atom.xy, atom.xz]) / 10
-                    new_atom = Particle(name=str(atom.name), pos=pos)
-                    parent_cmpd.add(
-                        new_atom, label='{0}[$]'.format(
-                            atom.name))
-                    atom_mapping[atom] = new_atom
-
-        for bond in structure.bonds:
-            atom1 = atom_mapping[bond.atom1]
-            atom2 = atom_mapping[bond.atom2]
-            self.add_bond((atom1, atom2))
+                xyz = np.array([[atom.xx, atom.xy, atom.xz]
+                                for atom in residue.atoms]).reshape(-1, 3) / 10
+                new_atoms = [Particle(name=str(atom.name), pos=pos)
+                             for atom, pos in zip(residue.atoms, xyz)]
+                parent_cmpd._bulk_add(
+                    new_atoms,
+                    labels=['{0}[$]'.format(atom.name)
+                            for atom in residue.atoms],
+                    lazy_labels=lazy_labels)
+                atom_mapping.update(zip(residue.atoms, new_atoms))
+
+        self._add_bonds((atom_mapping[bond.atom1], atom_mapping[bond.atom2])
+                        for bond in structure.bonds)
 
         if structure.box is not None:
             # Convert from A to nm
@@ -2344,6 +3159,7 @@ class Compound(object):
         else:
             self.periodicity = np.array([0., 0., 0.])
 
+    @profiled()
     def to_parmed(self, box=None, title='', residues=None, show_ports=False,
             infer_residues=False):
         """Create a ParmEd Structure from a Compound.
@@ -2376,6 +3192,9 @@ class Compound(object):
         parmed.structure.Structure : Details on the ParmEd Structure object
 
         """
+        import parmed as pmd
+        from parmed.periodic_table import AtomicNum, element_by_name, Mass
+
         structure = pmd.Structure()
         structure.title = title if title else self.name
         atom_mapping = {}  # For creating bonds below
@@ -2573,6 +3392,7 @@ class Compound(object):
         Bond orders are assumed to be 1
         OBMol atom indexing starts at 1, with spatial dimension Angstrom
         """
+        from parmed.periodic_table import AtomicNum
 
         openbabel = import_('openbabel')
         pybel = import_('pybel')
@@ -2693,6 +3513,8 @@ class Compound(object):
             If True, infer hierarchy from residues
 
         """
+        from parmed.periodic_table import Element
+
         openbabel = import_("openbabel")
         self.name = pybel_mol.title.split('.')[0]
         resindex_to_cmpd = {}
@@ -2844,9 +3666,32 @@ class Compound(object):
         if isinstance(selection, int):
             return list(self.particles())[selection]
         if isinstance(selection, str):
-            if selection not in self.labels:
+            if selection in self.labels:
+                return self.labels[selection]
+            part = self._resolve_indexed_label(selection)
+            if part is None:
                 raise MBuildError('{}[\'{}\'] does not exist.'.format(self.name,selection))
-            return self.labels.get(selection)
+            return part
+
+    def _resolve_indexed_label(self, label):
+        """Find the child with an enumerated label that is not stored
+
+        Labels such as 'C[17]' of children added with `lazy_labels=True` are
+        resolved by indexing their group, e.g. 'C'. Children that have since
+        been removed are not resolved, as their stored labels would have been
+        deleted.
+        """
+        match = _INDEXED_LABEL.match(label)
+        if match is None:
+            return None
+        group = self.labels.get(match.group(1))
+        index = int(match.group(2))
+        if not isinstance(group, list) or index >= len(group):
+            return None
+        part = group[index]
+        if part.parent is not self:
+            return None
+        return part
 
     def __repr__(self):
         descr = list('<')
@@ -2854,8 +3699,8 @@ class Compound(object):
 
         if self.children:
             descr.append('{:d} particles, '.format(self.n_particles))
-            if any(self.periodicity):
-                descr.append('periodicity: {}, '.format(self.periodicity))
+            if any(self._periodicity):
+                descr.append('periodicity: {}, '.format(self._periodicity))
             else:
                 descr.append('non-periodic, ')
         else:
@@ -2889,8 +3734,8 @@ class Compound(object):
         # Remember that we're cloning the new one of self.
         clone_of[self] = newone
 
-        newone.name = deepcopy(self.name)
-        newone.periodicity = deepcopy(self.periodicity)
+        newone._name = self._name
+        newone.periodicity = self._periodicity
         newone._pos = deepcopy(self._pos)
         newone.port_particle = deepcopy(self.port_particle)
         newone._check_if_contains_rigid_bodies = deepcopy(
@@ -2903,12 +3748,19 @@ class Compound(object):
 
         if self.children is None:
             newone.children = None
-        else:
+        elif self.children:
             newone.children = OrderedSet()
-        # Parent should be None initially.
-        newone.parent = None
-        newone.labels = OrderedDict()
-        newone.referrers = set()
+        else:
+            newone.children = _NO_CHILDREN
+        # Parent should be None initially. The roots and depths of the
+        # cloned hierarchy are updated once it is complete.
+        newone._parent = None
+        newone._root = newone
+        newone._depth = 0
+        newone.labels = OrderedDict() if self.labels else _NO_LABELS
+        if self._has_lazy_labels:
+            newone._has_lazy_labels = True
+        newone.referrers = _NO_REFERRERS
         newone.bond_graph = None
 
         # Add children to clone.
@@ -2916,7 +3768,7 @@ class Compound(object):
             for child in self.children:
                 newchild = child._clone(clone_of, root_container)
                 newone.children.add(newchild)
-                newchild.parent = newone
+                newchild._parent = newone
 
         # Copy labels, except bonds with atoms outside the hierarchy.
         if self.labels:
@@ -2924,6 +3776,7 @@ class Compound(object):
                 if not isinstance(compound, list):
                     newone.labels[label] = compound._clone(
                         clone_of, root_container)
+                    compound._own_referrers()
                     compound.referrers.add(clone_of[compound])
                 else:
                     # compound is a list of compounds, so we create an empty
@@ -2935,6 +3788,8 @@ class Compound(object):
                         # Referrers must have been handled already, or the will
                         # be handled
 
+        if root_container is self:
+            newone._update_root()
         return newone
 
     def _clone_bonds(self, clone_of=None):
@@ -4,6 +4,7 @@ simplefilter('always', DeprecationWarning)
 import numpy as np
 from numpy.linalg import norm, svd, inv
 from mbuild.utils.decorators import deprecated
+from mbuild.profiling import profiled
 
 
 __all__ = ['rotate', 'rotate_around_x', 'rotate_around_y', 'rotate_around_z',
@@ -15,6 +16,7 @@ __all__ = ['rotate', 'rotate_around_x', 'rotate_around_y', 'rotate_around_z',
            'equivalence_transform']
 
 
+@profiled()
 def force_overlap(move_this, from_positions, to_positions, add_bond=True):
     """Computes an affine transformation that maps the from_positions to the
     respective to_positions, and applies this transformation to the compound.
@@ -248,6 +250,46 @@ class RigidTransform(CoordinateTransform):
         super(RigidTransform, self).__init__(T)
 
 
+def _rotation_matrices(theta, around):
+    """Rotation matrices around vectors by angles, as in `Rotation`.
+
+    Parameters
+    ----------
+    theta : float or np.ndarray, shape=(n,), dtype=float
+        The angles of rotation, in radians.
+    around : np.ndarray, shape=(3,) or (n, 3), dtype=float
+        The vectors about which to rotate.
+
+    Returns
+    -------
+    np.ndarray, shape=(3, 3) or (n, 3, 3), dtype=float
+        A single matrix if both `theta` and `around` describe a single
+        rotation.
+
+    """
+    theta = np.asarray(theta, dtype=float)
+    around = np.asarray(around, dtype=float)
+    single = theta.ndim == 0 and around.ndim == 1
+    around = np.atleast_2d(around)
+    n = around / norm(around, axis=1)[:, np.newaxis]
+    n, theta = np.broadcast_arrays(n, np.atleast_1d(theta)[:, np.newaxis])
+    theta = theta[:, 0]
+
+    s = np.sin(theta)[:, np.newaxis, np.newaxis]
+    c = np.cos(theta)[:, np.newaxis, np.newaxis]
+    t = 1 - c
+    x, y, z = n[:, 0], n[:, 1], n[:, 2]
+    cross = np.zeros((n.shape[0], 3, 3))
+    cross[:, 0, 1], cross[:, 0, 2] = -z, y
+    cross[:, 1, 0], cross[:, 1, 2] = z, -x
+    cross[:, 2, 0], cross[:, 2, 1] = -y, x
+    m = t * n[:, :, np.newaxis] * n[:, np.newaxis, :] + c * np.eye(3)
+    m += s * cross
+    if single:
+        return m[0]
+    return m
+
+
 def unit_vector(v):
     """Returns the unit vector of the vector. """
     return v / norm(v)
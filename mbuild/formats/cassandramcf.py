@@ -1,5 +1,7 @@
 from __future__ import division
 
+from collections import Counter, defaultdict
+import itertools
 import warnings
 
 from math import sqrt
@@ -7,9 +9,13 @@ from math import sqrt
 import networkx as nx
 import parmed as pmd
 
+from mbuild.profiling import profiled
+from mbuild.utils.forcefields import term_parameters
+
 __all__ = ['write_mcf']
 
 
+@profiled()
 def write_mcf(structure, filename, angle_style,
                       dihedral_style, lj14=None, coul14=None):
     """Output a Cassandra molecular connectivity file (MCF).
@@ -205,25 +211,21 @@ def _id_rings_fragments(structure):
                   for i in range(bond_graph.number_of_nodes())}
     # First ID fused rings
     fused_rings = []
-    rings_to_remove = []
-    for i in range(len(all_rings)):
-        ring1 = all_rings[i]
-        for j in range(i+1, len(all_rings)):
-            ring2 = all_rings[j]
-            shared_atoms = list(set(ring1) & set(ring2))
-            if len(shared_atoms) == 2:
-                fused_rings.append(list(set(ring1+ring2)))
-                rings_to_remove.append(ring1)
-                rings_to_remove.append(ring2)
-    for ring in rings_to_remove:
-        all_rings.remove(ring)
+    fused_ring_ids = set()
+    for (i, j), n_shared in sorted(_shared_atom_counts(all_rings).items()):
+        if n_shared == 2:
+            fused_rings.append(list(set(all_rings[i]+all_rings[j])))
+            fused_ring_ids.update((i, j))
+    all_rings = [ring for i, ring in enumerate(all_rings)
+                 if i not in fused_ring_ids]
     all_rings = all_rings + fused_rings
     # ID fragments which contain a ring
     for ring in all_rings:
         adjacentatoms = []
+        ring_atoms = set(ring)
         for idx in ring:
             if len(neigh_dict[idx]) > 2:
-                adjacentatoms.append(list(set(neigh_dict[idx])-set(ring)))
+                adjacentatoms.append(list(set(neigh_dict[idx])-ring_atoms))
         tmp=filter(None, adjacentatoms)
         adjacentatoms = [x for sublist in tmp for x in sublist]
         frag_list.append(ring+adjacentatoms)
@@ -237,24 +239,46 @@ def _id_rings_fragments(structure):
             else:
                 frag_list.append([idx]+neigh_dict[idx])
     # Now find connectivity (shared bonds)
-    for i in range(len(frag_list)):
-        frag1 = frag_list[i]
-        for j in range(i+1, len(frag_list)):
-            frag2 = frag_list[j]
-            shared_atoms = list(set(frag1) & set(frag2))
-            if len(shared_atoms) == 2:
-                frag_conn.append([i, j])
-            elif len(shared_atoms) > 2:
-                warnings.warn('Fragments share more than two atoms...'
-                      'something may be going awry unless there are'
-                      'fused rings in your system. See below for details.')
-                print('Fragment 1 atoms:')
-                print(frag1)
-                print('Fragment 2 atoms:')
-                print(frag2)
+    for (i, j), n_shared in sorted(_shared_atom_counts(frag_list).items()):
+        if n_shared == 2:
+            frag_conn.append([i, j])
+        elif n_shared > 2:
+            warnings.warn('Fragments share more than two atoms...'
+                  'something may be going awry unless there are'
+                  'fused rings in your system. See below for details.')
+            print('Fragment 1 atoms:')
+            print(frag_list[i])
+            print('Fragment 2 atoms:')
+            print(frag_list[j])
 
     return in_ring, frag_list, frag_conn
 
+def _shared_atom_counts(groups):
+    """Count the atoms shared by pairs of groups of atoms
+
+    Only pairs of groups that share atoms are found, from an index of the
+    groups containing each atom, rather than by comparing all pairs.
+
+    Parameters
+    ----------
+    groups : list of list of int
+        Atom ids belonging to each group, e.g. ring or fragment
+
+    Returns
+    ---------
+    shared : collections.Counter
+        Number of shared atoms for each pair of group ids (i, j) with i < j
+
+    """
+    groups_of_atom = defaultdict(list)
+    for i, group in enumerate(groups):
+        for idx in set(group):
+            groups_of_atom[idx].append(i)
+    shared = Counter()
+    for group_ids in groups_of_atom.values():
+        shared.update(itertools.combinations(group_ids, 2))
+    return shared
+
 def _write_atom_information(mcf_file, structure, in_ring, IG_CONSTANT_KCAL):
     """Write the atoms in the system.
 
@@ -340,8 +364,8 @@ def _write_bond_information(mcf_file, structure):
 
     """
 
-    bond_parms = [ str('{:8.3f}'.format(bond.type.req))
-            for bond in structure.bonds ]
+    bond_parms = term_parameters(structure.bonds,
+            lambda bond: str('{:8.3f}'.format(bond.type.req)))
 
     mcf_file.write('\n!Bond Format\n')
     mcf_file.write('!index i j type parameters\n' +
@@ -370,13 +394,14 @@ def _write_angle_information(mcf_file, structure, angle_style,
     """
 
     if angle_style.casefold() == 'fixed':
-        angle_parms = [ str('{:8.2f}'.format(angle.type.theteq))
-                        for angle in structure.angles ]
+        angle_parms = term_parameters(structure.angles,
+                lambda angle: str('{:8.2f}'.format(angle.type.theteq)))
     elif angle_style.casefold() == 'harmonic':
         # Convert energies to units of K
-        angle_parms = [ str('{:8.1f}'.format(angle.type.k/IG_CONSTANT_KCAL)) +
-                        '  ' + str('{:8.2f}'.format(angle.type.theteq))
-                        for angle in structure.angles ]
+        angle_parms = term_parameters(structure.angles,
+                lambda angle: str('{:8.1f}'.format(
+                    angle.type.k/IG_CONSTANT_KCAL)) +
+                    '  ' + str('{:8.2f}'.format(angle.type.theteq)))
     else:
         raise ValueError("Only 'fixed' and 'harmonic' angle styles "
                          "are supported by Cassandra")
@@ -432,8 +457,7 @@ def _write_dihedral_information(mcf_file, structure, dihedral_style,
             # Two things happen here:
             #  (1) convert from RB form to Cassandra OPLS
             #  (2) convert units from kcal/mol to kJ/mol
-            dihedral_parms = []
-            for dihedral in dihedrals:
+            def _opls_parms(dihedral):
                 a0 = ( dihedral.type.c0 + dihedral.type.c1 +
                         dihedral.type.c2 + dihedral.type.c3 )
                 a1 = -dihedral.type.c1 - (3./4.)*dihedral.type.c3
@@ -442,21 +466,23 @@ def _write_dihedral_information(mcf_file, structure, dihedral_style,
                 if not dihedral.type.c4 == 0. and dihedral.type.c4 == 0.:
                     raise ValueError("Can only convert Ryckaert-Bellemans "
                                      "dihedrals to OPLS if c4==0 and c5==0")
-                dihedral_parms.append(str('{:8.3f} '.format(a0*KCAL_TO_KJ)) +
-                                      str('{:8.3f} '.format(a1*KCAL_TO_KJ)) +
-                                      str('{:8.3f} '.format(a2*KCAL_TO_KJ)) +
-                                      str('{:8.3f} '.format(a3*KCAL_TO_KJ)))
+                return (str('{:8.3f} '.format(a0*KCAL_TO_KJ)) +
+                        str('{:8.3f} '.format(a1*KCAL_TO_KJ)) +
+                        str('{:8.3f} '.format(a2*KCAL_TO_KJ)) +
+                        str('{:8.3f} '.format(a3*KCAL_TO_KJ)))
+
+            dihedral_parms = term_parameters(dihedrals, _opls_parms)
 
         elif dihedral_style.casefold() == 'charmm':
             dihedral_style = dihedral_style.upper()
             dihedrals = structure.dihedrals
             # type.per = periodicity (a1)
             # type.phase = phase offset (delta)
-            dihedral_parms = [ str('{:8.3f} '.format(
+            dihedral_parms = term_parameters(dihedrals,
+                lambda dihedral: str('{:8.3f} '.format(
                                         dihedral.type.phi_k*KCAL_TO_KJ)) +
-                               str('{:8.3f} '.format(dihedral.type.per)) +
-                               str('{:8.3f}'.format(dihedral.type.phase))
-                               for dihedral in dihedrals ]
+                                 str('{:8.3f} '.format(dihedral.type.per)) +
+                                 str('{:8.3f}'.format(dihedral.type.phase)))
 
         elif dihedral_style.casefold() == 'none':
             warnings.warn("Dihedral style 'none' selected. "
@@ -1,5 +1,6 @@
 import numpy as np
 
+from mbuild.profiling import profiled
 from mbuild.utils.io import import_
 from mbuild.utils.sorting import natural_sort
 from mbuild.utils.geometry import coord_shift
@@ -7,6 +8,7 @@ from mbuild.utils.geometry import coord_shift
 __all__ = ['write_gsd']
 
 
+@profiled()
 def write_gsd(structure, filename, ref_distance=1.0, ref_mass=1.0,
               ref_energy=1.0, rigid_bodies=None, shift_coords=True,
               write_special_pairs=True, **kwargs):
@@ -3,6 +3,7 @@ from collections import OrderedDict
 
 import mbuild as mb
 from mbuild.exceptions import MBuildError
+from mbuild.profiling import profiled
 
 
 def compound_from_json(json_file):
@@ -53,13 +54,20 @@ def compound_from_json(json_file):
             sub_cmpd = converted_dict[sub_compound['id']]
 
             label_str = sub_compound['label']
+            # Children with a lazily resolved label are added to their group
+            # by `Compound.add`.
+            lazy_group = None
+            if label_str is not None and label_str.endswith('[$]'):
+                lazy_group = label_str[:-3]
             label_list = compound.get('label_list', {})
             for key, vals in label_list.items():
                 if not parent_compound.labels.get(key, None):
+                    parent_compound._own_labels()
                     parent_compound.labels[key] = list()
-                if sub_compound['id'] in vals:
+                if sub_compound['id'] in vals and key != lazy_group:
                     parent_compound.labels[key].append(sub_cmpd)
-            parent_compound.add(sub_cmpd, label=label_str)
+            parent_compound.add(sub_cmpd, label=label_str,
+                                lazy_labels=lazy_group is not None)
 
         _add_ports(compound_dict, converted_dict)
         _add_bonds(compound_dict, parent, converted_dict)
@@ -67,6 +75,7 @@ def compound_from_json(json_file):
         return parent
 
 
+@profiled()
 def compound_to_json(cmpd, file_path, include_ports=False):
     """Convert the mb.Compound into equivelent json representation
 
@@ -92,6 +101,7 @@ def compound_to_json(cmpd, file_path, include_ports=False):
             sub_compound_dict['parent_id'] = id(parent_compound)
             sub_compound_dict['is_port'] = False
             sub_compound_dict['label'] = None
+            group_label = None
             for key, val in sub_compound.parent.labels.items():
                 if val == sub_compound:
                     sub_compound_dict['label'] = key
@@ -99,6 +109,11 @@ def compound_to_json(cmpd, file_path, include_ports=False):
                     if not cmpd_info[sub_compound.parent].get('label_list', None):
                         cmpd_info[sub_compound.parent]['label_list'] = OrderedDict()
                     cmpd_info[sub_compound.parent]['label_list'][key] = [id(x) for x in val]
+                    if group_label is None and sub_compound in val:
+                        group_label = key
+            # The label of a lazily labelled child is resolved from its group
+            if sub_compound_dict['label'] is None and group_label is not None:
+                sub_compound_dict['label'] = group_label + '[$]'
 
             if not cmpd_info[parent_compound].get('children', False):
                 cmpd_info[parent_compound]['children'] = list()
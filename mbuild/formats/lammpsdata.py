@@ -7,11 +7,14 @@ from parmed.parameters import ParameterSet
 
 from mbuild import Box
 from mbuild.utils.conversion import RB_to_OPLS
+from mbuild.utils.forcefields import term_parameters
+from mbuild.profiling import profiled
 from mbuild.utils.sorting import natural_sort
 from scipy.constants import epsilon_0
 
 __all__ = ['write_lammpsdata']
 
+@profiled()
 def write_lammpsdata(structure, filename, atom_style='full', 
                     unit_style='real',
                     detect_forcefield_style=True, nbfix_in_data_file=True,
@@ -118,6 +121,7 @@ def write_lammpsdata(structure, filename, atom_style='full',
 
     unique_types = list(set(types))
     unique_types.sort(key=natural_sort)
+    type_index = {atom_type: idx+1 for idx, atom_type in enumerate(unique_types)}
 
     charges = np.array([atom.charge for atom in structure.atoms])
 
@@ -284,7 +288,7 @@ def write_lammpsdata(structure, filename, atom_style='full',
 
         # Mass data
         masses = np.array([atom.mass for atom in structure.atoms]) / mass_conversion_factor
-        mass_dict = dict([(unique_types.index(atom_type)+1,mass) for atom_type,mass in zip(types,masses)])
+        mass_dict = dict([(type_index[atom_type],mass) for atom_type,mass in zip(types,masses)])
 
         data.write('\nMasses\n\n')
         for atom_type,mass in mass_dict.items():
@@ -294,9 +298,9 @@ def write_lammpsdata(structure, filename, atom_style='full',
             epsilons = np.array([atom.epsilon for atom in structure.atoms]) / epsilon_conversion_factor
             sigmas = np.array([atom.sigma for atom in structure.atoms]) / sigma_conversion_factor
             forcefields = [atom.type for atom in structure.atoms]
-            epsilon_dict = dict([(unique_types.index(atom_type)+1,epsilon) for atom_type,epsilon in zip(types,epsilons)])
-            sigma_dict = dict([(unique_types.index(atom_type)+1,sigma) for atom_type,sigma in zip(types,sigmas)])
-            forcefield_dict = dict([(unique_types.index(atom_type)+1,forcefield) for atom_type,forcefield in zip(types,forcefields)])
+            epsilon_dict = dict([(type_index[atom_type],epsilon) for atom_type,epsilon in zip(types,epsilons)])
+            sigma_dict = dict([(type_index[atom_type],sigma) for atom_type,sigma in zip(types,sigmas)])
+            forcefield_dict = dict([(type_index[atom_type],forcefield) for atom_type,forcefield in zip(types,forcefields)])
             
 
 
@@ -319,15 +323,15 @@ def write_lammpsdata(structure, filename, atom_style='full',
                 for combo in it.combinations_with_replacement(unique_types, 2):
                     # Attempt to find pair coeffis in nbfixes
                     if combo in params.nbfix_types:
-                        type1 = unique_types.index(combo[0])+1
-                        type2 = unique_types.index(combo[1])+1
+                        type1 = type_index[combo[0]]
+                        type2 = type_index[combo[1]]
                         rmin = params.nbfix_types[combo][0] # Angstrom OR lj units
                         epsilon = params.nbfix_types[combo][1] # kcal OR lj units
                         sigma = rmin/2**(1/6)
                         coeffs[(type1, type2)] = (round(sigma, 8), round(epsilon, 8))
                     else:
-                        type1 = unique_types.index(combo[0]) + 1
-                        type2 = unique_types.index(combo[1]) + 1
+                        type1 = type_index[combo[0]]
+                        type2 = type_index[combo[1]]
                         # Might not be necessary to be this explicit
                         if type1 == type2:
                             sigma = sigma_dict[type1]
@@ -451,7 +455,7 @@ def write_lammpsdata(structure, filename, atom_style='full',
 
         for i,coords in enumerate(xyz):
             data.write(atom_line.format(
-                index=i+1,type_index=unique_types.index(types[i])+1,
+                index=i+1,type_index=type_index[types[i]],
                 zero=structure.atoms[i].residue.idx,charge=charges[i],
                 x=coords[0],y=coords[1],z=coords[2]))
 
@@ -485,32 +489,38 @@ def write_lammpsdata(structure, filename, atom_style='full',
                         i+1,improper_types[i],improper[2],
                         improper[1],improper[0],improper[3]))
 
+def _enumerate_types(keys):
+    """Number the unique parameter keys, and return the number of each key """
+    unique_types = dict(enumerate(set(keys)))
+    unique_types = OrderedDict([(y,x+1) for x,y in unique_types.items()])
+    return [unique_types[key] for key in keys], unique_types
+
 def _get_bond_types(structure, bonds, sigma_conversion_factor, 
         epsilon_conversion_factor):
-    unique_bond_types = dict(enumerate(set([(round(bond.type.k*(
-        sigma_conversion_factor**2/epsilon_conversion_factor),3),
-                                             round(bond.type.req/sigma_conversion_factor,3),
-                                             tuple(sorted((bond.atom1.type,bond.atom2.type)))
-                                             ) for bond in structure.bonds])))
-    unique_bond_types = OrderedDict([(y,x+1) for x,y in unique_bond_types.items()])
-    bond_types = [unique_bond_types[(round(bond.type.k*
-        (sigma_conversion_factor**2/epsilon_conversion_factor),3),
-                                     round(bond.type.req/sigma_conversion_factor,3),
-                                     tuple(sorted((bond.atom1.type,bond.atom2.type)))
-                                     )] for bond in structure.bonds]
-    return bond_types, unique_bond_types
+    def bond_key(bond):
+        return (round(bond.type.k*(
+            sigma_conversion_factor**2/epsilon_conversion_factor),3),
+                round(bond.type.req/sigma_conversion_factor,3),
+                tuple(sorted((bond.atom1.type,bond.atom2.type))))
+
+    return _enumerate_types(term_parameters(structure.bonds, bond_key,
+                                            ('atom1', 'atom2')))
 
 def _get_angle_types(structure, use_urey_bradleys,
         sigma_conversion_factor, epsilon_conversion_factor):
     if use_urey_bradleys:
+        urey_bradleys = dict()
+        for ub in structure.urey_bradleys:
+            urey_bradleys[(ub.atom1, ub.atom2)] = ub
         charmm_angle_types = []
         for angle in structure.angles:
-            ub_k = 0
-            ub_req = 0
-            for ub in structure.urey_bradleys:
-                if (angle.atom1, angle.atom3) == (ub.atom1, ub.atom2):
-                    ub_k = ub.type.k
-                    ub_req = ub.type.req
+            ub = urey_bradleys.get((angle.atom1, angle.atom3))
+            if ub is None:
+                ub_k = 0
+                ub_req = 0
+            else:
+                ub_k = ub.type.k
+                ub_req = ub.type.req
             charmm_angle_types.append((round(angle.type.k*(
                 sigma_conversion_factor**2/epsilon_conversion_factor),3), 
                                        round(angle.type.theteq,3),
@@ -518,86 +528,67 @@ def _get_angle_types(structure, use_urey_bradleys,
                                        round(ub_req, 3),
                                        tuple(sorted((angle.atom1.type,angle.atom3.type)))))
 
-        unique_angle_types = dict(enumerate(set(charmm_angle_types)))
-        unique_angle_types = OrderedDict([(y,x+1) for x,y in unique_angle_types.items()])
-        angle_types = [unique_angle_types[ub_info] for ub_info in charmm_angle_types]
+        return _enumerate_types(charmm_angle_types)
 
-    else:
-        unique_angle_types = dict(enumerate(set([(round(angle.type.k*(
+    def angle_key(angle):
+        return (round(angle.type.k*(
             sigma_conversion_factor**2/epsilon_conversion_factor),3),
-                                                  round(angle.type.theteq,3),
-                                                  angle.atom2.type,
-                                                  tuple(sorted((angle.atom1.type,angle.atom3.type)))
-                                                  ) for angle in structure.angles])))
-        unique_angle_types = OrderedDict([(y,x+1) for x,y in unique_angle_types.items()])
-        angle_types = [unique_angle_types[(round(angle.type.k*(
-            sigma_conversion_factor**2/epsilon_conversion_factor),3),
-                                           round(angle.type.theteq,3),
-                                           angle.atom2.type,
-                                           tuple(sorted((angle.atom1.type,angle.atom3.type)))
-                                           )] for angle in structure.angles]
+                round(angle.type.theteq,3),
+                angle.atom2.type,
+                tuple(sorted((angle.atom1.type,angle.atom3.type))))
 
-    return angle_types, unique_angle_types
+    return _enumerate_types(term_parameters(structure.angles, angle_key,
+                                            ('atom1', 'atom2', 'atom3')))
 
 def _get_dihedral_types(structure, use_rb_torsions, use_dihedrals,
          epsilon_conversion_factor):
     lj_unit = 1 / epsilon_conversion_factor
+    dihedral_atoms = ('atom1', 'atom2', 'atom3', 'atom4')
     if use_rb_torsions:
-        unique_dihedral_types = dict(enumerate(set([(round(dihedral.type.c0*lj_unit,3),
-                                                     round(dihedral.type.c1*lj_unit,3),
-                                                     round(dihedral.type.c2*lj_unit,3),
-                                                     round(dihedral.type.c3*lj_unit,3),
-                                                     round(dihedral.type.c4*lj_unit,3),
-                                                     round(dihedral.type.c5*lj_unit,3),
-                                                     round(dihedral.type.scee,1),
-                                                     round(dihedral.type.scnb,1),
-                                                     dihedral.atom1.type, dihedral.atom2.type,
-                                                     dihedral.atom3.type, dihedral.atom4.type
-                                                     ) for dihedral in structure.rb_torsions])))
-        unique_dihedral_types = OrderedDict([(y,x+1) for x,y in unique_dihedral_types.items()])
-        dihedral_types = [unique_dihedral_types[(round(dihedral.type.c0*lj_unit,3),
-                                                 round(dihedral.type.c1*lj_unit,3),
-                                                 round(dihedral.type.c2*lj_unit,3),
-                                                 round(dihedral.type.c3*lj_unit,3),
-                                                 round(dihedral.type.c4*lj_unit,3),
-                                                 round(dihedral.type.c5*lj_unit,3),
-                                                 round(dihedral.type.scee,1),
-                                                 round(dihedral.type.scnb,1),
-                                                 dihedral.atom1.type, dihedral.atom2.type,
-                                                 dihedral.atom3.type, dihedral.atom4.type
-                                                 )] for dihedral in structure.rb_torsions]
+        def dihedral_key(dihedral):
+            return (round(dihedral.type.c0*lj_unit,3),
+                    round(dihedral.type.c1*lj_unit,3),
+                    round(dihedral.type.c2*lj_unit,3),
+                    round(dihedral.type.c3*lj_unit,3),
+                    round(dihedral.type.c4*lj_unit,3),
+                    round(dihedral.type.c5*lj_unit,3),
+                    round(dihedral.type.scee,1),
+                    round(dihedral.type.scnb,1),
+                    dihedral.atom1.type, dihedral.atom2.type,
+                    dihedral.atom3.type, dihedral.atom4.type)
+
+        return _enumerate_types(term_parameters(
+            structure.rb_torsions, dihedral_key, dihedral_atoms))
     elif use_dihedrals:
-        charmm_dihedrals = []
+        def dihedral_keys(dihedral):
+            weight = 1 / len(dihedral.type)
+            return [(round(dih_type.phi_k*lj_unit,3),
+                     int(round(dih_type.per,0)),
+                     int(round(dih_type.phase,0)),
+                     round(weight, 4),
+                     round(dih_type.scee,1),
+                     round(dih_type.scnb,1),
+                     dihedral.atom1.type, dihedral.atom2.type,
+                     dihedral.atom3.type, dihedral.atom4.type)
+                    for dih_type in dihedral.type]
+
         structure.join_dihedrals()
-        for dihedral in structure.dihedrals:
-            if not dihedral.improper:
-                weight = 1 / len(dihedral.type)
-                for dih_type in dihedral.type:
-                    charmm_dihedrals.append((round(dih_type.phi_k*lj_unit,3),
-                                             int(round(dih_type.per,0)),
-                                             int(round(dih_type.phase,0)),
-                                             round(weight, 4),
-                                             round(dih_type.scee,1),
-                                             round(dih_type.scnb,1),
-                                             dihedral.atom1.type, dihedral.atom2.type,
-                                             dihedral.atom3.type, dihedral.atom4.type))
-
-        unique_dihedral_types = dict(enumerate(set(charmm_dihedrals)))
-        unique_dihedral_types = OrderedDict([(y,x+1) for x,y in unique_dihedral_types.items()])
-        dihedral_types = [unique_dihedral_types[dihedral_info] for dihedral_info in charmm_dihedrals]
-
-    return dihedral_types, unique_dihedral_types
+        proper_dihedrals = [dihedral for dihedral in structure.dihedrals
+                            if not dihedral.improper]
+        charmm_dihedrals = [key for keys in term_parameters(
+                                proper_dihedrals, dihedral_keys, dihedral_atoms)
+                            for key in keys]
+        return _enumerate_types(charmm_dihedrals)
 
 def _get_impropers(structure, epsilon_conversion_factor):
     lj_unit = 1 / epsilon_conversion_factor
-    unique_improper_types = dict(enumerate(set([(round(improper.type.psi_k*lj_unit,3),
-                                                 round(improper.type.psi_eq,3),
-                                                 improper.atom1.type, improper.atom2.type,
-                                                 improper.atom3.type, improper.atom4.type) for improper in structure.impropers])))
-    unique_improper_types = OrderedDict([(y,x+1) for x,y in unique_improper_types.items()])
-    improper_types = [unique_improper_types[(round(improper.type.psi_k*lj_unit,3),
-                                             round(improper.type.psi_eq,3),
-                                             improper.atom1.type, improper.atom2.type,
-                                             improper.atom3.type, improper.atom4.type)] for improper in structure.impropers]
-
-    return improper_types, unique_improper_types
+
+    def improper_key(improper):
+        return (round(improper.type.psi_k*lj_unit,3),
+                round(improper.type.psi_eq,3),
+                improper.atom1.type, improper.atom2.type,
+                improper.atom3.type, improper.atom4.type)
+
+    return _enumerate_types(term_parameters(
+        structure.impropers, improper_key,
+        ('atom1', 'atom2', 'atom3', 'atom4')))
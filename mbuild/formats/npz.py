@@ -0,0 +1,267 @@
+from collections import OrderedDict
+
+import numpy as np
+
+import mbuild as mb
+from mbuild.bond_graph import BondGraph
+from mbuild.exceptions import MBuildError
+from mbuild.profiling import profiled
+
+__all__ = ['compound_to_npz', 'compound_from_npz']
+
+
+@profiled()
+def compound_to_npz(cmpd, file_path, include_ports=False, compressed=False):
+    """Save an mb.Compound hierarchy to a NumPy ``.npz`` checkpoint
+
+    The hierarchy is flattened into columnar arrays so that large
+    intermediate builds can be written and restored without the per-node
+    overhead of the JSON or protobuf formats.  Every Compound in the
+    hierarchy (the root first, followed by its successors in depth-first
+    order) is a row in the node arrays, and parent/child relationships,
+    bonds and labels are stored as integer indices into these rows.
+
+    Parameters
+    ----------
+    cmpd : mb.Compound
+        The Compound to save
+    file_path : str
+        Path of the ``.npz`` file
+    include_ports : bool, optional, default=False
+        Store the Ports of the hierarchy, including their orientation
+    compressed : bool, optional, default=False
+        Write the archive with ``np.savez_compressed``. This produces smaller
+        files at the cost of speed.
+
+    Notes
+    -----
+    The following arrays are written to the archive:
+
+    parent : (n_nodes,) int, index of the parent node (-1 for the root)
+    name : (n_nodes,) int, index into the `strings` table
+    label : (n_nodes,) int, index into `strings` of the label under which
+        the node is stored in its parent (-1 for the root)
+    group : (n_nodes,) int, index into `strings` of the list label (e.g.
+        'CH2' for 'CH2[3]') the node belongs to in its parent, or -1
+    pos, periodicity : (n_nodes, 3) float64
+    charge : (n_nodes,) float64
+    rigid_id : (n_nodes,) int, -1 where the rigid_id is None
+    port : (n_nodes,) bool, whether the node is a Port
+    port_anchor : (n_ports,) int, node index of each Port's anchor or -1
+    port_xyz : (n_ports, 8, 3) float64, ghost particle coordinates
+    bonds : (n_bonds, 2) int, node indices of the bonded particles
+    refs : (n_refs, 3) int, labels that point to a node that is not a
+        child of the labelled node, stored as (holder, target, label)
+    strings : (n_strings,) str, table of all names and labels
+
+    """
+    from mbuild.port import Port
+
+    strings = OrderedDict()
+
+    def _string_index(string):
+        try:
+            return strings[string]
+        except KeyError:
+            strings[string] = len(strings)
+            return strings[string]
+
+    nodes = [cmpd]
+    index = {id(cmpd): 0}
+    parent_idx = [-1]
+    port_nodes = []
+
+    def _visit(compound):
+        for child in compound.children:
+            is_port = isinstance(child, Port)
+            if is_port:
+                if not include_ports:
+                    continue
+                port_nodes.append(child)
+            elif child.port_particle:
+                continue
+            index[id(child)] = len(nodes)
+            nodes.append(child)
+            parent_idx.append(index[id(compound)])
+            if not is_port:
+                _visit(child)
+
+    if cmpd.children:
+        _visit(cmpd)
+
+    n_nodes = len(nodes)
+    name = np.empty(n_nodes, dtype=np.int64)
+    label = np.full(n_nodes, -1, dtype=np.int64)
+    group = np.full(n_nodes, -1, dtype=np.int64)
+    pos = np.empty((n_nodes, 3), dtype=np.float64)
+    periodicity = np.empty((n_nodes, 3), dtype=np.float64)
+    charge = np.empty(n_nodes, dtype=np.float64)
+    rigid_id = np.full(n_nodes, -1, dtype=np.int64)
+    port = np.zeros(n_nodes, dtype=bool)
+    refs = []
+
+    for i, node in enumerate(nodes):
+        name[i] = _string_index(node.name)
+        pos[i] = node._pos
+        periodicity[i] = node.periodicity
+        charge[i] = node._charge
+        if node.rigid_id is not None:
+            rigid_id[i] = node.rigid_id
+        if isinstance(node, Port):
+            port[i] = True
+            continue
+        # A single pass over the labels of each node resolves the labels of
+        # all of its children, as well as references to other nodes.
+        for key, val in node.labels.items():
+            if isinstance(val, list):
+                for part in val:
+                    child_idx = index.get(id(part))
+                    if child_idx is not None and group[child_idx] == -1 \
+                            and parent_idx[child_idx] == i:
+                        group[child_idx] = _string_index(key)
+                continue
+            target_idx = index.get(id(val))
+            if target_idx is None:
+                continue
+            if parent_idx[target_idx] == i and label[target_idx] == -1:
+                label[target_idx] = _string_index(key)
+            else:
+                refs.append((i, target_idx, _string_index(key)))
+
+    port_anchor = np.full(len(port_nodes), -1, dtype=np.int64)
+    port_xyz = np.empty((len(port_nodes), 8, 3), dtype=np.float64)
+    for i, port_node in enumerate(port_nodes):
+        if port_node.anchor is not None:
+            port_anchor[i] = index.get(id(port_node.anchor), -1)
+        port_xyz[i] = port_node.xyz_with_ports
+
+    bonds = np.array([(index[id(p1)], index[id(p2)])
+                      for p1, p2 in cmpd.bonds()], dtype=np.int64)
+
+    savez = np.savez_compressed if compressed else np.savez
+    savez(file_path,
+          mbuild_version=np.array(mb.version),
+          parent=np.asarray(parent_idx, dtype=np.int64),
+          name=name,
+          label=label,
+          group=group,
+          pos=pos,
+          periodicity=periodicity,
+          charge=charge,
+          rigid_id=rigid_id,
+          port=port,
+          port_anchor=port_anchor,
+          port_xyz=port_xyz,
+          bonds=bonds.reshape(-1, 2),
+          refs=np.array(refs, dtype=np.int64).reshape(-1, 3),
+          strings=np.array(list(strings), dtype=str))
+
+
+def compound_from_npz(file_path, compound=None):
+    """Load an mb.Compound hierarchy from a NumPy ``.npz`` checkpoint
+
+    Parameters
+    ----------
+    file_path : str
+        Path of a ``.npz`` file written by `compound_to_npz`
+    compound : mb.Compound, optional, default=None
+        Existing, empty Compound to use as the root of the hierarchy
+
+    Returns
+    -------
+    root : mb.Compound
+        The root of the restored hierarchy
+
+    Raises
+    ------
+    MBuildError
+        If the file is missing arrays required to restore a Compound.
+
+    """
+    from mbuild.port import Port
+
+    with np.load(file_path, allow_pickle=False) as data:
+        try:
+            arrays = {key: data[key] for key in _NPZ_KEYS}
+        except KeyError as e:
+            raise MBuildError('{} is not a valid mBuild checkpoint: missing '
+                              'array {}.'.format(file_path, e))
+
+    strings = arrays['strings'].tolist()
+    parent_idx = arrays['parent'].tolist()
+    name = arrays['name'].tolist()
+    label = arrays['label'].tolist()
+    group = arrays['group'].tolist()
+    charge = arrays['charge'].tolist()
+    rigid_id = arrays['rigid_id'].tolist()
+    is_port = arrays['port'].tolist()
+    pos = arrays['pos']
+    periodicity = arrays['periodicity']
+
+    nodes = []
+    for i in range(len(parent_idx)):
+        if i == 0 and compound is not None:
+            node = compound
+            node.name = strings[name[i]]
+            node._pos = np.array(pos[i])
+            node.periodicity = periodicity[i]
+            node._charge = charge[i]
+        elif is_port[i]:
+            node = Port()
+        else:
+            node = mb.Compound(name=strings[name[i]], pos=pos[i],
+                               charge=charge[i], periodicity=periodicity[i])
+        if rigid_id[i] >= 0:
+            node._rigid_id = rigid_id[i]
+        nodes.append(node)
+
+    # Children are attached directly rather than through `Compound.add`,
+    # similar to `Compound._clone`, as the hierarchy is already known to be
+    # consistent.
+    for i, parent in enumerate(parent_idx):
+        if parent < 0:
+            continue
+        node = nodes[i]
+        parent_cmpd = nodes[parent]
+        parent_cmpd._own_children()
+        parent_cmpd._own_labels()
+        parent_cmpd.children.add(node)
+        node.parent = parent_cmpd
+        node._own_referrers()
+        node.referrers.add(parent_cmpd)
+        if group[i] >= 0:
+            parent_cmpd.labels.setdefault(strings[group[i]], []).append(node)
+        if label[i] >= 0:
+            parent_cmpd.labels[strings[label[i]]] = node
+
+    port_nodes = [node for node, port in zip(nodes, is_port) if port]
+    for port, anchor_idx, xyz in zip(port_nodes,
+                                     arrays['port_anchor'].tolist(),
+                                     arrays['port_xyz']):
+        if anchor_idx >= 0:
+            port.anchor = nodes[anchor_idx]
+        port.xyz_with_ports = xyz
+
+    for holder, target, key in arrays['refs'].tolist():
+        nodes[holder]._own_labels()
+        nodes[holder].labels[strings[key]] = nodes[target]
+        nodes[target]._own_referrers()
+        nodes[target].referrers.add(nodes[holder])
+
+    root = nodes[0]
+    if any(rid >= 0 for rid in rigid_id):
+        for node in nodes:
+            if node.children:
+                node._check_if_contains_rigid_bodies = True
+
+    if len(arrays['bonds']):
+        root.bond_graph = BondGraph()
+        for atom1, atom2 in arrays['bonds'].tolist():
+            root.bond_graph.add_edge(nodes[atom1], nodes[atom2])
+
+    return root
+
+
+_NPZ_KEYS = ('parent', 'name', 'label', 'group', 'pos', 'periodicity',
+             'charge', 'rigid_id', 'port', 'port_anchor', 'port_xyz', 'bonds',
+             'refs', 'strings')
@@ -1,8 +1,10 @@
 import warnings
 
+from mbuild.profiling import profiled
 __all__ = ['write_par']
 
 
+@profiled()
 def write_par(structure, filename):
     """ Write CHARMM Par file given a parametrized structure 
         
@@ -1,9 +1,11 @@
 import mbuild as mb
 from mbuild.formats import compound_pb2
+from mbuild.profiling import profiled
 from google.protobuf.text_format import PrintMessage, Merge
 
 __all__ = ['write_pb2', 'read_pb2']
 
+@profiled()
 def write_pb2(cmpd, filename, binary=True):
     """ Convert mb.Compound to Protobuf Message file
 
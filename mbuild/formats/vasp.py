@@ -1,8 +1,10 @@
 import numpy as np
 
+from mbuild.profiling import profiled
 
 __all__ = ['write_poscar']
 
+@profiled()
 def write_poscar(compound, filename, lattice_constant, bravais=[[1,0,0],
     [0,1,0],[0,0,1]], sel_dev=False,coord='cartesian'):
     """
@@ -1,12 +1,16 @@
+import itertools
+
 import numpy as np
 
 import mbuild as mb
 from mbuild.exceptions import MBuildError
+from mbuild.profiling import profiled
 
-__all__ = ['read_xyz', 'write_xyz']
+__all__ = ['read_xyz', 'read_xyz_coordinates', 'read_xyz_frames',
+           'write_xyz']
 
 
-def read_xyz(filename, compound=None):
+def read_xyz(filename, compound=None, lazy_labels=False):
     """Read an XYZ file. The expected format is as follows:
     The first line contains the number of atoms in the file The second line
     contains a comment, which is not read.  Remaining lines, one for each
@@ -18,6 +22,11 @@ def read_xyz(filename, compound=None):
     ----------
     filename : str
         Path of the input file
+    compound : mb.Compound, optional, default=None
+        Existing compound to add the particles to
+    lazy_labels : bool, optional, default=False
+        Resolve the enumerated labels of the particles, e.g. 'C[17]', on
+        lookup rather than storing them, see `mb.Compound.add`.
 
     Returns
     -------
@@ -36,21 +45,39 @@ def read_xyz(filename, compound=None):
     if compound is None:
         compound = mb.Compound()
 
+    names, coords = read_xyz_coordinates(filename, return_names=True)
+    compound._bulk_add((mb.Compound(pos=pos, name=name)
+                        for name, pos in zip(names, coords)),
+                       lazy_labels=lazy_labels)
+
+    return compound
+
+
+def read_xyz_coordinates(filename, return_names=False):
+    """Read the coordinates of a single-frame XYZ file.
+
+    Unlike `read_xyz`, no Compound is created, which makes this function
+    suitable for updating the coordinates of an existing Compound.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the input file
+    return_names : bool, optional, default=False
+        Also return the name in the first column of each row
+
+    Returns
+    -------
+    names : list of str
+        Only returned if `return_names` is True
+    coords : np.ndarray, shape=(n, 3), dtype=float
+        The coordinates in nm
+
+    """
     with open(filename, 'r') as xyz_file:
         n_atoms = int(xyz_file.readline())
         xyz_file.readline()
-        coords = np.zeros(shape=(n_atoms, 3), dtype=np.float64)
-        for row, _ in enumerate(coords):
-            line = xyz_file.readline().split()
-            if not line:
-                msg = ('Incorrect number of lines in input file. Based on the '
-                       'number in the first line of the file, {} rows of atoms '
-                       'were expected, but at least one fewer was found.')
-                raise MBuildError(msg.format(n_atoms))
-            coords[row] = line[1:4]
-            coords[row] *= 0.1
-            particle = mb.Compound(pos=coords[row], name=line[0])
-            compound.add(particle)
+        names, coords = _read_frame(xyz_file, n_atoms)
 
         # Verify we have read the last line by ensuring the next line in blank
         line = xyz_file.readline().split()
@@ -60,9 +87,72 @@ def read_xyz(filename, compound=None):
                    'were expected, but at least one more was found.')
             raise MBuildError(msg.format(n_atoms))
 
-    return compound
+    coords *= 0.1
+    if return_names:
+        return names, coords
+    return coords
+
+
+def read_xyz_frames(filename):
+    """Iterate over the frames of a (multi-frame) XYZ file.
+
+    Each frame is expected to follow the format described in `read_xyz`, and
+    frames directly follow each other.
+
+    Parameters
+    ----------
+    filename : str
+        Path of the input file
+
+    Yields
+    ------
+    coords : np.ndarray, shape=(n, 3), dtype=float
+        The coordinates of the next frame in nm
+
+    """
+    with open(filename, 'r') as xyz_file:
+        for line in xyz_file:
+            if not line.strip():
+                continue
+            n_atoms = int(line)
+            xyz_file.readline()
+            _, coords = _read_frame(xyz_file, n_atoms)
+            coords *= 0.1
+            yield coords
+
+
+def _read_frame(xyz_file, n_atoms):
+    """Read the atom block of a single frame of an XYZ file
+
+    Returns
+    -------
+    names : list of str
+    coords : np.ndarray, shape=(n_atoms, 3), dtype=float
+        Coordinates as written in the file (Angstroms)
+    """
+    msg = ('Incorrect number of lines in input file. Based on the '
+           'number in the first line of the file, {} rows of atoms '
+           'were expected, but at least one fewer was found.')
+    block = list(itertools.islice(xyz_file, n_atoms))
+    if len(block) != n_atoms:
+        raise MBuildError(msg.format(n_atoms))
+
+    tokens = ''.join(block).split()
+    if len(tokens) != 4 * n_atoms:
+        # Some rows are blank or carry additional columns.
+        rows = [line.split() for line in block]
+        if any(len(row) < 4 for row in rows):
+            raise MBuildError(msg.format(n_atoms))
+        tokens = [field for row in rows for field in row[:4]]
+
+    names = tokens[0::4]
+    coords = np.empty(shape=(n_atoms, 3), dtype=np.float64)
+    for dim in range(3):
+        coords[:, dim] = tokens[dim + 1::4]
+    return names, coords
 
 
+@profiled()
 def write_xyz(structure, filename):
     """Output an XYZ file.
 
@@ -88,11 +178,14 @@ def write_xyz(structure, filename):
             'Expected a ParmEd structure, got an mbuild.Compound'
         )
 
-    xyz = np.array([[atom.xx, atom.xy, atom.xz] for atom in structure.atoms])
-    types = [atom.name for atom in structure.atoms]
+    n_atoms = len(structure.atoms)
+    rows = np.empty(shape=(n_atoms, 4), dtype=object)
+    rows[:, 0] = [atom.name for atom in structure.atoms]
+    if n_atoms:
+        rows[:, 1:] = structure.coordinates
 
     with open(filename, 'w') as xyz_file:
-        xyz_file.write(str(len(structure.atoms)))
+        xyz_file.write(str(n_atoms))
         xyz_file.write('\n' + filename+' - created by mBuild\n')
-        for typ, coords in zip(types, xyz):
-            xyz_file.write('{:s} {:11.6f} {:11.6f} {:11.6f}\n'.format(typ, *coords))
+        xyz_file.write(('%s %11.6f %11.6f %11.6f\n' * n_atoms)
+                       % tuple(rows.ravel().tolist()))
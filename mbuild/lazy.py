@@ -0,0 +1,276 @@
+__all__ = ['LazyCompound', 'load_lazy']
+
+import os
+import struct
+import zipfile
+
+import numpy as np
+
+from mbuild.compound import Compound
+
+
+class LazyCompound(Compound):
+    """A Compound whose hierarchy is only built when it is needed.
+
+    A LazyCompound is created from a coordinate block, typically memory-mapped
+    from a file, and a loader that builds the full containment hierarchy. The
+    properties `xyz`, `n_particles`, `center` and `boundingbox` are answered
+    directly from the coordinate block. Any operation requiring the
+    hierarchy, e.g. accessing `children`, `particles()` or `bonds()`, builds
+    the hierarchy first; from then on the LazyCompound behaves exactly like a
+    Compound.
+
+    Parameters
+    ----------
+    xyz : np.ndarray, shape=(n, 3), dtype=float
+        The coordinates of the particles of the Compound. Can be a
+        `np.memmap`, in which case only the pages that are accessed are read.
+    loader : callable
+        Function called with the LazyCompound as its only argument that
+        adds all children, labels and bonds to it.
+    name : str, optional, default=self.__class__.__name__
+        The type of Compound.
+    periodicity : np.ndarray, shape=(3,), dtype=float, optional
+        The periodic lengths of the Compound in the x, y and z directions.
+
+    See Also
+    --------
+    load_lazy : Create a LazyCompound from a file
+
+    """
+    _loader = None
+    _xyz_block = None
+
+    def __init__(self, xyz, loader, name=None, periodicity=None):
+        self._xyz_block = xyz
+        self._loader = loader
+        super(LazyCompound, self).__init__(name=name, periodicity=periodicity)
+
+    @property
+    def materialized(self):
+        """Whether the hierarchy of the Compound has been built """
+        return self._loader is None
+
+    def materialize(self):
+        """Build the full hierarchy of the Compound, if not already done """
+        if self._loader is None:
+            return
+        loader = self._loader
+        self._loader = None
+        self._xyz_block = None
+        loader(self)
+
+    @property
+    def children(self):
+        if self._loader is not None:
+            self.materialize()
+        return self._children
+
+    @children.setter
+    def children(self, value):
+        self._children = value
+
+    @property
+    def labels(self):
+        if self._loader is not None:
+            self.materialize()
+        return self._labels
+
+    @labels.setter
+    def labels(self, value):
+        self._labels = value
+
+    @property
+    def bond_graph(self):
+        if self._loader is not None:
+            self.materialize()
+        return self._bond_graph
+
+    @bond_graph.setter
+    def bond_graph(self, value):
+        self._bond_graph = value
+
+    def _update_root(self):
+        if self._loader is None:
+            super(LazyCompound, self)._update_root()
+        else:
+            # Children added by the loader take the root of their parent.
+            self._set_root()
+
+    @property
+    def contains_rigid(self):
+        self.materialize()
+        return Compound.contains_rigid.fget(self)
+
+    @property
+    def n_particles(self):
+        if self._loader is not None:
+            return self._xyz_block.shape[0]
+        return super(LazyCompound, self).n_particles
+
+    @property
+    def pos(self):
+        if self._loader is not None:
+            return self.center
+        return Compound.pos.fget(self)
+
+    @pos.setter
+    def pos(self, value):
+        self.materialize()
+        Compound.pos.fset(self, value)
+
+    @property
+    def xyz(self):
+        if self._loader is not None:
+            return np.array(self._xyz_block, dtype=float)
+        return Compound.xyz.fget(self)
+
+    @xyz.setter
+    def xyz(self, arrnx3):
+        self.materialize()
+        Compound.xyz.fset(self, arrnx3)
+
+    def __repr__(self):
+        if self._loader is not None:
+            return '<{} {:d} particles (not materialized), id: {}>'.format(
+                self.name, self.n_particles, id(self))
+        return super(LazyCompound, self).__repr__()
+
+
+def load_lazy(filename, rigid=False, infer_hierarchy=True, lazy_labels=False,
+              **kwargs):
+    """Load a file into a LazyCompound.
+
+    Only the coordinates are read when this function is called. For `.npz`
+    checkpoints written without compression, the coordinate block is
+    memory-mapped. The hierarchy is built the first time it is needed.
+
+    Parameters
+    ----------
+    filename : str
+        Name of the file to load. Supported formats are `.npz` checkpoints,
+        `.xyz` files and all formats supported by MDTraj.
+    rigid : bool, optional, default=False
+        Treat the compound as a rigid body
+    infer_hierarchy : bool, optional, default=True
+        If True, infer hierarchy from chains and residues
+    lazy_labels : bool, optional, default=False
+        Resolve the enumerated labels of the particles on lookup rather than
+        storing them once the hierarchy is built, see `mb.Compound.add`.
+    **kwargs : keyword arguments
+        Key word arguments passed to mdTraj for loading.
+
+    Returns
+    -------
+    compound : mb.lazy.LazyCompound
+
+    """
+    extension = os.path.splitext(filename)[-1]
+
+    if extension == '.npz':
+        from mbuild.formats.npz import compound_from_npz
+
+        xyz, name, periodicity = _npz_particle_coordinates(filename)
+
+        def loader(compound):
+            compound_from_npz(filename, compound=compound)
+
+    elif extension == '.xyz' and 'top' not in kwargs:
+        from mbuild.formats.xyz import read_xyz, read_xyz_coordinates
+
+        xyz = read_xyz_coordinates(filename)
+        name = None
+        periodicity = None
+
+        def loader(compound):
+            read_xyz(filename, compound=compound, lazy_labels=lazy_labels)
+
+    else:
+        import mdtraj as md
+
+        traj = md.load(filename, **kwargs)
+        xyz = traj.xyz[-1]
+        name = None
+        if np.any(traj.unitcell_lengths) and np.any(traj.unitcell_lengths[0]):
+            periodicity = traj.unitcell_lengths[0]
+        else:
+            periodicity = None
+
+        def loader(compound):
+            compound.from_trajectory(traj, frame=-1,
+                                     infer_hierarchy=infer_hierarchy,
+                                     lazy_labels=lazy_labels)
+
+    if rigid:
+        def rigid_loader(compound, loader=loader):
+            loader(compound)
+            compound.label_rigid_bodies()
+        return LazyCompound(xyz, rigid_loader, name=name or 'Compound',
+                            periodicity=periodicity)
+    return LazyCompound(xyz, loader, name=name or 'Compound',
+                        periodicity=periodicity)
+
+
+def _npz_particle_coordinates(filename):
+    """Return the coordinates of the particles in an npz checkpoint
+
+    Returns
+    -------
+    xyz : np.ndarray, shape=(n, 3), dtype=float
+        The particle coordinates. A lazily indexed view of a memory-mapped
+        array when the archive is not compressed.
+    name : str
+        The name of the root Compound
+    periodicity : np.ndarray, shape=(3,), dtype=float
+        The periodicity of the root Compound
+    """
+    with np.load(filename, allow_pickle=False) as data:
+        parent = data['parent']
+        is_port = data['port']
+        name = str(data['strings'][data['name'][0]])
+        periodicity = data['periodicity'][0]
+        pos = _memmap_npz_member(filename, 'pos')
+        if pos is None:
+            pos = data['pos']
+
+    n_children = np.bincount(parent[1:], minlength=parent.shape[0])
+    leaves = np.flatnonzero((n_children == 0) & ~is_port)
+    return _ParticleCoordinates(pos, leaves), name, periodicity
+
+
+def _memmap_npz_member(filename, key):
+    """Memory-map an uncompressed array stored in an npz archive
+
+    Returns None if the array is compressed and therefore cannot be mapped.
+    """
+    with zipfile.ZipFile(filename) as archive:
+        info = archive.getinfo(key + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        return None
+    with open(filename, 'rb') as npz_file:
+        # The data of a zip member follows its local file header, which is
+        # 30 bytes plus a variable length file name and extra field.
+        npz_file.seek(info.header_offset)
+        local_header = npz_file.read(30)
+        name_length, extra_length = struct.unpack('<HH', local_header[26:30])
+        npz_file.seek(info.header_offset + 30 + name_length + extra_length)
+        version = np.lib.format.read_magic(npz_file)
+        if version == (1, 0):
+            header = np.lib.format.read_array_header_1_0(npz_file)
+        else:
+            header = np.lib.format.read_array_header_2_0(npz_file)
+        shape, fortran_order, dtype = header
+        offset = npz_file.tell()
+    return np.memmap(filename, dtype=dtype, mode='r', shape=shape,
+                     offset=offset, order='F' if fortran_order else 'C')
+
+
+class _ParticleCoordinates(object):
+    """Rows of a coordinate array, resolved only when they are read """
+    def __init__(self, pos, rows):
+        self._pos = pos
+        self._rows = rows
+        self.shape = (rows.shape[0], 3)
+
+    def __array__(self, dtype=None):
+        return np.asarray(self._pos[self._rows], dtype=dtype)
@@ -0,0 +1,25 @@
+import importlib
+import sys
+
+# The libraries are imported when first accessed as attributes, e.g.
+# `mb.lib.recipes`, rather than by `import mbuild`.
+_libraries = ('atoms', 'bulk_materials', 'moieties', 'molecules', 'recipes',
+              'surfaces')
+
+
+def __getattr__(name):
+    if name not in _libraries:
+        raise AttributeError(
+            "module 'mbuild.lib' has no attribute '{}'".format(name))
+    return importlib.import_module('mbuild.lib.' + name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_libraries))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so the libraries are
+    # imported eagerly on older versions.
+    for _name in _libraries:
+        importlib.import_module('mbuild.lib.' + _name)
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from warnings import warn
 
 import numpy as np
@@ -54,28 +53,30 @@ class Monolayer(mb.Compound):
 
             n_chains = len(pattern.points)
 
+            # Partition the binding sites between the chain types with a
+            # single random permutation of the pattern.
+            order = np.random.permutation(n_chains)
+            start = 0
+
             # Attach chains of each type to binding sites based on
             # respective fractions.
             for chain, fraction in zip(chains[:-1], fractions[:-1]):
 
                 # Create sub-pattern for this chain type
-                subpattern = deepcopy(pattern)
                 n_points = int(round(fraction * n_chains))
                 warn("\n Adding {} of chain {}".format(n_points, chain))
-                pick = np.random.choice(subpattern.points.shape[0], n_points,
-                                        replace=False)
-                points = subpattern.points[pick]
-                subpattern.points = points
-
-                # Remove now-occupied points from overall pattern
-                pattern.points = np.array([point for point in pattern.points.tolist()
-                                           if point not in subpattern.points.tolist()])
+                pick = order[start:start + n_points]
+                start += n_points
+                subpattern = mb.Pattern(points=pattern.points[pick])
 
                 # Attach chains to the surface
                 attached_chains, _ = subpattern.apply_to_compound(
                     guest=chain, host=self['tiled_surface'], backfill=None, **kwargs)
                 self.add(attached_chains)
 
+            # The remaining points are used for the final chain type.
+            pattern = mb.Pattern(points=pattern.points[np.sort(order[start:])])
+
         else:
             warn("\n No fractions provided. Assuming a single chain type.")
 
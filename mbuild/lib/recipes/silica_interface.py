@@ -1,8 +1,13 @@
+import bisect
 import math
 import random
+from warnings import warn
 
 import mbuild as mb
 import numpy as np
+from scipy.spatial import cKDTree
+
+from mbuild.utils.geometry import wrap_periodic
 
 
 class SilicaInterface(mb.Compound):
@@ -73,10 +78,9 @@ class SilicaInterface(mb.Compound):
     def _strip_stray_atoms(self):
         """Remove stray atoms and surface pieces. """
         components = self.bond_graph.connected_components()
-        major_component = max(components, key=len)
-        for atom in list(self.particles()):
-            if atom not in major_component:
-                self.remove(atom)
+        major_component = set(max(components, key=len))
+        self.remove([atom for atom in self.particles()
+                     if atom not in major_component])
 
     def _bridge_dangling_Os(self, oh_density, thickness):
         """Form Si-O-Si bridges to yield desired density of reactive surface sites.
@@ -98,56 +102,104 @@ class SilicaInterface(mb.Compound):
                        len(self.bond_graph.neighbors(atom)) == 1]
 
         n_bridges = int((len(dangling_Os) - target) / 2)
-
-        for _ in range(n_bridges):
-            bridged = False
-            while not bridged:
-                O1 = random.choice(dangling_Os)
-                Si1 = self.bond_graph.neighbors(O1)[0]
-                for O2 in dangling_Os:
-                    if O2 == O1:
-                        continue
-                    Si2 = self.bond_graph.neighbors(O2)[0]
-                    if Si1 == Si2:
-                        continue
-                    if any(neigh in self.bond_graph.neighbors(Si2)
-                           for neigh in self.bond_graph.neighbors(Si1)):
-                        continue
-                    r = self.min_periodic_distance(Si1.pos, Si2.pos)
-                    if r < 0.45:
-                        bridged = True
-                        self.add_bond((O1, Si2))
-                        dangling_Os.remove(O1)
-                        dangling_Os.remove(O2)
-                        self.remove(O2)
-                        break
+        if n_bridges <= 0:
+            return
+
+        # Candidate bridges are pairs of dangling O's whose Si's are
+        # within 0.45 nm, found with a single periodic neighbor search.
+        Sis = [self.bond_graph.neighbors(O)[0] for O in dangling_Os]
+        Si_xyz = np.array([Si.pos for Si in Sis])
+        tree = cKDTree(wrap_periodic(Si_xyz, self.periodicity),
+                       boxsize=self.periodicity)
+        pairs = tree.query_pairs(0.45, output_type='ndarray')
+        r = self.min_periodic_distance(Si_xyz[pairs[:, 0]],
+                                       Si_xyz[pairs[:, 1]])
+        partners = [[] for _ in dangling_Os]
+        for i, j in pairs[r < 0.45].tolist():
+            if Sis[i] is not Sis[j]:
+                partners[i].append(j)
+                partners[j].append(i)
+        for candidates in partners:
+            candidates.sort()
+
+        # The remaining dangling O's, in their original order, such that
+        # the O's are drawn in the same sequence as when searching all
+        # dangling O's for a partner of each drawn O.
+        remaining = list(range(len(dangling_Os)))
+        bridged = [False] * len(dangling_Os)
+        # Bridges are only ever added, so O's that found no partner once
+        # will not find one later on either.
+        n_unpaired = 0
+        unpaired = [False] * len(dangling_Os)
+
+        bridged_Os = []
+        while (len(bridged_Os) < n_bridges and
+               n_unpaired < len(remaining)):
+            idx1 = random.choice(remaining)
+            if unpaired[idx1]:
+                continue
+            Si1_neighbors = set(self.bond_graph.neighbors(Sis[idx1]))
+            for idx2 in partners[idx1]:
+                if bridged[idx2]:
+                    continue
+                if Si1_neighbors.isdisjoint(
+                        self.bond_graph.neighbors(Sis[idx2])):
+                    break
+            else:
+                unpaired[idx1] = True
+                n_unpaired += 1
+                continue
+            self.add_bond((dangling_Os[idx1], Sis[idx2]))
+            bridged_Os.append(dangling_Os[idx2])
+            for idx in (idx1, idx2):
+                bridged[idx] = True
+                del remaining[bisect.bisect_left(remaining, idx)]
+
+        if len(bridged_Os) < n_bridges:
+            warn('Only {} of {} Si-O-Si bridges could be formed.'.format(
+                len(bridged_Os), n_bridges))
+        self.remove(bridged_Os)
 
     def _identify_surface_sites(self, thickness):
         """Label surface sites and add ports above them. """
+        from mbuild.coordinate_transform import _rotation_matrices
+
+        surface_Os = []
         for atom in self.particles():
             if len(self.bond_graph.neighbors(atom)) == 1:
                 if atom.name == 'O' and atom.pos[2] > thickness:
                     atom.name = 'O_surface'
-                    port = mb.Port(anchor=atom)
-                    port.spin(np.pi/2, [1, 0, 0])
-                    port.translate(np.array([0.0, 0.0, 0.1]))
-                    self.add(port, "port_{}".format(len(self.referenced_ports())))
+                    surface_Os.append(atom)
+        # Ports pointing along +z, spun from the default orientation.
+        ports = mb.Port._from_rotations(
+            surface_Os, _rotation_matrices(np.pi/2, np.array([1, 0, 0])),
+            np.array([0.0, 0.0, 0.1]))
+        n_ports = len(self.referenced_ports())
+        for i, port in enumerate(ports):
+            self.add(port, "port_{}".format(n_ports + i))
 
     def _adjust_stoichiometry(self):
         """Remove O's from underside of surface to yield a 2:1 Si:O ratio. """
-        num_O = len(list(self.particles_by_name('O')))
-        num_Si = len(list(self.particles_by_name('Si')))
+        num_O = 0
+        num_Si = 0
+        bottom_Os = []
+        for atom in self.particles():
+            if atom.name == 'Si':
+                num_Si += 1
+            elif atom.name == 'O':
+                num_O += 1
+                if (atom.pos[2] < self._O_buffer and
+                        len(self.bond_graph.neighbors(atom)) == 1):
+                    bottom_Os.append(atom)
         n_deletions = num_O - 2*num_Si
 
-        bottom_Os = [atom for atom in self.particles()
-                     if atom.name == 'O' and
-                        atom.pos[2] < self._O_buffer and
-                        len(self.bond_graph.neighbors(atom)) == 1]
-
+        # Draw the O's one at a time, as random.sample would draw others.
+        removed_Os = []
         for _ in range(n_deletions):
             O1 = random.choice(bottom_Os)
             bottom_Os.remove(O1)
-            self.remove(O1)
+            removed_Os.append(O1)
+        self.remove(removed_Os)
 
 if __name__ == "__main__":
     from mbuild.lib.bulk_materials import AmorphousSilicaBulk
@@ -27,16 +27,17 @@ class Betacristobalite(mb.Compound):
                 relative_to_module=self.__module__)
         self.periodicity = np.array([5.3888, 4.6669, 0.0])
 
-        count = 0
+        anchors = []
         for particle in self.particles():
             if particle.name.startswith('O') and particle.pos[2] > 1.0:
-                count += 1
-                port = mb.Port(anchor=particle, orientation=[0, 0, 1],
-                               separation=0.1)
-                self.add(port, 'port_{}'.format(count))
+                anchors.append(particle)
                 particle.name = 'O'  # Strip numbers required in .mol2 files.
             elif particle.name.startswith('Si'):
                 particle.name = 'Si'
+        ports = mb.Port.from_anchors(anchors, orientation=[0, 0, 1],
+                                     separation=0.1)
+        for count, port in enumerate(ports, start=1):
+            self.add(port, 'port_{}'.format(count))
 
 if __name__ == "__main__":
     single = Betacristobalite()
@@ -11,6 +11,7 @@ from mbuild import clone
 from mbuild.box import Box
 from mbuild.compound import Compound
 from mbuild.exceptions import MBuildError
+from mbuild.profiling import profiled
 
 __all__ = ['fill_box', 'fill_region', 'fill_sphere', 'solvate']
 
@@ -659,6 +660,7 @@ def _packmol_error(out, err):
     raise RuntimeError("PACKMOL failed. See 'log.txt'")
 
 
+@profiled()
 def _run_packmol(input_text, filled_xyz, temp_file):
     """Call PACKMOL to pack system based on the input text.
 
@@ -2,7 +2,7 @@ from itertools import product
 
 import numpy as np
 
-from mbuild.coordinate_transform import force_overlap
+from mbuild.coordinate_transform import force_overlap, _rotation_matrices
 from mbuild.utils.validation import assert_port_exists
 from mbuild import clone
 
@@ -129,7 +129,8 @@ class Pattern(object):
 
         """
 
-        n_ports = len(host.available_ports())
+        port_list = host.available_ports()
+        n_ports = len(port_list)
         assert n_ports >= self.points.shape[0], "Not enough ports for pattern."
         assert_port_exists(guest_port_name, guest)
         box = host.boundingbox
@@ -137,32 +138,27 @@ class Pattern(object):
             self.scale(box.lengths)
             self.points += box.mins
         pattern = self.points
-        port_positions = np.empty(shape=(n_ports, 3))
-        port_list = list()
-        for port_idx, port in enumerate(host.available_ports()):
-            port_positions[port_idx, :] = port['up']['middle'].pos
-            port_list.append(port)
-        used_ports = set()  # Keep track of used ports for backfilling.
+        port_positions = np.array([port['up']['middle'].pos
+                                   for port in port_list]).reshape(-1, 3)
+        closest_port_idxs = _assign_closest(pattern, port_positions,
+                                            host.periodicity)
+        used_ports = np.zeros(n_ports, dtype=bool)
+        used_ports[closest_port_idxs] = True
         guests = []
-        for point in pattern:
-            closest_point_idx = np.argmin(host.min_periodic_distance(point, port_positions))
+        for closest_point_idx in closest_port_idxs:
             closest_port = port_list[closest_point_idx]
-            used_ports.add(closest_port)
 
             # Attach the guest to the closest port.
             new_guest = clone(guest)
             force_overlap(new_guest, new_guest.labels[guest_port_name], closest_port)
             guests.append(new_guest)
 
-            # Move the port as far away as possible (simpler than removing it).
-            # There may well be a more elegant/efficient way of doing this.
-            port_positions[closest_point_idx, :] = np.array([np.inf, np.inf, np.inf])
         backfills = []
         if backfill:
             assert_port_exists(backfill_port_name, backfill)
             # Attach the backfilling Compound to unused ports.
-            for port in port_list:
-                if port not in used_ports:
+            for port, used in zip(port_list, used_ports):
+                if not used:
                     new_backfill = clone(backfill)
                     # Might make sense to have a backfill_port_name option...
                     force_overlap(new_backfill,
@@ -172,6 +168,71 @@ class Pattern(object):
         return guests, backfills
 
 
+def _assign_closest(points, positions, periodicity, k=8):
+    """Assign each point to the closest position not assigned to a previous
+    point, following the minimum image convention.
+
+    Points are assigned greedily in order. The k nearest positions of all
+    points are found with a single kd-tree query and only points whose k
+    nearest positions are all taken already are queried again, using a
+    kd-tree of the remaining positions once most positions are taken.
+
+    Parameters
+    ----------
+    points : np.ndarray, shape=(m, 3), dtype=float
+    positions : np.ndarray, shape=(n, 3), dtype=float, n >= m
+    periodicity : np.ndarray, shape=(3,), dtype=float
+        Periodic lengths, where zero denotes a non-periodic direction
+    k : int, optional, default=8
+        Number of candidate positions initially considered for each point
+
+    Returns
+    -------
+    np.ndarray, shape=(m,), dtype=int
+        Index of the position assigned to each point
+
+    """
+    from scipy.spatial import cKDTree
+    from mbuild.utils.geometry import wrap_periodic
+
+    points = np.asarray(points, dtype=float).reshape(-1, 3)
+    n_positions = positions.shape[0]
+    if points.shape[0] == 0:
+        return np.zeros(0, dtype=int)
+
+    boxsize = np.asarray(periodicity, dtype=float)
+    wrapped_positions = wrap_periodic(positions, boxsize)
+    wrapped_points = wrap_periodic(points, boxsize)
+    tree = cKDTree(wrapped_positions, boxsize=boxsize)
+    tree_idxs = np.arange(n_positions)
+
+    k = min(k, n_positions)
+    _, candidates = tree.query(wrapped_points, k=k)
+    candidates = candidates.reshape(points.shape[0], k)
+
+    taken = np.zeros(n_positions, dtype=bool)
+    assigned = np.empty(points.shape[0], dtype=int)
+    n_taken_from_tree = 0
+    for i, point_candidates in enumerate(candidates):
+        free = point_candidates[~taken[point_candidates]]
+        if free.size == 0 and 2 * n_taken_from_tree > tree_idxs.size:
+            # Most positions in the tree are taken, rebuild it from the
+            # remaining ones rather than querying ever more neighbors.
+            tree_idxs = np.flatnonzero(~taken)
+            tree = cKDTree(wrapped_positions[tree_idxs], boxsize=boxsize)
+            n_taken_from_tree = 0
+        n_query = 1
+        while free.size == 0:
+            n_query = min(2 * n_query, tree_idxs.size)
+            _, point_candidates = tree.query(wrapped_points[i], k=n_query)
+            point_candidates = tree_idxs[np.atleast_1d(point_candidates)]
+            free = point_candidates[~taken[point_candidates]]
+        assigned[i] = free[0]
+        taken[free[0]] = True
+        n_taken_from_tree += 1
+    return assigned
+
+
 class Random2DPattern(Pattern):
     def __init__(self, n, seed=None, **kwargs):
         """ Generate n random points on a 2D grid along z = 0
@@ -287,18 +348,17 @@ class SpherePattern(Pattern):
 
         from mbuild.port import Port
         if kwargs.get('orientations') is None:
-            ports = list()
-            for point in points:
-                port = Port()
-                ports.append(port)
-                # Make the top of the port point toward the positive x axis.
-                port.spin(-np.pi/2, [0, 0, 1])
-                # Raise up (or down) the top of the port in the z direction.
-                port.spin(-np.arcsin(point[2]), [0, 1, 0])
-                # Rotate the Port along the z axis.
-                port.spin(np.arctan2(point[1], point[0]), [0, 0, 1])
-                # Move the Port a bit away from the surface of the Sphere.
-                # translate(port, point + 0.07)
+            z_axis = np.array([0, 0, 1])
+            # Make the top of the port point toward the positive x axis.
+            rotations = _rotation_matrices(-np.pi/2, z_axis)
+            # Raise up (or down) the top of the port in the z direction.
+            rotations = _rotation_matrices(-np.arcsin(points[:, 2]),
+                                           np.array([0, 1, 0])) @ rotations
+            # Rotate the Port along the z axis.
+            rotations = _rotation_matrices(np.arctan2(points[:, 1],
+                                                      points[:, 0]),
+                                           z_axis) @ rotations
+            ports = Port._from_rotations([None] * n, rotations, np.zeros(3))
             kwargs['orientations'] = {'normal': ports}
         else:
             raise NotImplementedError('Custom orientation support is not yet '
@@ -1,12 +1,24 @@
+from functools import lru_cache
 import itertools
 
 import numpy as np
 
 from mbuild.compound import Compound, Particle
-from mbuild.coordinate_transform import unit_vector, angle
+from mbuild.coordinate_transform import unit_vector, _rotation_matrices
 from mbuild import clone
 
 
+# Ghost particle coordinates of the 'up' subport of a Port with the default
+# orientation, [0, 1, 0], centered at the origin.
+_SUBPORT_XYZ = np.array([[0.005, 0.0025, -0.0025],
+                         [0.005, 0.0225, -0.0025],
+                         [-0.015, -0.0075, -0.0025],
+                         [0.005, -0.0175, 0.0075]])
+_SUBPORT_LABELS = ('middle', 'top', 'left', 'right')
+_DEFAULT_DIRECTION = np.array([0, 1, 0])
+_FLIP_Z = _rotation_matrices(np.pi, np.array([0, 0, 1]))
+
+
 class Port(Compound):
     """A set of four ghost Particles used to connect parts.
 
@@ -35,47 +47,113 @@ class Port(Compound):
         Status of whether a port has been occupied following an equivalence
         transform.
 
+    See Also
+    --------
+    Port.from_anchors : Create many Ports at once
+
     """
     def __init__(self, anchor=None, orientation=None, separation=0):
         super(Port, self).__init__(name='Port', port_particle=True)
-        self.anchor = anchor
+        if orientation is None:
+            orientation = [0, 1, 0]
+        orientation = np.asarray(orientation, dtype=float).reshape(3)
+
+        xyz = np.array(_cached_port_xyz(tuple(orientation)))
+        if anchor:
+            xyz += anchor.pos - xyz.mean(axis=0)
+        xyz += separation*unit_vector(orientation)
+        self._add_subports(anchor, xyz)
+
+    @classmethod
+    def from_anchors(cls, anchors, orientation=None, separation=0):
+        """Create one Port for each of many anchors.
+
+        Equivalent to calling `Port(anchor, orientation, separation)` for
+        each anchor, but the geometry of all Ports is computed at once.
+
+        Parameters
+        ----------
+        anchors : list of mb.Particle
+            The anchors of the Ports, one Port is created per anchor
+        orientation : array-like, shape=(3,) or (n, 3), optional
+            Vector along which to orient all Ports, or one vector per Port.
+            Defaults to [0, 1, 0].
+        separation : float or array-like, shape=(n,), optional, default=0
+            Distance to shift the Ports along their orientation vectors from
+            the anchor positions, either for all Ports or one per Port.
 
-        default_direction = np.array([0, 1, 0])
+        Returns
+        -------
+        ports : list of mb.Port
+            The new Ports, in the order of `anchors`
+
+        """
+        anchors = list(anchors)
+        n_ports = len(anchors)
         if orientation is None:
             orientation = [0, 1, 0]
-        orientation = np.asarray(orientation)
-
-        up = Compound(name='subport', port_particle=True)
-        up.add(Particle(name='G', pos=[0.005, 0.0025, -0.0025],
-                        port_particle=True), 'middle')
-        up.add(Particle(name='G', pos=[0.005, 0.0225, -0.0025],
-                        port_particle=True), 'top')
-        up.add(Particle(name='G', pos=[-0.015, -0.0075, -0.0025],
-                        port_particle=True), 'left')
-        up.add(Particle(name='G', pos=[0.005, -0.0175, 0.0075],
-                        port_particle=True), 'right')
-
-        down = clone(up)
-        self.add(up, 'up')
-        self.add(down, 'down')
-        self.used = False
+        orientation = np.broadcast_to(
+            np.asarray(orientation, dtype=float), (n_ports, 3))
+        separation = np.broadcast_to(
+            np.asarray(separation, dtype=float), (n_ports,))
 
-        if np.allclose(
-                default_direction, unit_vector(-orientation)):
-            down.rotate(np.pi, [0, 0, 1])
-            self.rotate(np.pi, [0, 0, 1])
-        elif np.allclose(
-                default_direction, unit_vector(orientation)):
-            down.rotate(np.pi, [0, 0, 1])
-        else:
-            normal = np.cross(default_direction, orientation)
-            self.rotate(angle(default_direction, orientation), normal)
-            down.rotate(np.pi, normal)
+        xyz = _oriented_port_xyz(orientation)
+        anchor_pos = np.array([anchor.pos for anchor in anchors]).reshape(-1, 3)
+        shifts = anchor_pos - xyz.mean(axis=1)
+        shifts += (separation[:, np.newaxis] * orientation
+                   / np.linalg.norm(orientation, axis=1)[:, np.newaxis])
+        xyz += shifts[:, np.newaxis, :]
+        return [cls._from_xyz(anchor, port_xyz)
+                for anchor, port_xyz in zip(anchors, xyz)]
 
-        if anchor:
-            self.translate_to(anchor.pos)
+    @classmethod
+    def _from_rotations(cls, anchors, rotations, offsets):
+        """Create Ports by rotating the default Port geometry.
+
+        This is the equivalent of creating a Port with the default orientation
+        and calling `spin` with `rotations` on it, followed by translating it
+        to the anchor position plus `offsets`.
+
+        Parameters
+        ----------
+        anchors : list of mb.Particle or None
+        rotations : np.ndarray, shape=(3, 3) or (n, 3, 3)
+            Rotation matrices applied to the ghost particles of each Port
+        offsets : np.ndarray, shape=(3,) or (n, 3)
+            Position of each Port relative to its anchor, or to the origin if
+            the anchor is None
+
+        """
+        anchors = list(anchors)
+        n_ports = len(anchors)
+        rotations = np.broadcast_to(rotations, (n_ports, 3, 3))
+        offsets = np.array(np.broadcast_to(offsets, (n_ports, 3)))
+        for i, anchor in enumerate(anchors):
+            if anchor is not None:
+                offsets[i] += anchor.pos
+        xyz = np.einsum('nij,kj->nki', rotations, _DEFAULT_PORT_XYZ)
+        xyz += offsets[:, np.newaxis, :]
+        return [cls._from_xyz(anchor, port_xyz)
+                for anchor, port_xyz in zip(anchors, xyz)]
+
+    @classmethod
+    def _from_xyz(cls, anchor, xyz):
+        port = cls.__new__(cls)
+        super(Port, port).__init__(name='Port', port_particle=True)
+        port._add_subports(anchor, xyz)
+        return port
 
-        self.translate(separation*unit_vector(orientation))
+    def _add_subports(self, anchor, xyz):
+        """Add the 'up' and 'down' subports with the given ghost coordinates
+        """
+        self.anchor = anchor
+        for label, subport_xyz in (('up', xyz[:4]), ('down', xyz[4:])):
+            subport = Compound(name='subport', port_particle=True)
+            subport._bulk_add(
+                [Particle(name='G', pos=pos, port_particle=True)
+                 for pos in subport_xyz], labels=_SUBPORT_LABELS)
+            self.add(subport, label)
+        self.used = False
 
     def _clone(self, clone_of=None, root_container=None):
         newone = super(Port, self)._clone(clone_of, root_container)
@@ -130,3 +208,60 @@ class Port(Compound):
 
         descr.append('id: {}>'.format(id(self)))
         return ''.join(descr)
+
+
+def _oriented_port_xyz(orientations):
+    """Ghost particle coordinates of Ports with the given orientations
+
+    The 'down' subport of a Port pointing along the default direction is the
+    'up' subport rotated by pi around the z axis. For all other orientations,
+    both subports are rotated from the default direction onto the
+    orientation, and the 'down' subport is additionally rotated by pi around
+    the rotation axis.
+
+    Parameters
+    ----------
+    orientations : np.ndarray, shape=(n, 3), dtype=float
+
+    Returns
+    -------
+    xyz : np.ndarray, shape=(n, 8, 3), dtype=float
+        The coordinates of the 'up' followed by the 'down' ghost particles of
+        each Port, centered at the origin
+
+    """
+    orientations = np.asarray(orientations, dtype=float)
+    norms = np.linalg.norm(orientations, axis=1)
+    if not norms.all():
+        raise ValueError('Cannot orient a Port along a zero vector')
+    units = orientations / norms[:, np.newaxis]
+    antiparallel = np.isclose(_DEFAULT_DIRECTION, -units).all(axis=1)
+    parallel = np.isclose(_DEFAULT_DIRECTION, units).all(axis=1)
+    general = ~(antiparallel | parallel)
+
+    n_ports = orientations.shape[0]
+    rotation = np.tile(np.eye(3), (n_ports, 1, 1))
+    rotation[antiparallel] = _FLIP_Z
+    flip = np.tile(_FLIP_Z, (n_ports, 1, 1))
+    if general.any():
+        normals = np.cross(_DEFAULT_DIRECTION, orientations[general])
+        theta = np.arccos(np.clip(units[general, 1], -1, 1))
+        rotation[general] = _rotation_matrices(theta, normals)
+        flip[general] = _rotation_matrices(np.pi, normals)
+
+    xyz = np.empty((n_ports, 8, 3))
+    xyz[:, :4] = np.einsum('nij,kj->nki', rotation, _SUBPORT_XYZ)
+    xyz[:, 4:] = np.einsum('nij,kj->nki', rotation @ flip, _SUBPORT_XYZ)
+    return xyz
+
+
+@lru_cache(maxsize=256)
+def _cached_port_xyz(orientation):
+    """Read-only ghost particle coordinates of a Port centered at the origin
+    """
+    xyz = _oriented_port_xyz(np.array([orientation]))[0]
+    xyz.flags.writeable = False
+    return xyz
+
+
+_DEFAULT_PORT_XYZ = _cached_port_xyz(tuple(_DEFAULT_DIRECTION))
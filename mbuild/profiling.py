@@ -0,0 +1,252 @@
+"""Opt-in instrumentation of the most expensive mBuild operations.
+
+When profiling is enabled, every call to an instrumented function, e.g.
+`Compound.add`, `clone`, `force_overlap`, `Compound.to_parmed`,
+`Compound.save`, `load`, the PACKMOL call of the packing functions and the
+file writers, records its wall time and, optionally, the memory it
+allocates. Calls are attributed to the innermost active `phase`, so that the
+slow stages of a long build script can be identified:
+
+>>> import mbuild as mb
+>>> mb.profiling.enable()
+>>> with mb.profiling.phase('build'):
+...     ...
+>>> with mb.profiling.phase('write'):
+...     ...
+>>> print(mb.profiling.report())
+
+Profiling can also be enabled by setting the environment variable
+`MBUILD_PROFILE` to `1` before importing mbuild, in which case the report is
+printed to stderr when the interpreter exits. Set it to `memory` to also
+record allocated memory.
+
+When profiling is disabled, instrumented functions only pay for checking a
+single flag.
+"""
+import atexit
+import functools
+import os
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+
+__all__ = ['enable', 'disable', 'is_enabled', 'reset', 'phase', 'stats',
+           'report', 'profiled']
+
+_enabled = False
+_trace_memory = False
+_started_tracemalloc = False
+
+# Names of the active phases, outermost first.
+_phases = []
+# Call statistics keyed by (phase path, function name), in order of first
+# call.
+_stats = OrderedDict()
+# Number of currently running calls of each instrumented function, used to
+# only time the outermost of nested or recursive calls.
+_active = dict()
+
+
+class CallStats(object):
+    """Accumulated statistics of an instrumented function or a phase
+
+    Attributes
+    ----------
+    calls : int
+        Number of calls
+    time : float
+        Total wall time in seconds, excluding nested calls of the same
+        function
+    allocated : int
+        Total memory allocated and not yet freed when the calls returned, in
+        bytes. Only recorded if profiling was enabled with `memory=True`.
+
+    """
+    __slots__ = ('calls', 'time', 'allocated')
+
+    def __init__(self):
+        self.calls = 0
+        self.time = 0.0
+        self.allocated = 0
+
+    def __repr__(self):
+        return '<CallStats calls={}, time={:.6f} s, allocated={} B>'.format(
+            self.calls, self.time, self.allocated)
+
+
+def enable(memory=False):
+    """Start recording calls of instrumented functions
+
+    Parameters
+    ----------
+    memory : bool, optional, default=False
+        Also record the memory allocated by each call, using `tracemalloc`.
+        This slows down all Python code considerably while profiling is
+        enabled.
+
+    """
+    global _enabled, _trace_memory, _started_tracemalloc
+    _enabled = True
+    _trace_memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started_tracemalloc = True
+
+
+def disable():
+    """Stop recording calls. Statistics recorded so far are kept. """
+    global _enabled, _trace_memory, _started_tracemalloc
+    _enabled = False
+    _trace_memory = False
+    if _started_tracemalloc:
+        tracemalloc.stop()
+        _started_tracemalloc = False
+
+
+def is_enabled():
+    """Whether calls of instrumented functions are currently recorded """
+    return _enabled
+
+
+def reset():
+    """Discard all recorded statistics """
+    _stats.clear()
+
+
+def _record(name, elapsed, allocated):
+    key = ('/'.join(_phases), name)
+    entry = _stats.get(key)
+    if entry is None:
+        entry = _stats[key] = CallStats()
+    entry.calls += 1
+    entry.time += elapsed
+    entry.allocated += allocated
+
+
+def _allocated():
+    if _trace_memory and tracemalloc.is_tracing():
+        return tracemalloc.get_traced_memory()[0]
+    return 0
+
+
+@contextmanager
+def phase(name):
+    """Attribute the calls within a block to a named phase
+
+    Phases can be nested, in which case calls are attributed to the path of
+    all active phases, e.g. 'build/solvate'. The wall time and memory of the
+    block itself are recorded under the name of the phase, as part of the
+    enclosing phase. Nothing is recorded while profiling is disabled.
+
+    Parameters
+    ----------
+    name : str
+        Name of the phase
+
+    """
+    if not _enabled:
+        yield
+        return
+    start_memory = _allocated()
+    start = time.perf_counter()
+    _phases.append(name)
+    try:
+        yield
+    finally:
+        _phases.pop()
+        _record('[{}]'.format(name), time.perf_counter() - start,
+                _allocated() - start_memory)
+
+
+def profiled(name=None):
+    """Instrument a function, such that its calls are recorded while
+    profiling is enabled
+
+    Parameters
+    ----------
+    name : str, optional, default=fcn.__qualname__
+        Name under which the calls are recorded
+
+    """
+    def decorator(fcn):
+        label = name or fcn.__qualname__
+
+        @functools.wraps(fcn)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return fcn(*args, **kwargs)
+            depth = _active.get(label, 0)
+            if depth:
+                # Only the outermost call is timed, but all are counted.
+                _active[label] = depth + 1
+                try:
+                    return fcn(*args, **kwargs)
+                finally:
+                    _active[label] = depth
+                    _record(label, 0.0, 0)
+            _active[label] = 1
+            start_memory = _allocated()
+            start = time.perf_counter()
+            try:
+                return fcn(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                _active[label] = 0
+                _record(label, elapsed, _allocated() - start_memory)
+        return wrapper
+    return decorator
+
+
+def stats():
+    """The recorded statistics
+
+    Returns
+    -------
+    OrderedDict
+        `CallStats` keyed by (phase, function name), where phase is the
+        '/'-separated path of the phases active during the calls, or '' for
+        calls outside of any phase
+
+    """
+    return OrderedDict(_stats)
+
+
+def report():
+    """A table of the recorded statistics, grouped by phase
+
+    Returns
+    -------
+    str
+
+    """
+    by_phase = OrderedDict()
+    for (phase_name, name), entry in _stats.items():
+        by_phase.setdefault(phase_name, []).append((name, entry))
+
+    width = max([len(name) for _, name in _stats] + [8]) + 2
+    header = '{:<{w}}{:>10}{:>14}{:>14}{:>16}'.format(
+        'function', 'calls', 'total (s)', 'per call (s)', 'allocated (B)',
+        w=width)
+    lines = []
+    for phase_name, entries in by_phase.items():
+        lines.append('phase: {}'.format(phase_name or '<none>'))
+        lines.append(header)
+        for name, entry in sorted(entries, key=lambda e: -e[1].time):
+            lines.append('{:<{w}}{:>10d}{:>14.6f}{:>14.6f}{:>16d}'.format(
+                name, entry.calls, entry.time, entry.time / entry.calls,
+                entry.allocated, w=width))
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def _print_report():
+    if _stats:
+        sys.stderr.write(report())
+
+
+_env = os.environ.get('MBUILD_PROFILE', '').strip().lower()
+if _env and _env not in ('0', 'false', 'no', 'off'):
+    enable(memory=(_env == 'memory'))
+    atexit.register(_print_report)
@@ -1,8 +1,52 @@
+import sys
+
+
 class Recipes(object):
-    pass
+    """Recipes registered under the 'mbuild.plugins' entry point group
+
+    The entry points are only looked up and loaded when the first recipe is
+    accessed, since scanning the installed distributions is slow.
+    """
+    _loaded = False
+
+    def __getattr__(self, name):
+        if self._loaded or name.startswith('__'):
+            raise AttributeError(
+                "'Recipes' object has no attribute '{}'".format(name))
+        self._load()
+        return getattr(self, name)
+
+    def __dir__(self):
+        self._load()
+        return super(Recipes, self).__dir__()
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        from pkg_resources import iter_entry_points
+        for entry_point in iter_entry_points(group='mbuild.plugins',
+                                             name=None):
+            setattr(self, entry_point.name, entry_point.load())
+
 
 recipes = Recipes()
-from pkg_resources import iter_entry_points
 available_methods = []
-for entry_point in iter_entry_points(group='mbuild.plugins', name=None):
-    setattr(recipes, entry_point.name, entry_point.load())
+
+
+def __getattr__(name):
+    # `import mbuild.recipes` binds this module rather than `recipes` on the
+    # mbuild package, so the recipes are also accessible from here.
+    return getattr(recipes, name)
+
+
+def __dir__():
+    return sorted(set(globals()) | set(dir(recipes)))
+
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ (PEP 562) requires Python 3.7, so the recipes are
+    # loaded eagerly and bound on this module on older versions.
+    recipes._load()
+    globals().update((name, value) for name, value in vars(recipes).items()
+                     if not name.startswith('_'))
@@ -0,0 +1,209 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from mbuild.utils.geometry import wrap_periodic
+
+__all__ = ['relax_soft_spheres']
+
+
+def relax_soft_spheres(xyz, r_min, periodicity=None, bonds=None,
+                       exclusions=None, bond_stiffness=10.0, steps=1000,
+                       tolerance=1e-4, max_displacement=None):
+    """Push apart overlapping particles with a soft-sphere potential
+
+    Particles closer than `r_min` interact through the harmonic repulsion
+    U = 0.5 * (r_min - r)**2; particles farther apart do not interact. The
+    energy is minimized with the FIRE algorithm [1]_, using unit masses and
+    a Verlet neighbor list built with a (periodic) kd-tree.
+
+    Parameters
+    ----------
+    xyz : np.ndarray, shape=(n, 3), dtype=float
+        The initial coordinates
+    r_min : float
+        Distance below which two particles overlap
+    periodicity : np.ndarray, shape=(3,), dtype=float, optional
+        Periodic lengths, where zero denotes a non-periodic direction.
+        Minimum image distances are used in periodic directions.
+    bonds : np.ndarray, shape=(m, 2), dtype=int, optional
+        Pairs of particles that are restrained harmonically to their
+        initial distance
+    exclusions : np.ndarray, shape=(k, 2), dtype=int, optional
+        Pairs of particles that do not repel each other
+    bond_stiffness : float, optional, default=10.0
+        Force constant of the bond restraints relative to that of the
+        soft-sphere repulsion
+    steps : int, optional, default=1000
+        Maximum number of FIRE steps
+    tolerance : float, optional, default=1e-4
+        The relaxation stops once the largest force on any particle, in nm,
+        falls below this value
+    max_displacement : float, optional, default=0.1 * r_min
+        Largest distance any particle can move in a single step
+
+    Returns
+    -------
+    xyz : np.ndarray, shape=(n, 3), dtype=float
+        The relaxed coordinates
+    n_steps : int
+        The number of steps taken
+
+    References
+    ----------
+    .. [1] Bitzek, E.; Koskinen, P.; Gaehler, F.; Moseler, M.; Gumbsch, P.
+       "Structural Relaxation Made Simple." Phys. Rev. Lett. 2006, 97,
+       170201.
+
+    """
+    xyz = np.array(xyz, dtype=float)
+    n = xyz.shape[0]
+    if periodicity is None:
+        periodicity = np.zeros(3)
+    periodicity = np.asarray(periodicity, dtype=float)
+    periodic = periodicity > 0
+    if max_displacement is None:
+        max_displacement = 0.1 * r_min
+
+    bonds = _as_pairs(bonds)
+    excluded = _pair_keys(_as_pairs(exclusions), n)
+    bond_lengths = _distances(xyz, bonds, periodicity, periodic)[1]
+
+    # Particles on top of each other have no defined direction to move in.
+    _separate_coincident(xyz, r_min)
+
+    skin = 0.3 * r_min
+    dt_start = 0.1
+    dt_max = 1.0
+    n_delay = 5
+    f_inc = 1.1
+    f_dec = 0.5
+    alpha_start = 0.1
+    f_alpha = 0.99
+
+    velocities = np.zeros_like(xyz)
+    dt = dt_start
+    alpha = alpha_start
+    n_positive = 0
+    pairs = None
+    xyz_at_build = None
+
+    step = 0
+    for step in range(1, steps + 1):
+        if pairs is None or _max_shift(xyz, xyz_at_build) > 0.5 * skin:
+            pairs = _neighbor_pairs(xyz, r_min + skin, periodicity, excluded)
+            xyz_at_build = xyz.copy()
+
+        forces = _repulsion(xyz, pairs, r_min, periodicity, periodic)
+        if len(bonds):
+            forces += _restraint(xyz, bonds, bond_lengths, bond_stiffness,
+                                 periodicity, periodic)
+        if np.max(np.linalg.norm(forces, axis=1), initial=0) < tolerance:
+            step -= 1
+            break
+
+        power = np.sum(forces * velocities)
+        if power > 0:
+            f_norm = np.linalg.norm(forces)
+            v_norm = np.linalg.norm(velocities)
+            velocities = ((1 - alpha) * velocities
+                          + alpha * v_norm * forces / f_norm)
+            if n_positive > n_delay:
+                dt = min(dt * f_inc, dt_max)
+                alpha *= f_alpha
+            n_positive += 1
+        else:
+            velocities[:] = 0
+            dt *= f_dec
+            alpha = alpha_start
+            n_positive = 0
+
+        velocities += forces * dt
+        displacement = velocities * dt
+        length = np.linalg.norm(displacement, axis=1)
+        too_far = length > max_displacement
+        if np.any(too_far):
+            displacement[too_far] *= (max_displacement
+                                      / length[too_far])[:, np.newaxis]
+        xyz += displacement
+
+    return xyz, step
+
+
+def _as_pairs(pairs):
+    if pairs is None:
+        return np.empty((0, 2), dtype=np.int64)
+    return np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+
+
+def _pair_keys(pairs, n):
+    """Sorted unique integer keys of unordered pairs """
+    low = np.minimum(pairs[:, 0], pairs[:, 1])
+    high = np.maximum(pairs[:, 0], pairs[:, 1])
+    return np.unique(low * n + high)
+
+
+def _separate_coincident(xyz, r_min):
+    """Randomly displace particles that share the position of another """
+    _, first, counts = np.unique(np.round(xyz, 8), axis=0, return_index=True,
+                                 return_counts=True)
+    if np.all(counts == 1):
+        return
+    duplicate = np.ones(xyz.shape[0], dtype=bool)
+    duplicate[first] = False
+    xyz[duplicate] += (np.random.rand(np.count_nonzero(duplicate), 3) - 0.5) \
+        * 1e-3 * r_min
+
+
+def _max_shift(xyz, xyz_ref):
+    return np.max(np.linalg.norm(xyz - xyz_ref, axis=1), initial=0)
+
+
+def _neighbor_pairs(xyz, cutoff, periodicity, excluded):
+    """All pairs closer than `cutoff`, minus the excluded pairs """
+    tree = cKDTree(wrap_periodic(xyz, periodicity), boxsize=periodicity)
+    pairs = tree.query_pairs(cutoff, output_type='ndarray')
+    if len(excluded) and len(pairs):
+        keys = _pair_keys(pairs, xyz.shape[0])
+        pairs = pairs[~np.isin(keys, excluded, assume_unique=True)]
+    return pairs
+
+
+def _distances(xyz, pairs, periodicity, periodic):
+    """Minimum image separation vectors and distances of pairs """
+    delta = xyz[pairs[:, 1]] - xyz[pairs[:, 0]]
+    if np.any(periodic):
+        delta[:, periodic] -= periodicity[periodic] * np.round(
+            delta[:, periodic] / periodicity[periodic])
+    return delta, np.linalg.norm(delta, axis=1)
+
+
+def _accumulate(n, pairs, pair_forces):
+    """Sum the forces acting on the second particle of each pair, and their
+    reaction on the first """
+    forces = np.empty((n, 3))
+    for dim in range(3):
+        forces[:, dim] = (
+            np.bincount(pairs[:, 1], pair_forces[:, dim], minlength=n)
+            - np.bincount(pairs[:, 0], pair_forces[:, dim], minlength=n))
+    return forces
+
+
+def _repulsion(xyz, pairs, r_min, periodicity, periodic):
+    n = xyz.shape[0]
+    if not len(pairs):
+        return np.zeros((n, 3))
+    delta, dist = _distances(xyz, pairs, periodicity, periodic)
+    overlapping = dist < r_min
+    pairs = pairs[overlapping]
+    delta = delta[overlapping]
+    dist = dist[overlapping]
+    pair_forces = ((r_min - dist) / np.maximum(dist, 1e-12))[:, np.newaxis] \
+        * delta
+    return _accumulate(n, pairs, pair_forces)
+
+
+def _restraint(xyz, bonds, bond_lengths, stiffness, periodicity, periodic):
+    delta, dist = _distances(xyz, bonds, periodicity, periodic)
+    pair_forces = (stiffness * (bond_lengths - dist)
+                   / np.maximum(dist, 1e-12))[:, np.newaxis] * delta
+    return _accumulate(xyz.shape[0], bonds, pair_forces)
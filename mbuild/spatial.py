@@ -0,0 +1,295 @@
+import itertools
+
+import numpy as np
+
+from mbuild.exceptions import MBuildError
+from mbuild.utils.geometry import wrap_periodic
+
+__all__ = ['SpatialIndex']
+
+
+class SpatialIndex(object):
+    """A persistent index for spatial selections of the particles of a Compound
+
+    The index stores the particles and their coordinates in a kd-tree, which
+    is reused by all selections until `update` is called. `update` only
+    rebuilds the kd-tree if the particles or the periodicity of the Compound
+    changed, or if many particles moved. The few particles that moved since
+    the kd-tree was built are checked separately by all selections.
+
+    Distances and selections follow the minimum image convention in the
+    periodic directions of the Compound, assuming an orthorhombic box with
+    an origin at zero.
+
+    Parameters
+    ----------
+    compound : mb.Compound
+        The Compound whose particles are indexed
+
+    Attributes
+    ----------
+    compound : mb.Compound
+        The Compound whose particles are indexed
+    particles : np.ndarray, shape=(n,), dtype=mb.Compound
+        The particles of the Compound at the last update. All selections
+        return indices into this array.
+    xyz : np.ndarray, shape=(n, 3), dtype=float
+        The coordinates of the particles at the last update
+    periodicity : np.ndarray, shape=(3,), dtype=float
+        The periodicity of the Compound at the last update
+
+    See Also
+    --------
+    mb.Compound.spatial_index : Get the index of a Compound
+
+    """
+    # Fraction of moved particles above which the kd-tree is rebuilt
+    rebuild_fraction = 0.1
+
+    def __init__(self, compound):
+        self.compound = compound
+        self.particles = None
+        self.xyz = None
+        self.periodicity = None
+        self._tree = None
+        self._tree_xyz = None
+        self._moved = None
+        self._particle_index = None
+        self.update()
+
+    def update(self):
+        """Update the index to the current particles and coordinates """
+        particles = list(self.compound.particles())
+        xyz = np.fromiter(itertools.chain.from_iterable(
+            particle.pos for particle in particles), dtype=float)
+        xyz = xyz.reshape((-1, 3))
+        periodicity = np.array(self.compound.periodicity, dtype=float)
+
+        if (self._tree is None or
+                len(particles) != len(self.particles) or
+                not np.array_equal(periodicity, self.periodicity) or
+                any(particle is not indexed for particle, indexed
+                    in zip(particles, self.particles))):
+            self._build(particles, xyz, periodicity)
+            return
+
+        moved = np.flatnonzero((xyz != self._tree_xyz).any(axis=1))
+        if moved.size > self.rebuild_fraction * len(particles):
+            self._build(particles, xyz, periodicity)
+            return
+        self.xyz = xyz
+        self._moved = np.zeros(len(particles), dtype=bool)
+        self._moved[moved] = True
+
+    def _build(self, particles, xyz, periodicity):
+        from scipy.spatial import cKDTree
+
+        self.particles = np.empty(len(particles), dtype=object)
+        self.particles[:] = particles
+        self.xyz = xyz
+        self.periodicity = periodicity
+        self._particle_index = None
+        # Dimensions with a box size of zero are not periodic in cKDTree.
+        self._tree = cKDTree(self._wrap(xyz), boxsize=periodicity)
+        self._tree_xyz = xyz
+        self._moved = np.zeros(len(particles), dtype=bool)
+
+    def _wrap(self, xyz):
+        """Wrap coordinates into the periodic box, as required by cKDTree """
+        return wrap_periodic(xyz, self.periodicity)
+
+    def _distances(self, xyz, point):
+        """Minimum image distances between coordinates and a point """
+        d = xyz - point
+        periodic = self.periodicity > 0
+        if periodic.any():
+            lengths = np.where(periodic, self.periodicity, 1.0)
+            d = np.where(periodic, d - lengths * np.round(d / lengths), d)
+        return np.sqrt((d ** 2).sum(axis=-1))
+
+    def _indices(self, selection):
+        """Indices of a selection of particles, a Compound or indices """
+        from mbuild.compound import Compound
+
+        if isinstance(selection, Compound):
+            selection = selection.particles()
+        selection = list(selection)
+        if all(isinstance(item, (int, np.integer)) for item in selection):
+            return np.asarray(selection, dtype=int)
+        if self._particle_index is None:
+            self._particle_index = {id(particle): i for i, particle
+                                    in enumerate(self.particles)}
+        try:
+            return np.array([self._particle_index[id(particle)]
+                             for particle in selection], dtype=int)
+        except KeyError:
+            raise MBuildError('The selection contains particles that are not '
+                              'in {}.'.format(self.compound))
+
+    def _result(self, idxs, return_particles):
+        if return_particles:
+            return list(self.particles[idxs])
+        return idxs
+
+    def within(self, center, r, return_particles=False):
+        """Select the particles within a distance of a point
+
+        Parameters
+        ----------
+        center : np.ndarray, shape=(3,), dtype=float
+            The point around which particles are selected
+        r : float
+            The maximum distance of the selected particles from `center`
+        return_particles : bool, optional, default=False
+            Return a list of the selected particles rather than their indices
+
+        Returns
+        -------
+        np.ndarray, shape=(m,), dtype=int or list of mb.Compound
+            The sorted indices of the selected particles in `particles`, or
+            the particles themselves
+
+        """
+        center = np.asarray(center, dtype=float).reshape(3)
+        idxs = np.asarray(
+            self._tree.query_ball_point(self._wrap(center), r), dtype=int)
+        if self._moved.any():
+            idxs = idxs[~self._moved[idxs]]
+            moved = np.flatnonzero(self._moved)
+            moved = moved[self._distances(self.xyz[moved], center) <= r]
+            idxs = np.concatenate((idxs, moved))
+        return self._result(np.unique(idxs), return_particles)
+
+    def within_of(self, selection, r, return_particles=False):
+        """Select the particles within a distance of any particle of a selection
+
+        The particles of the selection are included in the result.
+
+        Parameters
+        ----------
+        selection : mb.Compound, iterable of mb.Compound or of int
+            A Compound whose particles make up the selection, the particles
+            themselves or their indices in `particles`
+        r : float
+            The maximum distance of the selected particles from the closest
+            particle of `selection`
+        return_particles : bool, optional, default=False
+            Return a list of the selected particles rather than their indices
+
+        Returns
+        -------
+        np.ndarray, shape=(m,), dtype=int or list of mb.Compound
+            The sorted indices of the selected particles in `particles`, or
+            the particles themselves
+
+        """
+        from scipy.spatial import cKDTree
+
+        sel_idxs = self._indices(selection)
+        if sel_idxs.size == 0:
+            return self._result(np.zeros(0, dtype=int), return_particles)
+        points = self._wrap(self.xyz[sel_idxs])
+        neighbors = self._tree.query_ball_point(points, r)
+        idxs = np.fromiter(itertools.chain.from_iterable(neighbors),
+                           dtype=int)
+        if self._moved.any():
+            idxs = idxs[~self._moved[idxs]]
+            moved = np.flatnonzero(self._moved)
+            selection_tree = cKDTree(points, boxsize=self.periodicity)
+            distances, _ = selection_tree.query(
+                self._wrap(self.xyz[moved]), distance_upper_bound=r)
+            idxs = np.concatenate((idxs, moved[distances <= r]))
+        return self._result(np.unique(idxs), return_particles)
+
+    def slab(self, axis, lower, upper, return_particles=False):
+        """Select the particles between two planes normal to an axis
+
+        Parameters
+        ----------
+        axis : int or str
+            The axis normal to the planes, as 0, 1, 2 or 'x', 'y', 'z'
+        lower, upper : float
+            The coordinates of the planes along `axis`. In periodic
+            directions, slabs crossing the box boundaries are selected from
+            the periodic images of the particles.
+        return_particles : bool, optional, default=False
+            Return a list of the selected particles rather than their indices
+
+        Returns
+        -------
+        np.ndarray, shape=(m,), dtype=int or list of mb.Compound
+            The sorted indices of the selected particles in `particles`, or
+            the particles themselves
+
+        """
+        if isinstance(axis, str):
+            axis = 'xyz'.index(axis.lower())
+        inside = self._in_range(self.xyz[:, axis], lower, upper,
+                                self.periodicity[axis])
+        return self._result(np.flatnonzero(inside), return_particles)
+
+    def box(self, mins, maxs, return_particles=False):
+        """Select the particles inside of an axis-aligned box
+
+        Parameters
+        ----------
+        mins, maxs : np.ndarray, shape=(3,), dtype=float
+            The lower and upper corners of the box. In periodic directions,
+            boxes crossing the box boundaries are selected from the periodic
+            images of the particles.
+        return_particles : bool, optional, default=False
+            Return a list of the selected particles rather than their indices
+
+        Returns
+        -------
+        np.ndarray, shape=(m,), dtype=int or list of mb.Compound
+            The sorted indices of the selected particles in `particles`, or
+            the particles themselves
+
+        """
+        mins = np.asarray(mins, dtype=float).reshape(3)
+        maxs = np.asarray(maxs, dtype=float).reshape(3)
+        inside = np.ones(len(self.particles), dtype=bool)
+        for axis in range(3):
+            inside &= self._in_range(self.xyz[:, axis], mins[axis],
+                                     maxs[axis], self.periodicity[axis])
+        return self._result(np.flatnonzero(inside), return_particles)
+
+    @staticmethod
+    def _in_range(coordinates, lower, upper, length):
+        if length > 0:
+            return np.mod(coordinates - lower, length) <= upper - lower
+        return (coordinates >= lower) & (coordinates <= upper)
+
+    def nearest(self, point, k=1, return_particles=False):
+        """Select the particles closest to a point
+
+        Parameters
+        ----------
+        point : np.ndarray, shape=(3,), dtype=float
+            The point to which the distances are measured
+        k : int, optional, default=1
+            The number of particles to select
+        return_particles : bool, optional, default=False
+            Return a list of the selected particles rather than their indices
+
+        Returns
+        -------
+        np.ndarray, shape=(min(k, n),), dtype=int or list of mb.Compound
+            The indices of the selected particles in `particles`, or the
+            particles themselves, ordered by their distance from `point`
+
+        """
+        point = np.asarray(point, dtype=float).reshape(3)
+        moved = np.flatnonzero(self._moved)
+        n_query = min(k + moved.size, len(self.particles))
+        distances, idxs = self._tree.query(self._wrap(point), k=n_query)
+        distances = np.atleast_1d(distances)
+        idxs = np.atleast_1d(idxs)
+        if moved.size:
+            current = ~self._moved[idxs]
+            distances = np.concatenate(
+                (distances[current], self._distances(self.xyz[moved], point)))
+            idxs = np.concatenate((idxs[current], moved))
+        order = np.argsort(distances, kind='stable')[:k]
+        return self._result(idxs[order], return_particles)
@@ -2,7 +2,7 @@ import pytest
 
 import mbuild as mb
 from mbuild.tests.base_test import BaseTest
-from mbuild.utils.io import has_foyer
+from mbuild.utils.io import has_foyer, has_openbabel
 
 
 @pytest.mark.skipif(not has_foyer, reason="Foyer package not installed")
@@ -270,3 +270,31 @@ class TestCassandraMCF(BaseTest):
         assert mcf_data[fragment_conn_start+1][0] == '0'
 
 
+class TestCassandraMCFFragments(BaseTest):
+
+    def test_id_rings_fragments_chain(self):
+        from mbuild.formats.cassandramcf import _id_rings_fragments
+        from mbuild.lib.recipes import Alkane
+        in_ring, frag_list, frag_conn = _id_rings_fragments(
+            Alkane(10).to_parmed())
+        assert not any(in_ring)
+        assert len(frag_list) == 10
+        assert len(frag_conn) == 9
+        for i, j in frag_conn:
+            assert len(set(frag_list[i]) & set(frag_list[j])) == 2
+
+    @pytest.mark.skipif(not has_openbabel, reason="Open Babel not installed")
+    def test_id_rings_fragments_fused_rings(self):
+        from mbuild.formats.cassandramcf import _id_rings_fragments
+        anthracene = mb.load('c1ccc2cc3ccccc3cc2c1', smiles=True)
+        structure = anthracene.to_parmed()
+        carbons = [atom.idx for atom in structure.atoms
+                   if atom.element_name == 'C']
+        with pytest.warns(UserWarning, match='share more than two atoms'):
+            in_ring, frag_list, frag_conn = _id_rings_fragments(structure)
+        assert [i for i, ring in enumerate(in_ring) if ring] == carbons
+        assert len(frag_list) == 2
+        for fragment in frag_list:
+            assert len(fragment) == len(set(fragment)) == 18
+        assert set(carbons) <= set(frag_list[0]) | set(frag_list[1])
+        assert frag_conn == []
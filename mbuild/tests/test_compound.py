@@ -218,6 +218,33 @@ class TestCompound(BaseTest):
         assert compound.n_particles == 8 + 2 * 3
         assert compound.n_bonds == 7 + 2 * 2
 
+    def test_particles_share_empty_containers(self):
+        import pickle
+        a = mb.Particle(name='A')
+        b = mb.Particle(name='B')
+        assert not hasattr(a, '__dict__') or not a.__dict__
+        assert a.children is b.children
+        assert a.labels is b.labels
+        assert a._periodicity is b._periodicity
+
+        with pytest.raises(TypeError):
+            a.children.add(b)
+
+        a.add(b)
+        assert list(a.children) == [b]
+        assert a['Compound[0]'] is b
+        assert a.children is not mb.Particle().children
+        assert not mb.Particle().children
+
+        copy = pickle.loads(pickle.dumps(a))
+        leaf = next(copy.particles())
+        leaf.add(mb.Particle(name='C'))
+        assert leaf.n_particles == 1
+
+        a.periodicity = [1, 2, 3]
+        assert np.array_equal(a.periodicity, [1, 2, 3])
+        assert not b.periodicity.any()
+
     def test_init_with_bad_name(self):
         with pytest.raises(ValueError):
             mb.Compound(name=1)
@@ -237,6 +264,46 @@ class TestCompound(BaseTest):
         with pytest.raises(MBuildError):
             ethane.add(mb.clone(h2o), label='water')
 
+    def test_periodicity_in_place(self):
+        compound = mb.Compound()
+        other = mb.Compound()
+        compound.periodicity[2] = 1.0
+        assert np.array_equal(compound.periodicity, [0, 0, 1])
+        assert not other.periodicity.any()
+        clone = mb.clone(compound)
+        clone.periodicity[0] = 2.0
+        assert np.array_equal(compound.periodicity, [0, 0, 1])
+
+        box = mb.Compound([mb.Compound(), mb.Compound()])
+        assert all(child._periodicity is box.children[0]._periodicity
+                   for child in box.children)
+
+    def test_add_lazy_labels(self):
+        compound = mb.Compound()
+        particles = [mb.Compound(name='C') for _ in range(5)]
+        compound.add(particles[:3], lazy_labels=True)
+        compound.add(particles[3], label='C[$]', lazy_labels=True)
+        compound.add(particles[4], label='carbon', lazy_labels=True)
+        assert list(compound.labels) == ['Compound', 'C', 'carbon']
+        assert compound['Compound[2]'] is particles[2]
+        assert compound['C[0]'] is particles[3]
+        assert compound['carbon'] is particles[4]
+        assert particles[4].referrers == {compound}
+        assert not particles[0].referrers
+        with pytest.raises(MBuildError):
+            compound['Compound[3]']
+
+        clone = mb.clone(compound)
+        assert clone['Compound[1]'] is clone.children[1]
+        with pytest.raises(MBuildError):
+            clone.add(mb.Compound(), label='Compound[1]')
+        assert not mb.Compound([mb.Compound()])._has_lazy_labels
+
+        compound.remove(particles[1])
+        assert compound['Compound[2]'] is particles[2]
+        with pytest.raises(MBuildError):
+            compound['Compound[1]']
+
     def test_set_pos(self, ethane):
         with pytest.raises(MBuildError):
             ethane.pos = [0, 0, 0]
@@ -264,6 +331,71 @@ class TestCompound(BaseTest):
         only_C = ethane.particles_by_name('C')
         assert sum(1 for _ in only_C) == 2
 
+    def test_particles_by_name_index(self, ethane, methane):
+        box = mb.Compound([ethane, methane])
+        assert len(list(box.particles_by_name('H'))) == 10
+        carbon = ethane.children[0].children[0]
+        carbon.name = 'X'
+        assert list(box.particles_by_name('X')) == [carbon]
+        assert len(list(ethane.particles_by_name('C'))) == 1
+
+        more = mb.clone(methane)
+        box.add(more)
+        assert len(list(box.particles_by_name('H'))) == 14
+        box.remove(methane)
+        assert len(list(box.particles_by_name('H'))) == 10
+        assert len(list(more.particles_by_name('H'))) == 4
+        assert list(methane.particles_by_name('H')) == [
+            particle for particle in methane.particles()
+            if particle.name == 'H']
+        assert all(particle.root is box
+                   for particle in box.particles_by_name('H'))
+
+    def test_rigid_particles_index(self, ethane, methane):
+        box = mb.Compound([ethane, methane])
+        assert box.max_rigid_id is None
+        ethane.label_rigid_bodies()
+        assert box.max_rigid_id == 0
+        assert set(box.rigid_particles(0)) == set(ethane.particles())
+        assert list(methane.rigid_particles()) == []
+
+        hydrogen = list(methane.particles_by_name('H'))[0]
+        hydrogen.rigid_id = 3
+        assert box.max_rigid_id == 3
+        assert ethane.max_rigid_id == 0
+        assert list(box.rigid_particles(3)) == [hydrogen]
+        box.remove(methane)
+        assert box.max_rigid_id == 0
+        assert list(box.rigid_particles(3)) == []
+
+    def test_index_hierarchy_order(self):
+        def names(compound, name):
+            return [particle for particle in compound.particles()
+                    if particle.name == name]
+
+        a0, a1, b0 = (mb.Compound(name='A'), mb.Compound(name='A'),
+                      mb.Compound(name='B'))
+        first, second = mb.Compound(), mb.Compound()
+        first.add(a0)
+        second.add(b0)
+        box = mb.Compound([first, second])
+        assert list(box.particles_by_name('A')) == [a0]
+        first.add(a1)
+        assert list(box.particles_by_name('A')) == [a0, a1]
+        b0.name = 'A'
+        a0.name = 'B'
+        assert list(box.particles_by_name('A')) == [a1, b0]
+        first.add(mb.Compound(name='A'))
+        second._bulk_add([mb.Compound(name='A')])
+        first._bulk_add([mb.Compound(name='A')])
+        assert list(box.particles_by_name('A')) == names(box, 'A')
+
+        b0.rigid_id = 0
+        a0.rigid_id = 1
+        a1.rigid_id = 0
+        assert list(box.rigid_particles()) == [a0, a1, b0]
+        assert list(box.rigid_particles(0)) == [a1, b0]
+
     def test_particles_in_range(self, ethane):
         group = ethane.particles_in_range(ethane[0], 0.141)
         assert sum([1 for x in group if x.name == 'H']) == 3
@@ -352,6 +484,23 @@ class TestCompound(BaseTest):
         for part in ethane.children:
             assert isinstance(part, mb.Port)
 
+    def test_remove_many_labeled_particles(self):
+        compound = mb.Compound()
+        particles = [mb.Compound(name='C', pos=[i, 0, 0]) for i in range(20)]
+        for particle in particles:
+            compound.add(particle, 'C[$]')
+        compound.add(particles[4], 'special', containment=False)
+        for p1, p2 in zip(particles[:-1], particles[1:]):
+            compound.add_bond((p1, p2))
+
+        compound.remove(particles[::2])
+
+        assert compound.n_particles == 10
+        assert 'special' not in compound.labels
+        assert 'C[2]' not in compound.labels
+        assert compound.labels['C[1]'] is particles[1]
+        assert compound.n_bonds == 0
+
     def test_remove_subcompound(self, ethane):
         methyl = ethane.children[0]
         ethane.remove(methyl)
@@ -439,6 +588,28 @@ class TestCompound(BaseTest):
         assert len(list(parent.ancestors())) == 0
         assert next(parent.particles_by_name('A')) == part
 
+    def test_root_and_is_ancestor(self, ethane):
+        box = mb.Compound()
+        box.add(ethane)
+        methyl = ethane.children[0]
+        hydrogen = methyl.children[1]
+        assert hydrogen.root is box
+        assert box.is_ancestor(hydrogen)
+        assert methyl.is_ancestor(hydrogen)
+        assert not hydrogen.is_ancestor(methyl)
+        assert not hydrogen.is_ancestor(hydrogen)
+        assert not ethane.children[1].is_ancestor(hydrogen)
+
+        clone = mb.clone(box)
+        assert all(particle.root is clone for particle in clone.particles())
+        assert not box.is_ancestor(list(clone.particles())[0])
+
+        box.remove(methyl)
+        assert methyl.root is methyl
+        assert hydrogen.root is hydrogen
+        assert not box.is_ancestor(methyl)
+        assert not box.is_ancestor(hydrogen)
+
     @pytest.mark.skipif(not has_openbabel, reason="Open Babel package not installed")
     def test_reload(self):
         # Create a compound and write it to file.
@@ -470,6 +641,14 @@ class TestCompound(BaseTest):
         assert np.allclose(ethane.xyz, ethane_clone.xyz, atol=1e-3)
         assert np.allclose(ethane.xyz, new_file.xyz)
 
+    @pytest.mark.parametrize('extension', [('.xyz'), ('.pdb')])
+    def test_update_coordinates_wrong_n_atoms(self, ethane, methane,
+                                              extension):
+        fn = 'methane' + extension
+        methane.save(fn)
+        with pytest.raises(ValueError):
+            ethane.update_coordinates(fn)
+
     def test_update_coordinates_no_hierarchy(self):
         mycomp = mb.Compound()
         myclone = mb.clone(mycomp)
@@ -763,6 +942,17 @@ class TestCompound(BaseTest):
         assert np.array_equal(distances, updated_distances)
         assert np.array_equal(orientations, updated_orientations)
 
+    def test_update_port_locations_many_ports(self, ch2):
+        chain = mb.Compound([mb.clone(ch2) for _ in range(10)])
+        offsets = [port.xyz_with_ports - port.anchor.pos
+                   for port in chain.all_ports()]
+        xyz_init = chain.xyz
+        chain.xyz = xyz_init + np.random.rand(*xyz_init.shape)
+        chain._update_port_locations(xyz_init)
+        updated_offsets = [port.xyz_with_ports - port.anchor.pos
+                           for port in chain.all_ports()]
+        assert np.allclose(offsets, updated_offsets)
+
     def test_charge(self, ch2, ch3):
         compound = mb.Compound(charge=2.0)
         assert compound.charge == 2.0
@@ -850,6 +1040,84 @@ class TestCompound(BaseTest):
     def test_energy_minimize_openmm_xml(self, octane):
         octane.energy_minimize(forcefield=get_fn('small_oplsaa.xml'))
 
+    @pytest.mark.skipif(not has_openbabel, reason="Open Babel package not installed")
+    def test_energy_minimize_no_files(self, octane, monkeypatch):
+        import tempfile
+
+        def _mkdtemp(*args, **kwargs):
+            raise AssertionError('energy_minimize should not create files')
+        monkeypatch.setattr(tempfile, 'mkdtemp', _mkdtemp)
+        xyz = octane.xyz
+        octane.energy_minimize()
+        assert octane.xyz.shape == xyz.shape
+        assert not np.allclose(octane.xyz, xyz)
+
+    @pytest.mark.skipif(not has_foyer, reason="Foyer is not installed")
+    def test_energy_minimize_openmm_reuse(self, octane):
+        from mbuild.compound import _openmm_simulations
+        _openmm_simulations.clear()
+        octane_copy = mb.clone(octane)
+        octane.energy_minimize(forcefield='oplsaa')
+        simulation = list(_openmm_simulations.values())
+        octane_copy.energy_minimize(forcefield='oplsaa')
+        assert list(_openmm_simulations.values()) == simulation
+        assert np.allclose(octane.xyz, octane_copy.xyz, atol=1e-2)
+
+    @pytest.mark.skipif(not has_openbabel, reason="Open Babel not installed")
+    @pytest.mark.parametrize('n_processes', [1, 2])
+    def test_energy_minimize_many(self, ethane, ch3, n_processes):
+        compounds = [ethane, ch3, mb.clone(ethane)]
+        initial = [compound.xyz for compound in compounds]
+        port_offset = ch3['up'].pos - ch3[0].pos
+        mb.energy_minimize_many(compounds, n_processes=n_processes)
+        for compound, xyz in zip(compounds, initial):
+            assert compound.xyz.shape == xyz.shape
+            assert not np.allclose(compound.xyz, xyz)
+        assert np.allclose(ch3['up'].pos - ch3[0].pos, port_offset, atol=0.05)
+
+    def test_topology_key(self, ethane, methane):
+        assert ethane._topology_key() == mb.clone(ethane)._topology_key()
+        assert ethane._topology_key() != methane._topology_key()
+
+    def test_relax_overlaps(self, ethane):
+        from scipy.spatial.distance import cdist
+        ethane_copy = mb.clone(ethane)
+        ethane_copy.translate([0.1, 0.05, 0])
+        compound = mb.Compound(subcompounds=[ethane, ethane_copy])
+        bonds = [np.linalg.norm(p1.pos - p2.pos) for p1, p2 in compound.bonds()]
+        n_steps = compound.relax_overlaps(r_min=0.2)
+        assert 0 < n_steps < 1000
+        assert cdist(ethane.xyz, ethane_copy.xyz).min() > 0.2 - 1e-3
+        new_bonds = [np.linalg.norm(p1.pos - p2.pos)
+                     for p1, p2 in compound.bonds()]
+        assert np.allclose(bonds, new_bonds, atol=1e-2)
+        for port in ethane.all_ports():
+            assert np.allclose(port.anchor.pos, port.pos, atol=0.2)
+
+    def test_relax_overlaps_periodic(self):
+        compound = mb.Compound(periodicity=[2, 0, 0])
+        compound.add(mb.Compound(name='A', pos=[0.02, 0, 0]))
+        compound.add(mb.Compound(name='A', pos=[1.98, 0, 0]))
+        compound.add(mb.Compound(name='A', pos=[1, 0, 0]))
+        compound.add(mb.Compound(name='A', pos=[1, 0, 0]))
+        compound.relax_overlaps(r_min=0.2, tolerance=1e-6)
+        xyz = compound.xyz
+        dx = (xyz[1, 0] - xyz[0, 0]) % 2
+        assert 0.2 - 1e-4 < min(dx, 2 - dx) < 0.3
+        assert 0.2 - 1e-4 < np.linalg.norm(xyz[2] - xyz[3]) < 0.3
+        assert np.allclose(xyz[:2, 1:], 0)
+
+    def test_relax_overlaps_below_origin(self):
+        from mbuild.relax import _neighbor_pairs
+        xyz = np.array([[-1e-17, 0.5, 0], [2.9, 0.5, 0], [1.5, 0.5, 0]])
+        pairs = _neighbor_pairs(xyz, 0.5, np.array([3.0, 2.0, 0.0]), set())
+        assert sorted(map(sorted, pairs.tolist())) == [[0, 1]]
+
+    def test_relax_overlaps_no_overlaps(self, ethane):
+        xyz = ethane.xyz
+        assert ethane.relax_overlaps(r_min=0.05) == 0
+        assert np.allclose(ethane.xyz, xyz)
+
     def test_clone_outside_containment(self, ch2, ch3):
         compound = mb.Compound()
         compound.add(ch2)
@@ -999,6 +1267,59 @@ class TestCompound(BaseTest):
         assert comp.children[0].name == 'pro'
         assert comp.children[1].name == 'but'
 
+    def test_from_trajectory_labels_and_bonds(self, ethane):
+        traj = ethane.to_trajectory()
+        comp = mb.Compound()
+        comp.from_trajectory(traj)
+        res = comp.children[0]
+        assert len(res['C']) == 2
+        assert len(res['H']) == 6
+        assert res['H[5]'] is res['H'][5]
+        assert comp.n_bonds == traj.topology.n_bonds
+        assert np.allclose(comp.xyz, traj.xyz[-1])
+
+        flat = mb.Compound()
+        flat.from_trajectory(traj, infer_hierarchy=False)
+        assert len(flat.children) == 8
+        assert len(flat['C']) == 2
+        assert flat.n_bonds == traj.topology.n_bonds
+
+    def test_from_parmed_labels_and_bonds(self, ethane):
+        struc = ethane.to_parmed()
+        comp = mb.Compound()
+        comp.from_parmed(struc)
+        res = comp.children[0]
+        assert len(res['C']) == 2
+        assert len(res['H']) == 6
+        assert res.labels['H[5]'] is res['H'][5]
+        assert res in res['H[5]'].referrers
+        assert comp.n_bonds == len(struc.bonds)
+        assert np.allclose(comp.xyz, struc.coordinates / 10)
+
+        lazy = mb.Compound()
+        lazy.from_parmed(struc, lazy_labels=True)
+        res = lazy.children[0]
+        assert res['H[5]'] is res['H'][5]
+        assert 'H[5]' not in res.labels
+        assert not res['H[5]'].referrers
+
+    def test_load_labels(self, ch3):
+        assert 'H[0]' in ch3.labels
+        assert ch3 in ch3['H[0]'].referrers
+        with pytest.raises(MBuildError):
+            ch3.add(mb.Particle(name='H'), label='H[0]')
+        ch3.add(mb.Particle(name='H'), label='H[$]')
+        assert 'H[3]' in ch3.labels
+
+        ch3 = mb.load('ch3.pdb', relative_to_module='mbuild.lib.moieties.ch3',
+                      infer_hierarchy=False, lazy_labels=True)
+        assert 'H[0]' not in ch3.labels
+        assert ch3['H[0]'] is ch3['H'][0]
+        with pytest.raises(MBuildError):
+            ch3.add(mb.Particle(name='H'), label='H[0]')
+        ch3.add(mb.Particle(name='H'), label='H[$]')
+        assert ch3.labels['H[3]'] is ch3['H'][3]
+
     @pytest.mark.skipif(not has_networkx, reason="NetworkX is not installed")
     def test_to_networkx_names_only_with_same_names(self):
         comp = mb.Compound()
@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.lazy import LazyCompound
+from mbuild.utils.io import get_fn
+from mbuild.tests.base_test import BaseTest
+
+
+class TestLazy(BaseTest):
+
+    def test_load_npz(self, ethane):
+        ethane.save('ethane.npz')
+        lazy = mb.load('ethane.npz', lazy=True)
+        assert isinstance(lazy, LazyCompound)
+        assert lazy.n_particles == ethane.n_particles
+        assert np.allclose(lazy.xyz, ethane.xyz)
+        assert np.allclose(lazy.boundingbox.lengths,
+                           ethane.boundingbox.lengths)
+        assert np.allclose(lazy.center, ethane.center)
+        assert not lazy.materialized
+
+        assert lazy.n_bonds == ethane.n_bonds
+        assert lazy.materialized
+        assert len(lazy.children) == len(ethane.children)
+        assert lazy.name == ethane.name
+        assert np.allclose(lazy.xyz, ethane.xyz)
+
+    def test_memmap(self, ethane):
+        from mbuild.lazy import _memmap_npz_member
+        ethane.save('ethane.npz')
+        pos = _memmap_npz_member('ethane.npz', 'pos')
+        assert isinstance(pos, np.memmap)
+        with np.load('ethane.npz') as data:
+            assert np.allclose(pos, data['pos'])
+
+    def test_load_compressed_npz(self, ethane):
+        from mbuild.formats.npz import compound_to_npz
+        compound_to_npz(ethane, 'ethane.npz', compressed=True)
+        lazy = mb.load('ethane.npz', lazy=True)
+        assert np.allclose(lazy.xyz, ethane.xyz)
+
+    def test_load_xyz(self, ethane):
+        ethane.save('ethane.xyz')
+        lazy = mb.load('ethane.xyz', lazy=True)
+        assert lazy.n_particles == 8
+        assert np.allclose(lazy.xyz, ethane.xyz, atol=1e-6)
+        assert not lazy.materialized
+        assert set(p.name for p in lazy.particles()) == {'C', 'H'}
+        assert lazy.materialized
+
+    def test_load_mdtraj(self):
+        lazy = mb.load(get_fn('methyl.pdb'), lazy=True)
+        eager = mb.load(get_fn('methyl.pdb'))
+        assert lazy.n_particles == eager.n_particles
+        assert np.allclose(lazy.xyz, eager.xyz)
+        assert not lazy.materialized
+        assert lazy.n_bonds == eager.n_bonds
+
+    def test_set_xyz_materializes(self, ethane):
+        ethane.save('ethane.npz')
+        lazy = mb.load('ethane.npz', lazy=True)
+        lazy.xyz = ethane.xyz + 1
+        assert lazy.materialized
+        assert np.allclose(lazy.xyz, ethane.xyz + 1)
+
+    def test_clone(self, ethane):
+        ethane.save('ethane.npz')
+        lazy = mb.load('ethane.npz', lazy=True)
+        cloned = mb.clone(lazy)
+        assert cloned.n_particles == ethane.n_particles
+        assert cloned.n_bonds == ethane.n_bonds
+
+    def test_rigid(self, benzene):
+        benzene.save('benzene.npz')
+        lazy = mb.load('benzene.npz', lazy=True, rigid=True)
+        assert lazy.contains_rigid
+
+    def test_invalid_arguments(self, ethane):
+        ethane.save('ethane.npz')
+        with pytest.raises(ValueError):
+            mb.load('ethane.npz', lazy=True, coords_only=True)
+        with pytest.raises(ValueError):
+            mb.load('ethane.npz', lazy=True, compound=mb.Compound())
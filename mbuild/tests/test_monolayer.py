@@ -58,3 +58,22 @@ class TestMonolayer(BaseTest):
         n_b = round(n * m * 0.25)
         assert monolayer.n_particles == 1900 + n_a * 5 * 3 + n_b * 15 * 3 + (100 - (n_a + n_b))
         assert monolayer.n_bonds == 2400 + n_a * (5 * 2 + 4 + 1) + n_b * (15 * 2 + 14 + 1) + (100 - (n_a + n_b))
+
+    def test_mixed_monolayer_three_chains(self, ch2):
+        pattern = mb.Grid2DPattern(5, 5)
+        points = pattern.points.copy()
+        fractions = [0.4, 0.4, 0.2]
+
+        chain_a = mb.recipes.Polymer(ch2, n=2)
+        chain_b = mb.recipes.Polymer(ch2, n=4)
+        chain_c = mb.recipes.Polymer(ch2, n=1)
+        monolayer = mb.recipes.Monolayer(surface=Betacristobalite(),
+                                         chains=[chain_a, chain_b, chain_c],
+                                         fractions=fractions,
+                                         backfill=H(),
+                                         pattern=pattern)
+
+        n_a, n_b, n_c = 10, 10, 5
+        assert monolayer.n_particles == (1900 + n_a * 2 * 3 + n_b * 4 * 3 +
+                                         n_c * 3 + (100 - 25))
+        assert (pattern.points == points).all()
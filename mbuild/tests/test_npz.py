@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.exceptions import MBuildError
+from mbuild.formats.npz import compound_to_npz, compound_from_npz
+from mbuild.tests.base_test import BaseTest
+
+
+class TestNPZ(BaseTest):
+
+    def test_loop(self, ethane):
+        compound_to_npz(ethane, 'ethane.npz')
+        ethane_copy = compound_from_npz('ethane.npz')
+        assert ethane.n_particles == ethane_copy.n_particles
+        assert ethane.n_bonds == ethane_copy.n_bonds
+        assert len(ethane.children) == len(ethane_copy.children)
+        assert np.allclose(ethane.xyz, ethane_copy.xyz)
+        assert [p.name for p in ethane.particles()] == \
+               [p.name for p in ethane_copy.particles()]
+
+    def test_save_load(self, ethane):
+        ethane.save('ethane.npz')
+        ethane_copy = mb.load('ethane.npz')
+        assert ethane.n_particles == ethane_copy.n_particles
+        assert ethane.n_bonds == ethane_copy.n_bonds
+        with pytest.raises(IOError):
+            ethane.save('ethane.npz')
+        ethane.save('ethane.npz', overwrite=True)
+
+    def test_loop_with_ports(self, hexane):
+        compound_to_npz(hexane, 'hexane.npz', include_ports=True)
+        hexane_copy = compound_from_npz('hexane.npz')
+        assert hexane.n_particles == hexane_copy.n_particles
+        assert hexane.n_bonds == hexane_copy.n_bonds
+        assert len(hexane.all_ports()) == len(hexane_copy.all_ports())
+        assert hexane.labels.keys() == hexane_copy.labels.keys()
+        assert np.allclose(hexane.xyz_with_ports, hexane_copy.xyz_with_ports)
+        for port, port_copy in zip(hexane.all_ports(),
+                                   hexane_copy.all_ports()):
+            assert np.allclose(port.anchor.pos, port_copy.anchor.pos)
+
+    def test_labels(self):
+        from mbuild.lib.moieties import CH2, CH3
+        parent = mb.Compound(name='Hierarchy1')
+        for i in range(10):
+            parent.add(CH2())
+            parent.add(CH3())
+        parent.add(parent['CH2'][3], 'third_ch2', containment=False)
+        compound_to_npz(parent, 'parent.npz', include_ports=True)
+        parent_copy = compound_from_npz('parent.npz')
+        assert list(parent_copy.labels.keys()) == list(parent.labels.keys())
+        assert len(parent_copy['CH2']) == len(parent['CH2'])
+        assert parent_copy['third_ch2'] is parent_copy['CH2'][3]
+        for child, child_copy in zip(parent.successors(),
+                                     parent_copy.successors()):
+            assert child.labels.keys() == child_copy.labels.keys()
+
+    def test_rigid(self, benzene):
+        benzene.label_rigid_bodies()
+        compound_to_npz(benzene, 'benzene.npz')
+        benzene_copy = compound_from_npz('benzene.npz')
+        assert benzene_copy.contains_rigid
+        assert benzene_copy.max_rigid_id == 0
+
+    def test_invalid_file(self):
+        np.savez('invalid.npz', pos=np.zeros((1, 3)))
+        with pytest.raises(MBuildError):
+            compound_from_npz('invalid.npz')
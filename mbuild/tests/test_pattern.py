@@ -27,6 +27,37 @@ class TestPattern(BaseTest):
             for pos2 in chain_positions[i+1:]:
                 assert betacristobalite.min_periodic_distance(pos, pos2) < 1.5
 
+    def test_apply_to_compound_unique_ports(self, betacristobalite, propyl):
+        pattern = mb.Random2DPattern(100, seed=12)
+        chains, _ = pattern.apply_to_compound(guest=propyl,
+                                              host=betacristobalite)
+        assert len(chains) == 100
+        assert not betacristobalite.available_ports()
+
+    def test_assign_closest(self):
+        from mbuild.pattern import _assign_closest
+        np.random.seed(12)
+        periodicity = np.array([3.0, 2.0, 0.0])
+        positions = np.random.random((60, 3)) * [3.0, 2.0, 0.5]
+        points = np.random.random((50, 3)) * [3.0, 2.0, 0.0]
+        host = mb.Compound(periodicity=periodicity)
+        remaining = positions.copy()
+        expected = []
+        for point in points:
+            idx = np.argmin(host.min_periodic_distance(point, remaining))
+            expected.append(idx)
+            remaining[idx] = np.inf
+        assigned = _assign_closest(points, positions, periodicity)
+        assert np.array_equal(assigned, expected)
+
+    def test_assign_closest_below_origin(self):
+        from mbuild.pattern import _assign_closest
+        periodicity = np.array([3.0, 2.0, 0.0])
+        positions = np.array([[-1e-17, 0.5, 0.0], [1.5, 0.5, 0.0]])
+        points = np.array([[2.9, 0.5, 0.0], [1.4, 0.5, 0.0]])
+        assigned = _assign_closest(points, positions, periodicity)
+        assert list(assigned) == [0, 1]
+
     def test_random_2d(self):
         pattern = mb.Random2DPattern(100)
         assert len(pattern) == 100
@@ -81,3 +81,31 @@ class TestPattern(BaseTest):
                                port2['down'].xyz_with_ports)
             assert np.allclose(port1['down'].xyz_with_ports,
                                port2['up'].xyz_with_ports)
+
+    def test_from_anchors(self, ethane):
+        anchors = list(ethane.particles())
+        np.random.seed(12)
+        orientations = np.random.random((len(anchors), 3)) - 0.5
+        separations = np.random.random(len(anchors))
+        ports = mb.Port.from_anchors(anchors, orientations, separations)
+        assert len(ports) == len(anchors)
+        for port, anchor, vector, sep in zip(ports, anchors, orientations,
+                                             separations):
+            single = mb.Port(anchor=anchor, orientation=vector,
+                             separation=sep)
+            assert port.anchor is anchor
+            assert port['up'].labels.keys() == single['up'].labels.keys()
+            assert np.allclose(port.xyz_with_ports, single.xyz_with_ports)
+
+    def test_from_anchors_shared_orientation(self, ethane):
+        anchors = list(ethane.particles())
+        ports = mb.Port.from_anchors(anchors, orientation=[0, 0, -1],
+                                     separation=0.1)
+        for port, anchor in zip(ports, anchors):
+            single = mb.Port(anchor=anchor, orientation=[0, 0, -1],
+                             separation=0.1)
+            assert np.allclose(port.xyz_with_ports, single.xyz_with_ports)
+
+    def test_zero_orientation(self):
+        with pytest.raises(ValueError):
+            mb.Port(orientation=[0, 0, 0])
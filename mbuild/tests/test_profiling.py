@@ -0,0 +1,76 @@
+import pytest
+
+import mbuild as mb
+from mbuild import profiling
+from mbuild.tests.base_test import BaseTest
+
+
+class TestProfiling(BaseTest):
+    @pytest.fixture(autouse=True)
+    def clean_profiling(self):
+        profiling.reset()
+        yield
+        profiling.disable()
+        profiling.reset()
+
+    def test_disabled(self, ethane):
+        assert not profiling.is_enabled()
+        with profiling.phase('build'):
+            mb.clone(ethane)
+        assert not profiling.stats()
+
+    def test_calls(self, ethane):
+        profiling.enable()
+        container = mb.Compound()
+        container.add([mb.clone(ethane) for _ in range(3)])
+        stats = profiling.stats()
+        assert stats[('', 'clone')].calls == 3
+        assert stats[('', 'Compound.add')].calls >= 1
+        assert stats[('', 'clone')].time > 0
+
+    def test_phases(self, ethane):
+        profiling.enable()
+        with profiling.phase('build'):
+            mb.clone(ethane)
+            with profiling.phase('convert'):
+                ethane.to_parmed()
+        ethane.save('ethane.mol2')
+        stats = profiling.stats()
+        assert stats[('build', 'clone')].calls == 1
+        assert stats[('build/convert', 'Compound.to_parmed')].calls == 1
+        assert stats[('build', '[convert]')].calls == 1
+        assert stats[('', '[build]')].calls == 1
+        assert stats[('', 'Compound.save')].calls == 1
+        assert stats[('', 'Compound.to_parmed')].calls == 1
+        report = profiling.report()
+        assert 'phase: build/convert' in report
+        assert 'Compound.to_parmed' in report
+
+    def test_writers(self, ethane):
+        profiling.enable()
+        ethane.save('ethane.xyz')
+        ethane.save('ethane.hoomdxml')
+        stats = profiling.stats()
+        assert stats[('', 'write_xyz')].calls == 1
+        assert stats[('', 'write_hoomdxml')].calls == 1
+
+    def test_memory(self):
+        profiling.enable(memory=True)
+        container = mb.Compound()
+        container.add([mb.Compound(name='C') for _ in range(100)])
+        assert profiling.stats()[('', 'Compound.add')].allocated > 0
+
+    def test_nested_calls_timed_once(self):
+        calls = []
+
+        @profiling.profiled('recurse')
+        def recurse(n):
+            calls.append(n)
+            if n:
+                recurse(n - 1)
+
+        profiling.enable()
+        recurse(3)
+        entry = profiling.stats()[('', 'recurse')]
+        assert entry.calls == 4
+        assert len(calls) == 4
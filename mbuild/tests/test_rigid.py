@@ -440,6 +440,16 @@ class TestRigid(BaseTest):
         assert filled.max_rigid_id == n_benzenes - 3
         assert len(list(filled.rigid_particles())) == (n_benzenes - 2) * rigid_benzene.n_particles
 
+    def test_delete_body_multiple_gaps(self, benzene):
+        n_benzenes = 6
+        compound = mb.Compound([mb.clone(benzene) for _ in range(n_benzenes)])
+        compound.label_rigid_bodies(discrete_bodies='Benzene')
+        compound.remove([compound.children[1], compound.children[3]])
+
+        assert compound.max_rigid_id == n_benzenes - 3
+        for rigid_id, child in enumerate(compound.children):
+            assert set(p.rigid_id for p in child.particles()) == {rigid_id}
+
     def test_delete_body_all(self, rigid_benzene):
         n_benzenes = 10
         filled = mb.fill_box(rigid_benzene,
@@ -50,3 +50,12 @@ class TestSilicaInterface(BaseTest):
 
         assert np.array_equal(atom_names1, atom_names2)
         assert np.array_equal(interface1.xyz, interface2.xyz)
+
+    def test_seeded_output(self):
+        # The values were obtained before the candidate bridges were found
+        # with a neighbor search, which must not change the random draws.
+        interface = SilicaInterface(bulk_silica=AmorphousSilicaBulk(),
+                                    thickness=1.2, seed=12345)
+        assert interface.n_particles == 2105
+        assert len(interface.referenced_ports()) == 125
+        assert np.isclose(interface.xyz.sum(), 12409.4983, atol=1e-4)
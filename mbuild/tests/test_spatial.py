@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+import mbuild as mb
+from mbuild.exceptions import MBuildError
+from mbuild.tests.base_test import BaseTest
+
+
+class TestSpatialIndex(BaseTest):
+
+    @pytest.fixture
+    def grid(self):
+        grid = mb.Compound(periodicity=[4, 4, 0])
+        for x in range(4):
+            for y in range(4):
+                for z in range(4):
+                    grid.add(mb.Compound(name='C', pos=[x, y, z]))
+        return grid
+
+    def brute_force_within(self, compound, center, r):
+        d = compound.xyz - center
+        d[:, :2] -= 4 * np.round(d[:, :2] / 4)
+        return np.flatnonzero(np.linalg.norm(d, axis=1) <= r)
+
+    def test_index_is_kept(self, grid):
+        index = grid.spatial_index()
+        assert grid.spatial_index() is index
+        assert list(index.particles) == list(grid.particles())
+        assert mb.clone(grid)._spatial_index is None
+
+    def test_within(self, grid):
+        index = grid.spatial_index()
+        for center in [[0, 0, 0], [3.5, 0.2, 1], [1, 1, 7]]:
+            assert np.array_equal(index.within(center, 1.1),
+                                  self.brute_force_within(grid, center, 1.1))
+        particles = index.within([0, 0, 0], 0.5, return_particles=True)
+        assert particles == [grid.children[0]]
+
+    def test_within_of(self, grid):
+        index = grid.spatial_index()
+        selection = [grid.children[0], grid.children[63]]
+        expected = np.union1d(
+            self.brute_force_within(grid, selection[0].pos, 1.0),
+            self.brute_force_within(grid, selection[1].pos, 1.0))
+        assert np.array_equal(index.within_of(selection, 1.0), expected)
+        assert np.array_equal(index.within_of([0, 63], 1.0), expected)
+        with pytest.raises(MBuildError):
+            index.within_of([mb.Compound()], 1.0)
+
+    def test_slab_and_box(self, grid):
+        index = grid.spatial_index()
+        # Periodic in x, such that the slab wraps around the box.
+        slab = index.slab('x', 2.5, 4.5)
+        assert np.array_equal(slab, np.flatnonzero(
+            np.isin(grid.xyz[:, 0], [0, 3])))
+        assert len(index.slab(2, 2.5, 4.5)) == 16
+        box = index.box([-0.5, -0.5, -0.5], [0.5, 0.5, 3.5],
+                        return_particles=True)
+        assert box == list(grid.children)[:4]
+
+    def test_nearest(self, grid):
+        index = grid.spatial_index()
+        nearest = index.nearest([3.9, 0, 0.1], k=2)
+        assert list(nearest) == [0, 48]
+        assert len(index.nearest([0, 0, 0], k=100)) == 64
+
+    def test_update_moved_particles(self, grid):
+        index = grid.spatial_index()
+        tree = index._tree
+        moved = grid.children[5]
+        moved.pos = np.array([10.0, 10.0, 10.0])
+        assert grid.spatial_index()._tree is tree
+        center = [2.0, 2.0, 10.0]
+        assert np.array_equal(index.within(center, 1.5),
+                              self.brute_force_within(grid, center, 1.5))
+        assert index.nearest(center)[0] == 5
+        assert 5 in index.within_of([5], 0.1)
+        assert 5 not in index.within([1, 1, 1], 1.0)
+
+        grid.translate([0.1, 0, 0])
+        assert grid.spatial_index()._tree is not tree
+
+    def test_update_removed_particles(self, grid):
+        index = grid.spatial_index()
+        grid.remove(grid.children[0])
+        assert len(grid.spatial_index().particles) == 63
+        assert len(index.within([0, 0, 0], 0.5)) == 0
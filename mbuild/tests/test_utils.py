@@ -5,10 +5,10 @@ import pytest
 
 import mbuild as mb
 from mbuild.tests.base_test import BaseTest
-from mbuild.utils.io import get_fn, import_
+from mbuild.utils.io import get_fn, import_, has_foyer
 from mbuild.utils.validation import assert_port_exists
 from mbuild.utils.jsutils import overwrite_nglview_default
-from mbuild.utils.geometry import wrap_coords
+from mbuild.utils.geometry import wrap_coords, wrap_periodic
 
 
 class TestUtils(BaseTest):
@@ -42,6 +42,46 @@ class TestUtils(BaseTest):
         with pytest.raises(ImportError):
             import_('garbagepackagename')
 
+    def test_lazy_imports(self):
+        import subprocess
+        import sys
+        code = ('import sys, mbuild; print(" ".join(m for m in ('
+                '"mdtraj", "parmed", "networkx", "foyer", "gsd", "openbabel", '
+                '"mbuild.formats.lammpsdata", "mbuild.lattice") '
+                'if m in sys.modules))')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        assert output.split() == []
+        assert mb.Lattice is mb.lattice.Lattice
+        assert 'fill_box' in dir(mb)
+        assert {'coarse_graining', 'lattice', 'lib', 'packing'} <= set(dir(mb))
+        from mbuild.lib.recipes import Polymer
+        from mbuild.packing import fill_box
+        code = ('import mbuild as mb; '
+                'print(mb.lib.recipes.Polymer.__name__, '
+                'mb.packing.fill_box.__name__, '
+                'mb.coarse_graining.coarse_grain.__name__)')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        assert output.split() == ['Polymer', 'fill_box', 'coarse_grain']
+        assert mb.lib.recipes.Polymer is Polymer
+        assert mb.packing.fill_box is fill_box
+
+    def test_eager_imports_without_module_getattr(self):
+        import subprocess
+        import sys
+        # Python < 3.7 has no module __getattr__, so the lazily imported
+        # names must be bound when mbuild is imported.
+        code = ('import sys; sys.version_info = (3, 6, 0); '
+                'import mbuild; print(" ".join(name for name in ('
+                '"fill_box", "solvate", "Lattice", "recipes", "coarse_grain", '
+                '"packing", "lattice", "coarse_graining", "lib") '
+                'if name not in vars(mbuild)), '
+                '"Polymer" in vars(vars(mbuild.lib)["recipes"]))')
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         universal_newlines=True)
+        assert output.split() == ['True']
+
     def test_js_utils(self):
         nglview = import_('nglview')
         with pytest.raises(TypeError):
@@ -124,6 +164,145 @@ class TestUtils(BaseTest):
         assert (new_xyz[1,:] == xyz[1,:]).all()
         assert (new_xyz[0,:] == np.array([1,1,1])).all()
 
+    def test_wrap_periodic(self):
+        from scipy.spatial import cKDTree
+        # Just below the origin, np.mod rounds onto the box length.
+        xyz = np.array([[-1e-17, 0.5, 0.0],
+                        [2.9, 0.5, -4.0]])
+        periodicity = np.array([3.0, 2.0, 0.0])
+        wrapped = wrap_periodic(xyz, periodicity)
+        assert np.array_equal(wrapped[0], [0.0, 0.5, 0.0])
+        assert np.allclose(wrapped[1], [2.9, 0.5, -4.0])
+        tree = cKDTree(wrapped, boxsize=periodicity)
+        distance, _ = tree.query(wrapped[0], k=2)
+        assert np.isclose(distance[1], np.sqrt(0.1**2 + 4.0**2))
+        assert wrap_periodic(xyz, [0, 0, 0]) is xyz
+
+    @staticmethod
+    def _permuted(structure, order):
+        """Copy a parmed.Structure with its atoms in the given order """
+        from copy import copy
+        from parmed import Structure
+        from parmed.topologyobjects import Bond
+        permuted = Structure()
+        for i in order:
+            atom = structure.atoms[i]
+            permuted.add_atom(copy(atom), atom.residue.name,
+                              atom.residue.number)
+        new_idx = {old: new for new, old in enumerate(order)}
+        for bond in structure.bonds:
+            permuted.bonds.append(Bond(permuted.atoms[new_idx[bond.atom1.idx]],
+                                       permuted.atoms[new_idx[bond.atom2.idx]]))
+        permuted.box = copy(structure.box)
+        return permuted
+
+    def test_molecule_groups(self, ethane, methane):
+        from mbuild.utils.forcefields import _molecule_groups
+        compound = mb.Compound([mb.clone(ethane), mb.clone(ethane),
+                                mb.clone(methane), mb.clone(ethane)])
+        groups = _molecule_groups(compound.to_parmed())
+        assert [indices.tolist() for indices in groups.values()] == \
+               [[list(range(0, 8)), list(range(8, 16)), list(range(21, 29))],
+                [list(range(16, 21))]]
+
+        # Interleaved molecules listing their atoms in any order
+        structure = compound.to_parmed()
+        order = np.random.RandomState(0).permutation(29).tolist()
+        permuted = self._permuted(structure, order)
+        permuted_groups = _molecule_groups(permuted)
+        assert sorted(indices.shape for indices in permuted_groups.values()) \
+            == [(1, 5), (3, 8)]
+        for indices in permuted_groups.values():
+            # Atoms in the same column are equivalent.
+            names = []
+            bonds = []
+            for molecule in indices.tolist():
+                position = {atom: i for i, atom in enumerate(molecule)}
+                names.append([permuted.atoms[i].name for i in molecule])
+                bonds.append(set(frozenset((position[bond.atom1.idx],
+                                            position[bond.atom2.idx]))
+                                 for bond in permuted.bonds
+                                 if bond.atom1.idx in position))
+            assert all(molecule_names == names[0] for molecule_names in names)
+            assert all(molecule_bonds == bonds[0] for molecule_bonds in bonds)
+
+    def test_molecule_groups_not_contiguous(self, ethane):
+        from mbuild.utils.forcefields import _molecule_groups
+        compound = mb.Compound([mb.clone(ethane), mb.clone(ethane)])
+        particles = list(compound.particles())
+        compound.remove_bond((particles[0], particles[1]))
+        compound.add_bond((particles[0], particles[8]))
+        # A hydrogen and a molecule spanning both ethanes
+        groups = _molecule_groups(compound.to_parmed())
+        assert [indices.tolist() for indices in groups.values()] == \
+               [[[0] + list(range(2, 16))], [[1]]]
+
+    def test_term_parameters(self, ethane):
+        from parmed.topologyobjects import BondType
+        from mbuild.utils.forcefields import term_parameters
+        structure = ethane.to_parmed()
+        bond_type = BondType(300.0, 1.1)
+        structure.bond_types.append(bond_type)
+        for bond in structure.bonds:
+            bond.type = bond_type
+        structure = structure * 10
+        calls = []
+
+        def parameters(bond):
+            calls.append(bond)
+            return (tuple(sorted((bond.atom1.name, bond.atom2.name))),
+                    bond.type.req)
+
+        result = term_parameters(structure.bonds, parameters,
+                                 ('atom1', 'atom2'))
+        # Untyped atoms are keyed by name, in the order of the bond.
+        assert len(result) == len(structure.bonds)
+        assert len(calls) == len(set((bond.atom1.name, bond.atom2.name)
+                                     for bond in structure.bonds))
+        assert result == [parameters(bond) for bond in structure.bonds]
+
+    @pytest.mark.skipif(not has_foyer, reason="Foyer is not installed")
+    @pytest.mark.parametrize('permute', [False, True])
+    def test_apply_forcefield(self, ethane, methane, permute):
+        from mbuild.utils.forcefields import apply_forcefield, get_forcefield
+        compound = mb.Compound([mb.clone(ethane), mb.clone(ethane),
+                                mb.clone(methane), mb.clone(ethane)])
+        structure = compound.to_parmed()
+        if permute:
+            order = np.random.RandomState(0).permutation(29).tolist()
+            structure = self._permuted(structure, order)
+        typed = apply_forcefield(structure, name='oplsaa')
+        reference = get_forcefield(name='oplsaa').apply(structure)
+        assert get_forcefield(name='oplsaa') is get_forcefield(name='oplsaa')
+        assert [atom.type for atom in typed.atoms] == \
+               [atom.type for atom in reference.atoms]
+        assert [atom.charge for atom in typed.atoms] == \
+               [atom.charge for atom in reference.atoms]
+        assert [atom.residue.name for atom in typed.atoms] == \
+               [atom.residue.name for atom in reference.atoms]
+        for attr in ['bonds', 'angles', 'rb_torsions', 'residues']:
+            assert len(getattr(typed, attr)) == len(getattr(reference, attr))
+        assert np.allclose(typed.coordinates, reference.coordinates)
+        assert np.allclose(typed.box, reference.box)
+        assert typed.title == reference.title
+        assert typed.combining_rule == reference.combining_rule
+        if hasattr(reference, 'defaults'):
+            assert typed.defaults == reference.defaults
+
+        def parameters(structure, attr):
+            terms = dict()
+            for term in getattr(structure, attr):
+                idxs = tuple(atom.idx for atom in
+                             (term.atom1, term.atom2,
+                              getattr(term, 'atom3', None),
+                              getattr(term, 'atom4', None))
+                             if atom is not None)
+                terms[min(idxs, idxs[::-1])] = term.type
+            return terms
+
+        for attr in ['bonds', 'angles', 'rb_torsions']:
+            assert parameters(typed, attr) == parameters(reference, attr)
+
     def test_coord_wrap_box(self):
         xyz = np.array([[3, 3, 1],
                         [1, 1, 0]])
@@ -2,7 +2,7 @@ import numpy as np
 import pytest
 
 import mbuild as mb
-from mbuild.formats.xyz import write_xyz
+from mbuild.formats.xyz import read_xyz_frames, write_xyz
 from mbuild.utils.io import get_fn
 from mbuild.tests.base_test import BaseTest
 from mbuild.exceptions import MBuildError
@@ -38,3 +38,28 @@ class TestXYZ(BaseTest):
         ethane.save(filename='ethane.xyz')
         ethane_in = mb.load('ethane.xyz')
         assert np.allclose(ethane.xyz, ethane_in.xyz)
+
+    def test_extra_columns(self):
+        with open('extra.xyz', 'w') as f:
+            f.write('2\ncomment\nC 0.0 1.0 2.0 0.5\nH 1.0 1.0 1.0 -0.5\n')
+        cmpd = mb.load('extra.xyz')
+        assert [p.name for p in cmpd.particles()] == ['C', 'H']
+        assert np.allclose(cmpd.xyz, [[0.0, 0.1, 0.2], [0.1, 0.1, 0.1]])
+
+    def test_blank_line(self):
+        with open('blank.xyz', 'w') as f:
+            f.write('3\ncomment\nC 0.0 1.0 2.0\n\nH 1.0 1.0 1.0\n')
+        with pytest.raises(MBuildError):
+            mb.load('blank.xyz')
+
+    def test_read_frames(self, ethane):
+        ethane.save(filename='ethane.xyz')
+        with open('ethane.xyz') as f:
+            frame = f.read()
+        with open('traj.xyz', 'w') as f:
+            f.write(frame * 3)
+        frames = list(read_xyz_frames('traj.xyz'))
+        assert len(frames) == 3
+        for coords in frames:
+            assert coords.shape == (8, 3)
+            assert np.allclose(coords, ethane.xyz, atol=1e-6)
@@ -0,0 +1,356 @@
+from collections import Counter, OrderedDict
+from copy import copy
+
+import numpy as np
+
+from mbuild.utils.io import import_
+
+__all__ = ['get_forcefield', 'apply_forcefield', 'term_parameters']
+
+# Forcefields and typed molecules, with the most recently used last.
+_forcefields = OrderedDict()
+_FORCEFIELD_CACHE_SIZE = 8
+_typed_molecules = OrderedDict()
+_TYPED_MOLECULE_CACHE_SIZE = 64
+
+# Beyond this many distinct molecules, typing them one by one is slower than
+# typing the whole structure at once.
+_MAX_MOLECULE_GROUPS = 100
+
+
+def get_forcefield(forcefield_files=None, name=None, debug=False):
+    """Load a foyer Forcefield, reusing recently loaded Forcefields
+
+    Parameters
+    ----------
+    forcefield_files : str or list of str, optional, default=None
+        Forcefield files to load
+    name : str, optional, default=None
+        Name of a forcefield distributed with foyer, e.g. 'oplsaa'
+    debug : bool, optional, default=False
+        Choose level of verbosity when loading the forcefield
+
+    Returns
+    -------
+    foyer.Forcefield
+
+    """
+    key = _forcefield_key(forcefield_files, name, debug)
+    ff = _forcefields.pop(key, None)
+    if ff is None:
+        foyer = import_('foyer')
+        ff = foyer.Forcefield(forcefield_files=forcefield_files, name=name,
+                              debug=debug)
+    _forcefields[key] = ff
+    while len(_forcefields) > _FORCEFIELD_CACHE_SIZE:
+        _forcefields.popitem(last=False)
+    return ff
+
+
+def apply_forcefield(structure, forcefield_files=None, name=None,
+                     debug=False, **foyer_kwargs):
+    """Apply a foyer Forcefield, typing each unique molecule only once
+
+    The structure is split into molecules, i.e. connected components of its
+    bond graph. Molecules with the same atom names, residue names and bonds
+    share a topology key, regardless of the order of their atoms or where
+    they are in the structure. One molecule per key is atomtyped and
+    parametrized by foyer, and the result is replicated for all other
+    molecules with the same key and scattered back to their atoms. Typed
+    molecules are also reused by later calls with the same forcefield and
+    arguments, so that typing a box of many identical molecules costs about
+    as much as typing one.
+
+    Parameters
+    ----------
+    structure : parmed.Structure
+        The structure to parametrize
+    forcefield_files : str or list of str, optional, default=None
+        Forcefield files to load
+    name : str, optional, default=None
+        Name of a forcefield distributed with foyer, e.g. 'oplsaa'
+    debug : bool, optional, default=False
+        Choose level of verbosity when loading the forcefield
+    **foyer_kwargs : keyword arguments
+        Passed on to `foyer.Forcefield.apply`
+
+    Returns
+    -------
+    parmed.Structure
+        The parametrized structure, with the atoms in the same order as
+        `structure`
+
+    Notes
+    -----
+    If the structure has many distinct molecules, or a references file is
+    requested, the whole structure is passed to foyer at once. The residues
+    of the returned structure are those of `structure`.
+
+    """
+    ff = get_forcefield(forcefield_files, name, debug)
+    groups = _molecule_groups(structure)
+    if (not groups or len(groups) > _MAX_MOLECULE_GROUPS
+            or foyer_kwargs.get('references_file')):
+        return ff.apply(structure, **foyer_kwargs)
+
+    ff_key = (_forcefield_key(forcefield_files, name, debug),
+              tuple(sorted(foyer_kwargs.items(), key=lambda kv: kv[0])))
+    typed = None
+    # The atom of `structure` for each atom of `typed`
+    source = np.empty(len(structure.atoms), dtype=np.int64)
+    for key, molecules in groups.items():
+        molecule, positions = _typed_molecule(ff, ff_key, key, structure,
+                                              molecules[0], foyer_kwargs)
+        n_molecule_atoms = len(positions)
+        offset = 0 if typed is None else len(typed.atoms)
+        if typed is None:
+            typed = molecule * len(molecules)
+            template = molecule
+        else:
+            typed += molecule * len(molecules)
+        # Atom positions[i] of the k-th copy is atom molecules[k][i]
+        copies = n_molecule_atoms * np.arange(len(molecules))
+        source[offset + copies[:, None] + positions] = molecules
+
+    # Put the typed atoms back in the order of `structure`
+    order = np.empty_like(source)
+    order[source] = np.arange(len(source))
+    atoms = list(typed.atoms)
+    typed.atoms[:] = [atoms[i] for i in order.tolist()]
+
+    # Replicating and concatenating structures does not keep the metadata
+    # set by foyer, which is the same for all molecules.
+    typed.title = template.title
+    typed.combining_rule = template.combining_rule
+    if hasattr(template, 'defaults'):
+        typed.defaults = template.defaults
+    _copy_residues(structure, typed)
+    typed.coordinates = structure.coordinates
+    typed.box = copy(structure.box)
+    return typed
+
+
+def _copy_residues(source, target):
+    """Assign the atoms of `target` to the residues of the atoms of `source`
+
+    Replicated molecules each get their own residue, while the residues of
+    the original structure may span several molecules.
+    """
+    from parmed.topologyobjects import ResidueList
+
+    residues = ResidueList()
+    for atom, source_atom in zip(target.atoms, source.atoms):
+        res = source_atom.residue
+        residues.add_atom(atom, res.name, res.number, res.chain,
+                          res.insertion_code, res.segid)
+    target.residues = residues
+
+
+def term_parameters(terms, parameters, atoms=()):
+    """Evaluate `parameters` for valence terms, once per unique term type
+
+    Molecules replicated from a template, e.g. by `apply_forcefield`, share
+    their ParmEd type objects, so that the parameters of a structure with
+    many copies of the same molecule only need to be derived once per
+    molecule rather than once per term.
+
+    Parameters
+    ----------
+    terms : iterable of parmed valence terms
+        E.g. `structure.bonds` or `structure.rb_torsions`
+    parameters : callable
+        Function of a single term returning its (hashable) parameters
+    atoms : tuple of str, optional, default=()
+        Attributes of the term holding atoms whose types, or names for
+        untyped atoms, `parameters` depends on, e.g. ('atom1', 'atom2')
+        for bonds
+
+    Returns
+    -------
+    list
+        The parameters of each term
+
+    """
+    cache = dict()
+    result = []
+    for term in terms:
+        key = (id(term.type),) + tuple(getattr(term, atom).type
+                                       or getattr(term, atom).name
+                                       for atom in atoms)
+        try:
+            value = cache[key]
+        except KeyError:
+            value = cache[key] = parameters(term)
+        result.append(value)
+    return result
+
+
+def _forcefield_key(forcefield_files, name, debug):
+    if isinstance(forcefield_files, (list, tuple)):
+        forcefield_files = tuple(forcefield_files)
+    return (forcefield_files, name, debug)
+
+
+def _typed_molecule(ff, ff_key, key, structure, atoms, foyer_kwargs):
+    """Atomtype one molecule, or reuse a previously typed molecule
+
+    Returns
+    -------
+    molecule : parmed.Structure
+        The typed molecule
+    positions : np.ndarray of int
+        The atom of `molecule` for each atom of the topology key
+
+    """
+    cache_key = (ff_key, key)
+    try:
+        cache_key_hash = hash(cache_key)
+    except TypeError:
+        # Unhashable foyer arguments
+        cache_key_hash = None
+    if cache_key_hash is not None:
+        typed = _typed_molecules.pop(cache_key, None)
+    else:
+        typed = None
+    if typed is None:
+        # Selecting atoms keeps them in the order of the structure.
+        selection = np.zeros(len(structure.atoms), dtype=bool)
+        selection[atoms] = True
+        molecule = ff.apply(structure[selection.tolist()], **foyer_kwargs)
+        typed = (molecule, np.searchsorted(np.sort(atoms), atoms))
+    if cache_key_hash is not None:
+        _typed_molecules[cache_key] = typed
+        while len(_typed_molecules) > _TYPED_MOLECULE_CACHE_SIZE:
+            _typed_molecules.popitem(last=False)
+    return typed
+
+
+def _molecule_groups(structure):
+    """Group the molecules of a parmed.Structure by topology
+
+    Returns
+    -------
+    groups : OrderedDict of tuple to np.ndarray
+        For each topology key, in order of first appearance, the atom
+        indices of every molecule with that topology, one row per molecule.
+        Atoms are in the order of the key, so that the atoms in a column are
+        equivalent.
+
+    """
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+
+    n_atoms = len(structure.atoms)
+    groups = OrderedDict()
+    if n_atoms == 0:
+        return groups
+    bonds = np.array([(bond.atom1.idx, bond.atom2.idx)
+                      for bond in structure.bonds], dtype=np.int64)
+    bonds = bonds.reshape(-1, 2)
+    graph = coo_matrix((np.ones(len(bonds)), (bonds[:, 0], bonds[:, 1])),
+                       shape=(n_atoms, n_atoms))
+    n_molecules, labels = connected_components(graph, directed=False)
+
+    # Atoms and bonds of each molecule, with atoms numbered within the
+    # molecule in the order of the structure
+    atom_order = np.argsort(labels, kind='stable')
+    bounds = np.searchsorted(labels[atom_order], np.arange(n_molecules + 1))
+    local = np.empty(n_atoms, dtype=np.int64)
+    local[atom_order] = np.arange(n_atoms) - bounds[labels[atom_order]]
+    molecule_bonds = [[] for _ in range(n_molecules)]
+    for mol, bond in zip(labels[bonds[:, 0]].tolist(),
+                         np.sort(local[bonds], axis=1).tolist()):
+        molecule_bonds[mol].append(tuple(bond))
+
+    atoms = structure.atoms
+    names = [(atom.name, atom.residue.name) for atom in atoms]
+    molecules = []
+    for mol in range(n_molecules):
+        indices = atom_order[bounds[mol]:bounds[mol + 1]]
+        key = (tuple(names[i] for i in indices.tolist()),
+               tuple(sorted(molecule_bonds[mol])))
+        molecules.append((key, indices))
+
+    # Molecules that list their atoms in a different order only need a
+    # canonical key if they could have the same topology.
+    keys = set(key for key, _ in molecules)
+    invariants = Counter((tuple(sorted(key[0])), len(key[1])) for key in keys)
+    canonical = dict()
+    for key in keys:
+        if invariants[(tuple(sorted(key[0])), len(key[1]))] > 1:
+            canonical[key] = _canonical_order(*key)
+        else:
+            canonical[key] = (key, None)
+
+    for key, indices in molecules:
+        key, order = canonical[key]
+        if order is not None:
+            indices = indices[order]
+        groups.setdefault(key, []).append(indices)
+    for key, indices in groups.items():
+        groups[key] = np.array(indices)
+    return groups
+
+
+def _canonical_order(names, bonds):
+    """Number the atoms of a molecule independently of their order
+
+    The atoms are colored by their names, refined by the colors of their
+    neighbors, with ties between equivalent atoms broken one at a time.
+    Molecules with the same topology get the same key, unless refinement
+    cannot tell their atoms apart; then they may merely be typed separately.
+
+    Parameters
+    ----------
+    names : tuple
+        The name of each atom
+    bonds : tuple of (int, int)
+        The bonded atoms
+
+    Returns
+    -------
+    key : tuple
+        The names and bonds with the atoms in canonical order
+    order : list of int
+        The atoms in canonical order
+
+    """
+    neighbors = [[] for _ in names]
+    for atom1, atom2 in bonds:
+        neighbors[atom1].append(atom2)
+        neighbors[atom2].append(atom1)
+    colors = _refine_colors(names, neighbors)
+    while len(set(colors)) < len(colors):
+        counts = Counter(colors)
+        tied = min(color for color, count in counts.items() if count > 1)
+        first = colors.index(tied)
+        colors = _refine_colors([(color, atom == first)
+                                 for atom, color in enumerate(colors)],
+                                neighbors)
+    order = sorted(range(len(names)), key=colors.__getitem__)
+    key = (tuple(names[atom] for atom in order),
+           tuple(sorted((min(colors[atom1], colors[atom2]),
+                         max(colors[atom1], colors[atom2]))
+                        for atom1, atom2 in bonds)))
+    return key, order
+
+
+def _refine_colors(colors, neighbors):
+    """Split atoms of the same color until their neighbors match
+
+    Colors are numbered in sorted order, so that refining keeps the order of
+    differently colored atoms.
+    """
+    colors = _rank(colors)
+    while True:
+        refined = _rank([(color, tuple(sorted(colors[neighbor]
+                                              for neighbor in atom_neighbors)))
+                         for color, atom_neighbors in zip(colors, neighbors)])
+        if max(refined) == max(colors):
+            return refined
+        colors = refined
+
+
+def _rank(values):
+    ranks = {value: rank for rank, value in enumerate(sorted(set(values)))}
+    return [ranks[value] for value in values]
@@ -88,3 +88,35 @@ def wrap_coords(xyz, box):
                 + box.mins)
 
     return wrap_xyz
+
+
+def wrap_periodic(xyz, periodicity):
+    """Wrap coordinates into a box for periodic kd-tree searches
+
+    `scipy.spatial.cKDTree(data, boxsize=periodicity)` treats directions
+    with a box size of zero as non-periodic, and requires all coordinates
+    in periodic directions to lie within [0, L). Coordinates in periodic
+    directions are wrapped into this range, the others are left unchanged.
+
+    Parameters
+    ----------
+    xyz : np.ndarray, shape=(n, 3) or (3,), dtype=float
+        The coordinates to wrap
+    periodicity : np.ndarray, shape=(3,), dtype=float
+        Periodic lengths, where zero denotes a non-periodic direction
+
+    Returns
+    -------
+    np.ndarray, shape=(n, 3) or (3,), dtype=float
+        The wrapped coordinates
+
+    """
+    periodicity = np.asarray(periodicity, dtype=float)
+    periodic = periodicity > 0
+    if not periodic.any():
+        return xyz
+    lengths = np.where(periodic, periodicity, 1.0)
+    wrapped = np.mod(xyz, lengths)
+    # Rounding can map small negative values onto the box length.
+    wrapped = np.where(wrapped >= lengths, 0.0, wrapped)
+    return np.where(periodic, wrapped, xyz)
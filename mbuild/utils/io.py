@@ -17,8 +17,8 @@
 ##############################################################################
 import inspect
 import importlib
+import importlib.util
 import os
-from pkg_resources import resource_filename
 import sys
 import textwrap
 import warnings
@@ -154,47 +154,24 @@ def import_(module):
         raise DelayImportError(m)
 
 
-try:
-    import intermol
-    has_intermol = True
-    del intermol
-except ImportError:
-    has_intermol = False
-
-try:
-    import gsd
-    has_gsd = True
-    del gsd
-except ImportError:
-    has_gsd = False
-
-try:
-    import openbabel
-    has_openbabel = True
-    del openbabel
-except ImportError:
-    has_openbabel = False
-
-try:
-    import foyer
-    has_foyer = True
-    del foyer
-except ImportError:
-    has_foyer = False
-
-try:
-    import networkx
-    has_networkx = True
-    del networkx
-except ImportError:
-    has_networkx = False
-
-try:
-    import hoomd
-    has_hoomd = True
-    del hoomd
-except ImportError:
-    has_hoomd  = False
+def _has_module(name):
+    """Whether `name` can be imported, without importing it """
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Only the availability of these packages is checked here, since importing
+# them is slow. A broken installation is reported when the package is
+# actually imported, e.g. through `import_`.
+has_intermol = _has_module('intermol')
+has_gsd = _has_module('gsd')
+has_openbabel = _has_module('openbabel')
+has_foyer = _has_module('foyer')
+has_networkx = _has_module('networkx')
+has_hoomd = _has_module('hoomd')
+
 
 def get_fn(name):
     """Get the full path to one of the reference files shipped for utils.
@@ -209,6 +186,8 @@ def get_fn(name):
         Name of the file to load (with respect to the reference/ folder).
 
     """
+    from pkg_resources import resource_filename
+
     fn = resource_filename('mbuild', os.path.join('utils', 'reference', name))
     if not os.path.exists(fn):
         raise IOError('Sorry! {} does not exists.'.format(fn))
@@ -130,7 +130,7 @@ if __name__ == '__main__':
         author_email='janos.sallai@vanderbilt.edu, christoph.klein@vanderbilt.edu',
         url='https://github.com/mosdef-hub/mbuild',
         download_url='https://github.com/mosdef-hub/mbuild/tarball/{}'.format(__version__),
-        packages=find_packages(),
+        packages=find_packages(exclude=['benchmarks']),
         package_data={'mbuild': ['utils/reference/*.{pdb,mol2}',
                                  'lib/*.{pdb,mol2}',
                                  ]},